@@ -0,0 +1,164 @@
+"""
+Non-blocking Jira client for the ASGI serving mode.
+
+Covers the subset of the Jira REST API used by the MCP tools, on top of a
+single httpx.AsyncClient per process whose pool can keep hundreds of
+upstream calls in flight without holding a thread for each one. Like the
+sync client, identical concurrent reads share one upstream call.
+"""
+import asyncio
+import importlib
+import time
+
+import fastjson
+from config import (
+    JIRA_URL, JIRA_USERNAME, JIRA_API_TOKEN, validate_config,
+    JIRA_CONNECT_TIMEOUT, JIRA_READ_TIMEOUT,
+    JIRA_ASYNC_MAX_CONNECTIONS, JIRA_ASYNC_MAX_KEEPALIVE, JIRA_RATE_MAX_WAIT,
+)
+from metrics import observe_upstream, CLIENT_INIT_LATENCY
+from singleflight import AsyncSingleFlight, freeze
+from ratelimit import jira_rate_limiter, plan_retry, parse_retry_after
+
+API_ROOT = "rest/api/2"
+
+
+class JiraAPIError(Exception):
+    """Jira returned an error status; message mirrors atlassian-python-api"""
+
+    def __init__(self, message, status_code, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AsyncJira:
+    def __init__(self, client):
+        self.client = client
+        self._jql_flight = AsyncSingleFlight("async_jql")
+        self._issue_flight = AsyncSingleFlight("async_issue")
+
+    async def request(self, method, path, params=None, json=None, error_body_ok=False):
+        url = f"{API_ROOT}/{path}"
+        attempt = 0
+        while True:
+            # Shares the sync client's bucket; sleeps here park only this coroutine
+            wait = jira_rate_limiter.reserve(JIRA_RATE_MAX_WAIT)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            response = await self._send(method, url, params, json)
+            attempt += 1
+            delay = plan_retry(method, response.status_code, response.headers, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        if response.status_code >= 400:
+            if error_body_ok and _has_element_errors(response):
+                return fastjson.loads(response.content)
+            raise JiraAPIError(_error_message(response), response.status_code,
+                               parse_retry_after(response.headers.get("Retry-After")))
+        if not response.content:
+            return None
+        return fastjson.loads(response.content)
+
+    async def _send(self, method, url, params, json):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, params=params, json=json)
+        except Exception:
+            observe_upstream(method, url, "error", time.perf_counter() - started)
+            raise
+        observe_upstream(method, response.request.url.path, response.status_code,
+                         time.perf_counter() - started, len(response.content))
+        return response
+
+    async def jql(self, jql, fields="*all", start=0, limit=None, expand=None, validate_query=None):
+        key = (jql, freeze(fields), start, limit, expand, validate_query)
+        return await self._jql_flight.do(key, lambda: self._jql(jql, fields, start, limit, expand, validate_query))
+
+    async def _jql(self, jql, fields, start, limit, expand, validate_query):
+        params = {"jql": jql, "startAt": start}
+        if limit is not None:
+            params["maxResults"] = int(limit)
+        if fields is not None:
+            params["fields"] = ",".join(fields) if isinstance(fields, (list, tuple, set)) else fields
+        if expand is not None:
+            params["expand"] = expand
+        if validate_query is not None:
+            params["validateQuery"] = validate_query
+        return await self.request("GET", "search", params=params)
+
+    async def issue(self, key, fields="*all", expand=None):
+        flight_key = (key.upper(), freeze(fields), expand)
+        return await self._issue_flight.do(flight_key, lambda: self._issue(key, fields, expand))
+
+    async def _issue(self, key, fields, expand):
+        params = {"fields": ",".join(fields) if isinstance(fields, (list, tuple, set)) else fields}
+        if expand is not None:
+            params["expand"] = expand
+        return await self.request("GET", f"issue/{key}", params=params)
+
+    async def issue_create(self, fields):
+        return await self.request("POST", "issue", json={"fields": fields})
+
+    async def issue_bulk_create(self, issue_updates):
+        """POST issue/bulk; a 400 that lists per-issue errors is returned, not raised"""
+        return await self.request("POST", "issue/bulk", json={"issueUpdates": issue_updates}, error_body_ok=True)
+
+
+def _has_element_errors(response):
+    try:
+        body = fastjson.loads(response.content)
+    except ValueError:
+        return False
+    return isinstance(body, dict) and bool(body.get("errors"))
+
+
+def _error_message(response):
+    try:
+        body = fastjson.loads(response.content)
+    except ValueError:
+        return f"{response.status_code} {response.reason_phrase}"
+    messages = list(body.get("errorMessages", []))
+    errors = body.get("errors", {})
+    if isinstance(errors, dict):
+        messages.extend(str(v) for v in errors.values())
+    return "\n".join(messages) or f"{response.status_code} {response.reason_phrase}"
+
+
+_client = None
+
+
+def get_async_jira_client():
+    """Return the AsyncJira shared by this worker's event loop"""
+    global _client
+    if _client is None:
+        validate_config()
+        started = time.perf_counter()
+        # httpx takes as long to import as the rest of the app; load it on first use
+        import httpx
+        http = httpx.AsyncClient(
+            base_url=JIRA_URL.rstrip("/") + "/",
+            auth=(JIRA_USERNAME, JIRA_API_TOKEN),
+            headers={"Accept": "application/json"},
+            timeout=httpx.Timeout(JIRA_READ_TIMEOUT, connect=JIRA_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=JIRA_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=JIRA_ASYNC_MAX_KEEPALIVE
+            ),
+        )
+        _client = AsyncJira(http)
+        CLIENT_INIT_LATENCY.labels("async").observe(time.perf_counter() - started)
+    return _client
+
+
+def preload():
+    """Import httpx now rather than on the first Jira call"""
+    importlib.import_module("httpx")
+
+
+async def close_async_jira_client():
+    global _client
+    if _client is not None:
+        await _client.client.aclose()
+        _client = None
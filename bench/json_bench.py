@@ -0,0 +1,183 @@
+"""
+Compare stdlib json and orjson on issue-sized payloads.
+
+Times the operations /issues pays per request: decoding a Jira search
+page, encoding it for the response, and Flask's full jsonify path with
+the default provider and with fastjson.FastJSONProvider. Prints a JSON
+summary followed by a table (median milliseconds per operation).
+
+By default a search page of --issues synthetic issues shaped like
+Jira Cloud's fields=*all output is used; pass --payload to time a
+recorded response instead:
+
+    python bench/json_bench.py --issues 100
+    python bench/json_bench.py --payload recorded_search.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+WORDS = ("login", "crash", "timeout", "deploy", "migration", "customer", "report", "latency",
+         "dashboard", "regression", "configuration", "Übersetzung", "café", "naïve", "retry")
+
+
+def _user(rng, base_url):
+    account_id = "%024x" % rng.getrandbits(96)
+    return {
+        "self": f"{base_url}/rest/api/2/user?accountId={account_id}",
+        "accountId": account_id,
+        "emailAddress": f"user{rng.randint(1, 500)}@example.com",
+        "avatarUrls": {size: f"https://avatar.example.com/{account_id}/{size}.png"
+                       for size in ("48x48", "24x24", "16x16", "32x32")},
+        "displayName": f"User {rng.randint(1, 500)}",
+        "active": True,
+        "timeZone": "Europe/Berlin",
+        "accountType": "atlassian",
+    }
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def synthetic_issue(rng, number, base_url="https://example.atlassian.net", project="PROJ",
+                    description_words=None, custom_fields=25):
+    """One issue roughly as large and nested as a real fields=*all response"""
+    key = f"{project}-{number}"
+    fields = {
+        "summary": _text(rng, 8),
+        "description": _text(rng, description_words if description_words is not None else rng.randint(80, 400)),
+        "status": {"self": f"{base_url}/rest/api/2/status/3", "name": rng.choice(["Open", "In Progress", "Done"]),
+                   "id": "3", "statusCategory": {"id": 4, "key": "indeterminate", "colorName": "yellow"}},
+        "priority": {"self": f"{base_url}/rest/api/2/priority/3", "name": "Medium", "id": "3",
+                     "iconUrl": f"{base_url}/images/icons/priorities/medium.svg"},
+        "issuetype": {"self": f"{base_url}/rest/api/2/issuetype/10001", "id": "10001", "name": "Bug",
+                      "subtask": False, "hierarchyLevel": 0},
+        "project": {"self": f"{base_url}/rest/api/2/project/10000", "id": "10000", "key": project,
+                    "name": "Project", "projectTypeKey": "software",
+                    "avatarUrls": {"48x48": f"{base_url}/secure/projectavatar?pid=10000"}},
+        "assignee": _user(rng, base_url) if rng.random() < 0.8 else None,
+        "reporter": _user(rng, base_url),
+        "creator": _user(rng, base_url),
+        "labels": [rng.choice(WORDS) for _ in range(rng.randint(0, 4))],
+        "components": [{"id": str(rng.randint(10000, 10100)), "name": rng.choice(WORDS)}],
+        "fixVersions": [{"id": "10020", "name": "2.4.0", "released": False, "archived": False}],
+        "created": "2024-05-%02dT09:%02d:00.000+0000" % (rng.randint(1, 28), rng.randint(0, 59)),
+        "updated": "2024-06-%02dT16:%02d:00.000+0000" % (rng.randint(1, 28), rng.randint(0, 59)),
+        "duedate": None,
+        "resolution": None,
+        "timetracking": {"originalEstimate": "1d", "remainingEstimate": "4h", "originalEstimateSeconds": 28800},
+        "comment": {"comments": [
+            {"id": str(rng.randint(10000, 99999)), "author": _user(rng, base_url), "body": _text(rng, 40),
+             "created": "2024-06-01T10:00:00.000+0000", "updated": "2024-06-01T10:00:00.000+0000"}
+            for _ in range(rng.randint(0, 5))
+        ], "maxResults": 5, "total": 5, "startAt": 0},
+    }
+    for i in range(custom_fields):
+        choice = rng.random()
+        if choice < 0.4:
+            value = None
+        elif choice < 0.6:
+            value = rng.randint(1, 13) * 1.0
+        elif choice < 0.8:
+            value = {"self": f"{base_url}/rest/api/2/customFieldOption/{10100 + i}", "value": rng.choice(WORDS),
+                     "id": str(10100 + i)}
+        else:
+            value = _text(rng, 6)
+        fields[f"customfield_{10010 + i}"] = value
+    return {"expand": "operations,versionedRepresentations,editmeta,changelog,renderedFields",
+            "id": str(10000 + number), "self": f"{base_url}/rest/api/2/issue/{10000 + number}",
+            "key": key, "fields": fields}
+
+
+def synthetic_search(count, seed=7):
+    rng = random.Random(seed)
+    issues = [synthetic_issue(rng, n) for n in range(1, count + 1)]
+    return {"expand": "schema,names", "startAt": 0, "maxResults": count, "total": count, "issues": issues}
+
+
+def median_ms(fn, repeat):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def run(payload_bytes, repeat):
+    import orjson
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+    import fastjson
+
+    search = json.loads(payload_bytes)
+    body = {"success": True, "jql": "project = PROJ", "issues": search.get("issues", [])}
+
+    stdlib_app = Flask("stdlib")
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    fast_app = Flask("fast")
+    fast_app.json = fastjson.FastJSONProvider(fast_app)
+
+    def jsonify_with(app):
+        def call():
+            with app.app_context():
+                app.json.response(body).get_data()
+        return call
+
+    cases = [
+        ("decode Jira search page",
+         lambda: json.loads(payload_bytes),
+         lambda: orjson.loads(payload_bytes)),
+        ("encode response (sorted keys)",
+         lambda: json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8"),
+         lambda: orjson.dumps(body, option=orjson.OPT_SORT_KEYS)),
+        ("encode response (unsorted)",
+         lambda: json.dumps(body, separators=(",", ":")).encode("utf-8"),
+         lambda: orjson.dumps(body)),
+        ("Flask jsonify", jsonify_with(stdlib_app), jsonify_with(fast_app)),
+    ]
+    results = []
+    for name, stdlib_fn, fast_fn in cases:
+        stdlib_ms = median_ms(stdlib_fn, repeat)
+        fast_ms = median_ms(fast_fn, repeat)
+        results.append({
+            "operation": name,
+            "json_ms": stdlib_ms,
+            "orjson_ms": fast_ms,
+            "speedup": round(stdlib_ms / fast_ms, 2) if fast_ms else None,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=100, help="synthetic issues per search page")
+    parser.add_argument("--payload", help="recorded Jira search response (JSON file) to use instead")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, "rb") as f:
+            payload_bytes = f.read()
+    else:
+        payload_bytes = json.dumps(synthetic_search(args.issues)).encode("utf-8")
+
+    results = run(payload_bytes, args.repeat)
+    print(json.dumps({"payload_bytes": len(payload_bytes), "repeat": args.repeat, "results": results}, indent=2))
+    print(f"\npayload {len(payload_bytes) / 1024:.0f} KiB; median ms per operation", file=sys.stderr)
+    print(f"{'operation':<32} {'json':>9} {'orjson':>9} {'speedup':>8}", file=sys.stderr)
+    for r in results:
+        print(f"{r['operation']:<32} {r['json_ms']:>9} {r['orjson_ms']:>9} {r['speedup']!s:>7}x", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Microbenchmarks for the in-process work of a tool call.
+
+Covers the CPU spent between receiving a request and sending the response,
+with no network: parsing (JSON-RPC body, Jira search pages), dispatch
+(handle_mcp_message against an in-memory Jira that returns fixtures),
+text rendering and response serialization. Fixtures are synthetic issues
+shaped like Jira Cloud's (bench/json_bench.py), at each of --sizes.
+
+Each case reports ops/sec (best of --repeat timed rounds) and, measured
+separately with tracemalloc, the peak memory one operation allocates and
+the memory it leaves behind. Results are printed as JSON and a table.
+
+Save a baseline, then compare later runs against it; the exit status is 1
+when a case is slower, or allocates more, than the baseline by more than
+--threshold (a fraction, default 0.25):
+
+    python bench/micro.py --save micro-baseline.json
+    python bench/micro.py --baseline micro-baseline.json --threshold 0.2
+    python bench/micro.py --only render --sizes 100,500
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+# Keep the per-call INFO log line out of the measurements and the output
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from json_bench import synthetic_issue
+
+# Allocation differences smaller than this are noise, whatever the threshold
+ALLOC_SLACK_BYTES = 4096
+
+
+class FixtureJira:
+    """In-memory stand-in for the Jira client, serving fixture issues"""
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.by_key = {issue["key"]: issue for issue in issues}
+        self.created = 0
+
+    def jql(self, jql, limit=50, fields=None, expand=None, validate_query=None, **kwargs):
+        if jql.startswith("key in ("):
+            keys = [key.strip() for key in jql[len("key in ("):jql.index(")")].split(",")]
+            matches = [self.by_key[key] for key in keys if key in self.by_key]
+        else:
+            matches = self.issues[:limit]
+        return {"startAt": 0, "maxResults": limit, "total": len(matches), "issues": matches}
+
+    def issue(self, key, fields="*all", expand=None):
+        return self.by_key[key]
+
+    def projects(self, included_archived=None, expand=None):
+        return [{"id": str(10000 + i), "key": f"P{i}", "name": f"Project {i}"} for i in range(30)]
+
+    def issue_create(self, fields):
+        self.created += 1
+        return {"id": str(20000 + self.created), "key": f"PROJ-{20000 + self.created}"}
+
+
+def fixtures(max_size, seed=7):
+    rng = random.Random(seed)
+    issues = [synthetic_issue(rng, n) for n in range(1, max_size + 1)]
+    # Round-trip so the fixtures are plain decoded JSON, as from Jira
+    return json.loads(json.dumps(issues))
+
+
+def cases(sizes, issues):
+    """(group, name, fn) for every benchmark case"""
+    import app
+    import executor
+    import fastjson
+    from config import JIRA_GET_ISSUES_MAX_KEYS
+    from renderers import (
+        ISSUE_FIELDS, render_search, render_issue, render_issues, render_projects, render_bulk_created,
+    )
+
+    client = FixtureJira(issues)
+    executor.get_jira_client = lambda: client
+    executor.issue_cache.get(issues[0]["key"], fields=",".join(ISSUE_FIELDS), expand=None)
+
+    def rpc(method, params):
+        return fastjson.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+
+    def dispatch(body):
+        return lambda: app.handle_mcp_message(fastjson.loads(body))
+
+    yield "parse", "JSON-RPC request", lambda: app.parse_mcp_message(fastjson.loads(
+        rpc("jira_search_issues", {"jql": "project = PROJ ORDER BY created DESC", "max_results": 50})))
+    for size in sizes:
+        page = fastjson.dumps({"startAt": 0, "maxResults": size, "total": size, "issues": issues[:size]})
+        yield "parse", f"Jira search page [{size}]", lambda page=page: fastjson.loads(page)
+
+    yield "dispatch", "initialize", dispatch(rpc("initialize", {}))
+    yield "dispatch", "tools/list", dispatch(rpc("tools/list", {}))
+    yield "dispatch", "unknown method", dispatch(rpc("jira_no_such_tool", {}))
+    yield "dispatch", "jira_list_projects", dispatch(rpc("jira_list_projects", {}))
+    yield "dispatch", "jira_get_issue (cached)", dispatch(rpc("jira_get_issue", {"issue_key": issues[0]["key"]}))
+    yield "dispatch", "tools/call jira_get_issue (cached)", dispatch(rpc("tools/call", {
+        "name": "jira_get_issue", "arguments": {"issue_key": issues[0]["key"]}}))
+    yield "dispatch", "jira_create_issue", dispatch(rpc("jira_create_issue", {"project_key": "PROJ", "summary": "x"}))
+    for size in sizes:
+        yield "dispatch", f"jira_search_issues [{size}]", dispatch(rpc("jira_search_issues", {
+            "jql": "project = PROJ", "max_results": size}))
+        if size <= JIRA_GET_ISSUES_MAX_KEYS:
+            keys = [issue["key"] for issue in issues[:size]]
+            yield "dispatch", f"jira_get_issues [{size}]", dispatch(rpc("jira_get_issues", {"issue_keys": keys}))
+
+    projects = client.projects()
+    yield "render", "render_projects [30]", lambda: render_projects(projects)
+    yield "render", "render_issue", lambda: render_issue(issues[0]["key"], issues[0])
+    for size in sizes:
+        page = issues[:size]
+        found = [{"key": issue["key"], "found": True, "issue": issue} for issue in page]
+        created = [{"index": i, "success": True, "key": issue["key"]} for i, issue in enumerate(page)]
+        yield "render", f"render_search [{size}]", lambda page=page: render_search("project = PROJ", page)
+        yield "render", f"render_issues [{size}]", lambda found=found: render_issues(found)
+        yield "render", f"render_bulk_created [{size}]", lambda created=created: render_bulk_created(created)
+
+    for size in sizes:
+        response, _ = app.handle_mcp_message(fastjson.loads(rpc("jira_search_issues", {
+            "jql": "project = PROJ", "max_results": size})))
+        raw = {"success": True, "jql": "project = PROJ", "issues": issues[:size]}
+        yield "serialize", f"search tool response [{size}]", lambda response=response: fastjson.dumps(response)
+        yield "serialize", f"raw issues, sorted keys [{size}]", lambda raw=raw: fastjson.dumps(raw, sort_keys=True)
+
+        def jsonify(raw=raw):
+            with app.app.app_context():
+                app.app.json.response(raw).get_data()
+        yield "serialize", f"Flask jsonify raw issues [{size}]", jsonify
+
+
+def ops_per_sec(fn, repeat, min_time):
+    """Best-of-`repeat` rate, each round running long enough to time reliably"""
+    fn()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 10:
+            break
+        number *= 10
+    number = max(1, int(number * (min_time / elapsed)))
+    best = 0.0
+    gc.collect()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = max(best, number / (time.perf_counter() - started))
+    return best
+
+
+def allocations(fn):
+    """(peak bytes allocated during one call, bytes still held after it)"""
+    fn()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before, max(after - before, 0)
+
+
+def regressions(results, baseline, threshold):
+    """Descriptions of every case that got slower or allocates more than `baseline` allows"""
+    previous = {r["case"]: r for r in baseline["results"]}
+    found = []
+    for r in results:
+        old = previous.get(r["case"])
+        if old is None:
+            continue
+        if r["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            found.append(f"{r['case']}: {r['ops_per_sec']:.0f} ops/s, baseline {old['ops_per_sec']:.0f}")
+        if r["alloc_peak_bytes"] > old["alloc_peak_bytes"] * (1 + threshold) + ALLOC_SLACK_BYTES:
+            found.append(f"{r['case']}: allocates {r['alloc_peak_bytes']} bytes, baseline {old['alloc_peak_bytes']}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,100,500", help="comma-separated issue counts")
+    parser.add_argument("--only", default="", help="comma-separated substrings of group or case names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed round")
+    parser.add_argument("--baseline", help="earlier --save output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown / allocation growth against the baseline, as a fraction")
+    parser.add_argument("--save", help="write the results here, for use as a baseline")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = [pattern.strip() for pattern in args.only.split(",") if pattern.strip()]
+
+    results = []
+    for group, name, fn in cases(sizes, fixtures(max(sizes + [100]))):
+        case = f"{group}: {name}"
+        if only and not any(pattern in case for pattern in only):
+            continue
+        peak, retained = allocations(fn)
+        results.append({"case": case, "ops_per_sec": round(ops_per_sec(fn, args.repeat, args.min_time), 1),
+                        "alloc_peak_bytes": peak, "alloc_retained_bytes": retained})
+
+    report = {"sizes": sizes, "repeat": args.repeat, "min_time_s": args.min_time, "results": results}
+    failures = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(results, json.load(f), args.threshold)
+        report["threshold"] = args.threshold
+        report["regressions"] = failures
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    print(json.dumps(report, indent=2))
+    print(f"\n{'case':<52} {'ops/sec':>12} {'peak KiB':>10} {'kept KiB':>9}", file=sys.stderr)
+    for r in results:
+        print(f"{r['case']:<52} {r['ops_per_sec']:>12,.0f} {r['alloc_peak_bytes'] / 1024:>10.1f} "
+              f"{r['alloc_retained_bytes'] / 1024:>9.1f}", file=sys.stderr)
+    if failures:
+        print(f"\n{len(failures)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+        for failure in failures:
+            print("  " + failure, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
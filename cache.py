@@ -0,0 +1,484 @@
+"""
+In-process caches for upstream Jira data.
+
+Caches register themselves by name so the /cache endpoints can report
+and invalidate them without knowing what they hold. Lookups are also
+counted in the cache_events_total metric, aggregated across workers.
+
+Each gunicorn worker has its own copy of every cache, so invalidations
+(webhooks, /cache/invalidate) go through ``publish()``, which reaches all
+workers of the server; see InvalidationRing.
+"""
+import mmap
+import multiprocessing
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+import fastjson
+from metrics import CACHE_EVENTS, CACHE_ENTRIES, CACHE_BYTES
+
+caches = {}
+
+
+def register(cache):
+    caches[cache.name] = cache
+    return cache
+
+
+class RefreshingCache:
+    """
+    Single-value cache with a TTL and background refresh-ahead.
+
+    The first load blocks the caller. After that, once the value is older
+    than ``ttl * refresh_ahead`` a background thread reloads it while callers
+    keep getting the current value, so requests never wait on a refresh.
+    If a refresh fails the previous value is kept and retried on next access,
+    but only for ``stale_grace`` seconds past the TTL: an older value (after
+    a long idle spell, or while Jira keeps failing) is loaded again in the
+    caller, as on a cold cache.
+    """
+
+    def __init__(self, name, loader, ttl, refresh_ahead=0.8, stale_grace=300):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.stale_grace = stale_grace
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._value = None
+        self._loaded_at = None
+        self._refreshing = False
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.expired = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error = None
+
+    def get(self):
+        invalidations.poll()
+        with self._lock:
+            loaded_at = self._loaded_at
+            if loaded_at is not None and not self._expired(loaded_at):
+                age = time.monotonic() - loaded_at
+                self.hits += 1
+                self._event("hit")
+                if age >= self.ttl:
+                    self.stale_hits += 1
+                    self._event("stale_hit")
+                if age >= self.ttl * self.refresh_ahead and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._refresh, args=(self._generation,),
+                        name=f"{self.name}-cache-refresh", daemon=True
+                    ).start()
+                return self._value
+
+        # Cold or expired cache: one caller loads, concurrent callers wait for its result
+        with self._load_lock:
+            with self._lock:
+                if self._loaded_at is not None and not self._expired(self._loaded_at):
+                    self.hits += 1
+                    self._event("hit")
+                    return self._value
+                if self._loaded_at is not None:
+                    self.expired += 1
+                    self._event("expired")
+                self.misses += 1
+                self._event("miss")
+                generation = self._generation
+            value = self.loader()
+            self._store(value, generation)
+            return value
+
+    def _event(self, event):
+        CACHE_EVENTS.labels(self.name, event).inc()
+
+    def _expired(self, loaded_at):
+        return time.monotonic() - loaded_at >= self.ttl + self.stale_grace
+
+    def _store(self, value, generation):
+        with self._lock:
+            # An invalidation during the load makes its result obsolete
+            if generation != self._generation:
+                return
+            self._value = value
+            self._loaded_at = time.monotonic()
+
+    def _refresh(self, generation):
+        try:
+            value = self.loader()
+        except Exception as e:
+            with self._lock:
+                self.refresh_errors += 1
+                self.last_error = str(e)
+            self._event("refresh_error")
+        else:
+            self._store(value, generation)
+            with self._lock:
+                self.refreshes += 1
+                self.last_error = None
+            self._event("refresh")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._value = None
+            self._loaded_at = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "stale_hits": self.stale_hits,
+                "expired": self.expired,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "last_error": self.last_error,
+                "age_seconds": round(time.monotonic() - self._loaded_at, 3) if self._loaded_at is not None else None,
+                "ttl_seconds": self.ttl,
+                "stale_grace_seconds": self.stale_grace,
+            }
+
+
+class _IssueEntry:
+    __slots__ = ("body", "updated", "size", "checked_at")
+
+    def __init__(self, body, updated, size):
+        self.body = body
+        self.updated = updated
+        self.size = size
+        self.checked_at = time.monotonic()
+
+
+class IssueCache:
+    """
+    Bounded LRU of issue bodies validated against Jira's ``updated`` field.
+
+    Entries are keyed by issue key plus the fields/expand projection they
+    were fetched with. An entry younger than ``revalidate_after`` seconds is
+    served directly. An older one is revalidated with ``fetch_updated(key)``,
+    a request for just the ``updated`` field: if that has not moved the
+    cached body is served, otherwise the full issue is fetched again. If
+    revalidation fails because the issue is gone (``gone(error)``: deleted
+    or no longer visible) the entry is dropped and the error raised; any
+    other failure (throttling, timeouts, 5xx) serves the cached body and
+    leaves it due for revalidation on the next lookup.
+
+    ``aget`` is the same lookup for the event loop: it goes upstream through
+    the coroutine functions ``afetch`` and ``afetch_updated`` and shares the
+    entries, counters and invalidation rules with ``get``.
+
+    Size is bounded by ``max_entries`` and by ``max_bytes``, measured as
+    the JSON-encoded length of each body.
+
+    Every invalidation bumps a generation number. A fetch notes the
+    generation before it goes upstream and its body is not stored if its
+    key (or the whole cache) was invalidated meanwhile, so a webhook that
+    lands mid-fetch is not overwritten by the body from before the update.
+    """
+
+    def __init__(self, name, fetch, fetch_updated, max_entries, max_bytes, revalidate_after, gone,
+                 afetch=None, afetch_updated=None):
+        self.name = name
+        self.fetch = fetch
+        self.fetch_updated = fetch_updated
+        self.afetch = afetch
+        self.afetch_updated = afetch_updated
+        self.gone = gone
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        # Issue key -> generation of its last invalidation, bounded like the entries;
+        # fetches older than _floor (a full invalidation, or a trimmed key) are never stored
+        self._invalidated = OrderedDict()
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.revalidated_unchanged = 0
+        self.revalidated_changed = 0
+        self.revalidation_errors = 0
+        self.evictions = 0
+        self.discarded = 0
+
+    @staticmethod
+    def _key(issue_key, fields, expand):
+        return (issue_key.upper(), fields, expand)
+
+    def get(self, issue_key, fields="*all", expand=None):
+        key, generation, entry, fresh = self._lookup(issue_key, fields, expand)
+        if fresh:
+            return entry.body
+        if entry is not None:
+            try:
+                updated = self.fetch_updated(issue_key)
+            except Exception as e:
+                return self._revalidation_failed(issue_key, entry, e)
+            if self._revalidated(entry, updated):
+                return entry.body
+        body = self.fetch(issue_key, fields, expand)
+        self._store(key, body, generation)
+        return body
+
+    async def aget(self, issue_key, fields="*all", expand=None):
+        """get for the event loop, going upstream through afetch and afetch_updated"""
+        key, generation, entry, fresh = self._lookup(issue_key, fields, expand)
+        if fresh:
+            return entry.body
+        if entry is not None:
+            try:
+                updated = await self.afetch_updated(issue_key)
+            except Exception as e:
+                return self._revalidation_failed(issue_key, entry, e)
+            if self._revalidated(entry, updated):
+                return entry.body
+        body = await self.afetch(issue_key, fields, expand)
+        self._store(key, body, generation)
+        return body
+
+    def _lookup(self, issue_key, fields, expand):
+        """Return (key, generation, entry, fresh); a fresh entry is served without asking Jira"""
+        invalidations.poll()
+        key = self._key(issue_key, fields, expand)
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(key)
+            fresh = False
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                fresh = time.monotonic() - entry.checked_at < self.revalidate_after
+                if fresh:
+                    self.hits += 1
+        if entry is None:
+            self._event("miss")
+        elif fresh:
+            self._event("hit")
+        return key, generation, entry, fresh
+
+    def _revalidation_failed(self, issue_key, entry, error):
+        if self.gone(error):
+            # Deleted or no longer visible: forget it and let the caller see the error
+            self.invalidate_key(issue_key)
+            raise error
+        # Jira is struggling, not the issue: serve what we have and revalidate next time
+        with self._lock:
+            self.revalidation_errors += 1
+            self.hits += 1
+        self._event("revalidation_error")
+        self._event("hit")
+        return entry.body
+
+    def _revalidated(self, entry, updated):
+        """Record a revalidation; True if the cached body is still current"""
+        with self._lock:
+            self.revalidations += 1
+            if updated is not None and updated == entry.updated:
+                self.revalidated_unchanged += 1
+                self.hits += 1
+                entry.checked_at = time.monotonic()
+                unchanged = True
+            else:
+                self.revalidated_changed += 1
+                unchanged = False
+        self._event("revalidated_unchanged" if unchanged else "revalidated_changed")
+        if unchanged:
+            self._event("hit")
+        return unchanged
+
+    def _event(self, event):
+        CACHE_EVENTS.labels(self.name, event).inc()
+
+    def _publish_size(self):
+        CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+        CACHE_BYTES.labels(self.name).set(self._bytes)
+
+    def _invalidated_since(self, issue_key, generation):
+        # Caller holds self._lock
+        return generation < self._floor or self._invalidated.get(issue_key, 0) > generation
+
+    def _store(self, key, body, generation):
+        updated = body.get("fields", {}).get("updated") if isinstance(body, dict) else None
+        if updated is None:
+            # Without `updated` the entry could never be revalidated
+            return
+        size = len(fastjson.dumps(body))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if self._invalidated_since(key[0], generation):
+                self.discarded += 1
+                self._event("discarded")
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = _IssueEntry(body, updated, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+                self._event("eviction")
+            self._publish_size()
+
+    def invalidate_key(self, issue_key):
+        """Drop every cached projection of one issue"""
+        issue_key = issue_key.upper()
+        with self._lock:
+            self._generation += 1
+            self._invalidated.pop(issue_key, None)
+            self._invalidated[issue_key] = self._generation
+            while len(self._invalidated) > self.max_entries:
+                _, trimmed = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, trimmed)
+            for key in [k for k in self._entries if k[0] == issue_key]:
+                self._bytes -= self._entries.pop(key).size
+            self._publish_size()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            self._invalidated.clear()
+            self._entries.clear()
+            self._bytes = 0
+            self._publish_size()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.revalidated_changed
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "revalidations": self.revalidations,
+                "revalidated_unchanged": self.revalidated_unchanged,
+                "revalidated_changed": self.revalidated_changed,
+                "revalidation_errors": self.revalidation_errors,
+                "evictions": self.evictions,
+                "discarded": self.discarded,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "revalidate_after_seconds": self.revalidate_after,
+            }
+
+
+class InvalidationRing:
+    """
+    Invalidation broadcast to every process forked from the one that built it.
+
+    Under gunicorn the app is preloaded, so this ring lives in shared memory
+    created by the master and inherited by all workers. ``publish()`` writes
+    (cache name, issue key or None) into the next slot and bumps a shared
+    sequence number; every process applies the entries it has not seen
+    before its next cache lookup, which costs one memory read when nothing
+    changed. A process that falls more than SLOTS entries behind clears
+    every cache instead.
+    """
+
+    SLOTS = 512
+    SLOT_SIZE = 128
+    _HEADER = struct.Struct("Q")
+    _LENGTH = struct.Struct("H")
+
+    def __init__(self):
+        self._mem = mmap.mmap(-1, self._HEADER.size + self.SLOTS * self.SLOT_SIZE)
+        self._write_lock = multiprocessing.Lock()
+        self._apply_lock = threading.Lock()
+        self._seen = 0
+        self.published = 0
+        self.applied = 0
+        self.overruns = 0
+
+    def _sequence(self):
+        return self._HEADER.unpack_from(self._mem, 0)[0]
+
+    def _slot(self, sequence):
+        return self._HEADER.size + (sequence % self.SLOTS) * self.SLOT_SIZE
+
+    def publish(self, name, key=None):
+        """Invalidate cache `name` ("*" for all), or only `key` in it, in every worker"""
+        entry = f"{name}\0{key or ''}".encode("utf-8")
+        if len(entry) > self.SLOT_SIZE - self._LENGTH.size:
+            entry = f"{name}\0".encode("utf-8")
+        with self._write_lock:
+            sequence = self._sequence() + 1
+            offset = self._slot(sequence)
+            self._LENGTH.pack_into(self._mem, offset, len(entry))
+            self._mem[offset + self._LENGTH.size:offset + self._LENGTH.size + len(entry)] = entry
+            self._HEADER.pack_into(self._mem, 0, sequence)
+        self.published += 1
+        self.poll()
+
+    def _read(self, sequence):
+        offset = self._slot(sequence)
+        length = self._LENGTH.unpack_from(self._mem, offset)[0]
+        start = offset + self._LENGTH.size
+        name, _, key = self._mem[start:start + length].decode("utf-8").partition("\0")
+        return name, key or None
+
+    def poll(self):
+        """Apply invalidations published since this process last looked"""
+        if self._sequence() == self._seen:
+            return
+        if not self._apply_lock.acquire(blocking=False):
+            # Another thread of this process is applying them right now
+            return
+        try:
+            latest = self._sequence()
+            entries = [self._read(seq) for seq in range(max(self._seen + 1, latest - self.SLOTS + 1), latest + 1)]
+            # Slots may have been overwritten while we read them
+            if self._sequence() - self._seen > self.SLOTS:
+                self.overruns += 1
+                entries = [("*", None)]
+            for name, key in entries:
+                _apply(name, key)
+            self.applied += len(entries)
+            self._seen = latest
+        finally:
+            self._apply_lock.release()
+
+    def stats(self):
+        return {
+            "sequence": self._sequence(),
+            "seen": self._seen,
+            "published": self.published,
+            "applied": self.applied,
+            "overruns": self.overruns,
+        }
+
+
+def _apply(name, key):
+    targets = caches.values() if name == "*" else [c for c in (caches.get(name),) if c is not None]
+    for target in targets:
+        if key is not None and hasattr(target, "invalidate_key"):
+            target.invalidate_key(key)
+        else:
+            target.invalidate()
+
+
+invalidations = InvalidationRing()
+
+
+def publish(name, key=None):
+    invalidations.publish(name, key)
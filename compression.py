@@ -0,0 +1,210 @@
+"""
+Response compression negotiated through Accept-Encoding.
+
+Brotli is preferred when the client accepts it and the brotli package is
+installed, then gzip. Bodies shorter than COMPRESSION_MIN_SIZE, responses
+that already carry a Content-Encoding and types outside
+COMPRESSION_MIME_TYPES are sent unchanged. Streamed responses (NDJSON,
+SSE) are compressed chunk by chunk with a sync flush after each chunk, so
+every record still reaches the client as soon as it is produced.
+
+Flask responses are compressed by compress_response() in an after_request
+hook; the ASGI app's native routes send through compressing_send().
+Strong ETags become weak on compressed responses, since the bytes differ
+from the identity representation.
+"""
+import zlib
+
+from config import (
+    COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_BROTLI_QUALITY, COMPRESSION_MIME_TYPES,
+)
+from metrics import COMPRESSION_INPUT_BYTES, COMPRESSION_OUTPUT_BYTES, COMPRESSION_SAVED_BYTES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SUPPORTED = ("br", "gzip") if brotli is not None else ("gzip",)
+SKIP_STATUSES = {204, 206, 304}
+
+
+def negotiate(accept_encoding):
+    """Best supported coding the client accepts, or None for identity"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    candidates = [(accepted.get(coding, wildcard), coding) for coding in SUPPORTED]
+    quality, coding = max(candidates, key=lambda c: c[0])
+    return coding if quality > 0 else None
+
+
+def compressible(content_type):
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type in COMPRESSION_MIME_TYPES
+
+
+class Compressor:
+    """Incremental encoder for one response body"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits=31: zlib writes a gzip header and trailer
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _count(self, data, out):
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        return out
+
+    def chunk(self, data):
+        """Compress `data` and flush, so the client can decode it right away"""
+        if self.encoding == "br":
+            out = self._brotli.process(data) + self._brotli.flush()
+        else:
+            out = self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+        return self._count(data, out)
+
+    def finish(self, data=b""):
+        if self.encoding == "br":
+            out = self._brotli.process(data) + self._brotli.finish()
+        else:
+            out = self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+        out = self._count(data, out)
+        record(self.encoding, self.bytes_in, self.bytes_out)
+        return out
+
+
+def record(encoding, bytes_in, bytes_out):
+    COMPRESSION_INPUT_BYTES.labels(encoding).inc(bytes_in)
+    COMPRESSION_OUTPUT_BYTES.labels(encoding).inc(bytes_out)
+    COMPRESSION_SAVED_BYTES.labels(encoding).inc(max(bytes_in - bytes_out, 0))
+
+
+def compress_stream(chunks, encoding):
+    compressor = Compressor(encoding)
+    for data in chunks:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+def _weak_etag(etag):
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+def compress_response(response, accept_encoding):
+    """Flask after_request step: compress `response` in place when worthwhile"""
+    if (not COMPRESSION_ENABLED or response.status_code < 200 or response.status_code in SKIP_STATUSES
+            or "Content-Encoding" in response.headers or not compressible(response.content_type)):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate(accept_encoding)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(Compressor(encoding).finish(body))
+    response.headers["Content-Encoding"] = encoding
+    if "ETag" in response.headers:
+        response.headers["ETag"] = _weak_etag(response.headers["ETag"])
+    return response
+
+
+def compressing_send(scope, send):
+    """
+    Wrap an ASGI `send` so the response it carries is compressed when
+    worthwhile; used for the natively served routes in asgi.py.
+    """
+    if not COMPRESSION_ENABLED:
+        return send
+    accept_encoding = None
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            accept_encoding = value.decode("latin-1")
+    return _CompressingSend(send, negotiate(accept_encoding))
+
+
+class _CompressingSend:
+    """Wraps `send`; decides on the first body message whether to compress"""
+
+    def __init__(self, send, encoding):
+        self.send = send
+        self.encoding = encoding
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = [(k.lower(), v) for k, v in message.get("headers", [])]
+            content_type = next((v.decode("latin-1") for k, v in headers if k == b"content-type"), None)
+            if (message["status"] < 200 or message["status"] in SKIP_STATUSES
+                    or any(k == b"content-encoding" for k, _ in headers) or not compressible(content_type)):
+                self.passthrough = True
+                await self.send(message)
+                return
+            if not any(k == b"vary" and b"accept-encoding" in v.lower() for k, v in headers):
+                headers.append((b"vary", b"Accept-Encoding"))
+            self.start = {**message, "headers": headers}
+            if self.encoding is None:
+                self.passthrough = True
+                await self.send(self.start)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < COMPRESSION_MIN_SIZE:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = Compressor(self.encoding)
+            headers = [(k, _weak_etag(v.decode("latin-1")).encode("latin-1") if k == b"etag" else v)
+                       for k, v in start["headers"] if k != b"content-length"]
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            if not more_body:
+                body = self.compressor.finish(body)
+                headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                await self.send({**start, "headers": headers})
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send({**start, "headers": headers})
+
+        if more_body:
+            await self.send({"type": "http.response.body", "body": self.compressor.chunk(body) if body else b"",
+                             "more_body": True})
+        else:
+            await self.send({"type": "http.response.body", "body": self.compressor.finish(body)})
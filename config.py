@@ -13,4 +13,134 @@ def validate_config():
         if not JIRA_USERNAME: missing.append("JIRA_USERNAME") 
         if not JIRA_API_TOKEN: missing.append("JIRA_API_TOKEN")
         raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
-    return True
\ No newline at end of file
+    return True
+
+# Shared Jira client connection pool
+# JIRA_POOL_CONNECTIONS is the number of per-host pools kept alive,
+# JIRA_POOL_MAXSIZE the number of keep-alive connections per host.
+JIRA_POOL_CONNECTIONS = int(os.getenv("JIRA_POOL_CONNECTIONS", "4"))
+JIRA_POOL_MAXSIZE = int(os.getenv("JIRA_POOL_MAXSIZE", "20"))
+JIRA_POOL_BLOCK = os.getenv("JIRA_POOL_BLOCK", "true").lower() == "true"
+JIRA_POOL_TIMEOUT = float(os.getenv("JIRA_POOL_TIMEOUT", "10"))
+JIRA_CONNECT_TIMEOUT = float(os.getenv("JIRA_CONNECT_TIMEOUT", "5"))
+JIRA_READ_TIMEOUT = float(os.getenv("JIRA_READ_TIMEOUT", "30"))
+
+# Project list cache (seconds). Entries are refreshed in the background once
+# they are older than PROJECTS_CACHE_TTL * PROJECTS_CACHE_REFRESH_AHEAD. An
+# entry more than PROJECTS_CACHE_STALE_GRACE seconds past its TTL is not
+# served; the request loads the list itself.
+PROJECTS_CACHE_TTL = float(os.getenv("PROJECTS_CACHE_TTL", "3600"))
+PROJECTS_CACHE_REFRESH_AHEAD = float(os.getenv("PROJECTS_CACHE_REFRESH_AHEAD", "0.8"))
+PROJECTS_CACHE_STALE_GRACE = float(os.getenv("PROJECTS_CACHE_STALE_GRACE", "300"))
+
+# Readiness probe: Jira is checked at most once per HEALTH_PROBE_INTERVAL
+# seconds, and reported unavailable after HEALTH_FAILURE_THRESHOLD failures in a row.
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "30"))
+HEALTH_FAILURE_THRESHOLD = int(os.getenv("HEALTH_FAILURE_THRESHOLD", "3"))
+
+# JSON-RPC batches on /api/mcp: worker pool size for the process,
+# concurrent entries per batch, and the largest accepted batch.
+MCP_BATCH_MAX_WORKERS = int(os.getenv("MCP_BATCH_MAX_WORKERS", "32"))
+MCP_BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "8"))
+MCP_BATCH_MAX_SIZE = int(os.getenv("MCP_BATCH_MAX_SIZE", "100"))
+
+# Async (ASGI) serving mode: httpx connection pool for the async Jira client
+JIRA_ASYNC_MAX_CONNECTIONS = int(os.getenv("JIRA_ASYNC_MAX_CONNECTIONS", "200"))
+JIRA_ASYNC_MAX_KEEPALIVE = int(os.getenv("JIRA_ASYNC_MAX_KEEPALIVE", "50"))
+
+# Issues fetched per upstream call when streaming search results
+JIRA_SEARCH_PAGE_SIZE = int(os.getenv("JIRA_SEARCH_PAGE_SIZE", "100"))
+
+# Issue cache: LRU bounded by entry count and approximate JSON size.
+# Entries younger than ISSUE_CACHE_REVALIDATE_AFTER seconds are served as-is;
+# older ones are revalidated by fetching only the issue's `updated` field.
+ISSUE_CACHE_MAX_ENTRIES = int(os.getenv("ISSUE_CACHE_MAX_ENTRIES", "5000"))
+ISSUE_CACHE_MAX_BYTES = int(os.getenv("ISSUE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+ISSUE_CACHE_REVALIDATE_AFTER = float(os.getenv("ISSUE_CACHE_REVALIDATE_AFTER", "5"))
+
+# Cache-Control max-age (seconds) for tool discovery responses
+TOOLS_CACHE_MAX_AGE = int(os.getenv("TOOLS_CACHE_MAX_AGE", "300"))
+
+# Logging: level, fraction of payload (request/response body) debug records
+# kept, payload truncation length, and the in-memory queue size
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_MAX_PAYLOAD = int(os.getenv("LOG_MAX_PAYLOAD", "2000"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Outbound Jira rate limiting (per process): token bucket of JIRA_RATE_LIMIT
+# requests/second with bursts up to JIRA_RATE_BURST (0 disables the bucket;
+# Retry-After pauses still apply). Requests queue for at most JIRA_RATE_MAX_WAIT
+# seconds before failing with a 429 of our own.
+JIRA_RATE_LIMIT = float(os.getenv("JIRA_RATE_LIMIT", "20"))
+JIRA_RATE_BURST = int(os.getenv("JIRA_RATE_BURST", "40"))
+JIRA_RATE_MAX_WAIT = float(os.getenv("JIRA_RATE_MAX_WAIT", "10"))
+
+# Retries of throttled (429/503) reads: attempts in total, jittered exponential
+# backoff base and cap, and the longest single wait (e.g. Retry-After) accepted
+JIRA_RETRY_MAX_ATTEMPTS = int(os.getenv("JIRA_RETRY_MAX_ATTEMPTS", "4"))
+JIRA_RETRY_BACKOFF_BASE = float(os.getenv("JIRA_RETRY_BACKOFF_BASE", "0.5"))
+JIRA_RETRY_BACKOFF_MAX = float(os.getenv("JIRA_RETRY_BACKOFF_MAX", "8"))
+JIRA_RETRY_MAX_WAIT = float(os.getenv("JIRA_RETRY_MAX_WAIT", "20"))
+
+# Bulk issue creation: issues per call to Jira's /issue/bulk (Jira accepts
+# at most 50), chunks in flight at once, and the largest accepted request
+JIRA_BULK_CREATE_CHUNK = int(os.getenv("JIRA_BULK_CREATE_CHUNK", "50"))
+JIRA_BULK_CREATE_CONCURRENCY = int(os.getenv("JIRA_BULK_CREATE_CONCURRENCY", "4"))
+JIRA_BULK_CREATE_MAX_ITEMS = int(os.getenv("JIRA_BULK_CREATE_MAX_ITEMS", "1000"))
+
+# Multi-key issue fetch: keys per `key in (...)` search, searches in flight
+# at once, and the largest accepted request
+JIRA_GET_ISSUES_CHUNK = int(os.getenv("JIRA_GET_ISSUES_CHUNK", "100"))
+JIRA_GET_ISSUES_CONCURRENCY = int(os.getenv("JIRA_GET_ISSUES_CONCURRENCY", "4"))
+JIRA_GET_ISSUES_MAX_KEYS = int(os.getenv("JIRA_GET_ISSUES_MAX_KEYS", "1000"))
+
+# Local issue mirror (off by default): a SQLite copy of the issues matched by
+# MIRROR_JQL (empty = every issue the account can see), kept current by pulling
+# issues updated since the last sync every MIRROR_SYNC_INTERVAL seconds. Only
+# one process per MIRROR_DB_PATH syncs; every worker reads it.
+MIRROR_ENABLED = os.getenv("MIRROR_ENABLED", "false").lower() == "true"
+MIRROR_DB_PATH = os.getenv("MIRROR_DB_PATH", "jira_mirror.db")
+MIRROR_JQL = os.getenv("MIRROR_JQL", "")
+MIRROR_SYNC_INTERVAL = float(os.getenv("MIRROR_SYNC_INTERVAL", "60"))
+MIRROR_SYNC_OVERLAP = float(os.getenv("MIRROR_SYNC_OVERLAP", "120"))
+MIRROR_PAGE_SIZE = int(os.getenv("MIRROR_PAGE_SIZE", "100"))
+MIRROR_SEARCH_MAX_RESULTS = int(os.getenv("MIRROR_SEARCH_MAX_RESULTS", "200"))
+
+# Jira webhooks (/webhooks/jira): shared secret, checked as an X-Hub-Signature
+# HMAC of the body or as ?secret= in the registered URL. Unset disables the route.
+JIRA_WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET")
+
+# Response compression (gzip, or brotli when installed), negotiated with
+# Accept-Encoding. Bodies under COMPRESSION_MIN_SIZE bytes are sent as is;
+# streamed responses are always compressed, with a flush per chunk.
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_MIME_TYPES = {
+    t.strip().lower() for t in os.getenv(
+        "COMPRESSION_MIME_TYPES",
+        "application/json,application/x-ndjson,text/event-stream,text/html,text/plain"
+    ).split(",") if t.strip()
+}
+
+# JSON backend: "auto" uses orjson when installed, "json" forces the stdlib
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto").lower()
+
+# Cold start: the Jira client libraries (requests and atlassian-python-api, or
+# httpx in async mode) are imported on first use. With JIRA_CLIENT_WARMUP each
+# gunicorn worker imports them in a background thread as soon as it boots.
+JIRA_CLIENT_WARMUP = os.getenv("JIRA_CLIENT_WARMUP", "true").lower() == "true"
+
+# MCP Streamable HTTP sessions (Mcp-Session-Id). Ids are signed with
+# MCP_SESSION_SECRET (random per server when unset; set it when several
+# servers share one URL). Each worker keeps at most MCP_SESSION_MAX_ENTRIES
+# sessions in memory and drops those idle for MCP_SESSION_IDLE_TIMEOUT seconds;
+# ids are refused MCP_SESSION_MAX_AGE seconds after initialize. With
+# MCP_SESSION_REQUIRED every request after initialize must carry a session id.
+MCP_SESSION_SECRET = os.getenv("MCP_SESSION_SECRET")
+MCP_SESSION_MAX_ENTRIES = int(os.getenv("MCP_SESSION_MAX_ENTRIES", "10000"))
+MCP_SESSION_IDLE_TIMEOUT = float(os.getenv("MCP_SESSION_IDLE_TIMEOUT", "1800"))
+MCP_SESSION_MAX_AGE = float(os.getenv("MCP_SESSION_MAX_AGE", "86400"))
+MCP_SESSION_REQUIRED = os.getenv("MCP_SESSION_REQUIRED", "false").lower() == "true"
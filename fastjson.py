@@ -0,0 +1,82 @@
+"""
+JSON encoding and decoding, with orjson when it is installed.
+
+orjson encodes and decodes issue payloads several times faster than the
+stdlib json module (see bench/json_bench.py). Without it, or with
+JSON_BACKEND=json, everything falls back to json. Output is compact JSON
+either way; values orjson cannot encode (integers beyond 64 bits, for
+instance) are retried with json.
+
+Used for Flask responses (FastJSONProvider), the ASGI routes, upstream
+Jira responses in both clients, streamed NDJSON/SSE records, and the
+cache and mirror serialization.
+"""
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+from config import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if JSON_BACKEND == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    # Dates and dataclasses go through `default`, as they do with json
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value, sort_keys=False, default=None):
+    """Compact JSON as UTF-8 bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=default,
+                                option=_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, sort_keys=sort_keys, default=default, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(value, sort_keys=False, default=None):
+    return dumps(value, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def response_json(response, **kwargs):
+    """Drop-in for requests' Response.json(), which always uses json"""
+    return loads(response.content)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by dumps()/loads(); same output as the default"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_str(obj, sort_keys=self.sort_keys, default=self.default)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            # Pretty-printed debug output stays with json
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, sort_keys=self.sort_keys, default=self.default),
+                                        mimetype=self.mimetype)
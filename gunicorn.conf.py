@@ -0,0 +1,106 @@
+"""
+Gunicorn configuration for production.
+
+SERVER_MODE selects the serving path:
+  sync  (default) - Flask app on gthread workers; each in-flight Jira call holds a thread
+  async           - asgi:app on uvicorn workers; in-flight Jira calls are coroutines
+
+Worker counts are derived from the CPU count and the number of requests
+each dyno should keep in flight (IO_CONCURRENCY). Every setting can be
+overridden with the environment variables named below.
+"""
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+mode = os.getenv("SERVER_MODE", "sync").lower()
+cpus = multiprocessing.cpu_count()
+io_concurrency = int(os.getenv("IO_CONCURRENCY", "64"))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = True
+
+# Prometheus multiprocess mode: workers write samples under this directory and
+# /metrics aggregates them. It must be set, and empty, before the app is
+# preloaded. Without an explicit directory each master gets a private one, so
+# two servers on one host never wipe or mix each other's samples.
+_own_metrics_dir = "PROMETHEUS_MULTIPROC_DIR" not in os.environ
+if _own_metrics_dir:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="jira-mcp-metrics-")
+else:
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+if mode == "async":
+    wsgi_app = "asgi:app"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    # One event loop per core is enough; concurrency comes from coroutines
+    workers = int(os.getenv("WEB_CONCURRENCY", cpus))
+else:
+    wsgi_app = "app:app"
+    worker_class = "gthread"
+    # Requests are I/O bound, so a few processes per core with IO_CONCURRENCY
+    # threads spread across them
+    workers = int(os.getenv("WEB_CONCURRENCY", cpus * 2))
+    threads = int(os.getenv("GUNICORN_THREADS", math.ceil(io_concurrency / workers)))
+    # The Jira pool blocks when empty (JIRA_POOL_TIMEOUT, then the call fails),
+    # so size it for every thread that can call Jira at once: request threads,
+    # the MCP batch pool, one jira_get_issues and one bulk-create fan-out, the
+    # health probe and the mirror sync. Connections still open only on demand.
+    jira_callers = (threads + int(os.getenv("MCP_BATCH_MAX_WORKERS", "32"))
+                    + int(os.getenv("JIRA_GET_ISSUES_CONCURRENCY", "4"))
+                    + int(os.getenv("JIRA_BULK_CREATE_CONCURRENCY", "4")) + 2)
+    os.environ.setdefault("JIRA_POOL_MAXSIZE", str(max(20, jira_callers)))
+
+# Keep client connections open longer than typical load balancer idle timeouts
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+# Heartbeat of the worker's own loop, not a request deadline: gthread and
+# uvicorn workers keep notifying while requests wait on Jira, so this only
+# catches a wedged process. Requests are bounded by the Jira client instead:
+# one call can take JIRA_RETRY_MAX_ATTEMPTS x (JIRA_RATE_MAX_WAIT +
+# JIRA_POOL_TIMEOUT + JIRA_CONNECT_TIMEOUT + JIRA_READ_TIMEOUT) plus
+# (attempts - 1) x JIRA_RETRY_MAX_WAIT, 280s with the defaults, and a tool may
+# make several calls. Lower those to tighten the bound.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# In-flight requests still waiting on Jira after this long are cut off on restart
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+
+def post_worker_init(worker):
+    # Probe Jira now, in the background, so readiness has a result soon after boot
+    from app import upstream_probe
+    upstream_probe.start()
+
+    # The worker can already answer initialize and tools/list; load the Jira
+    # client libraries in the background so the first tool call finds them ready.
+    # Async mode still uses the sync client for the project list and the mirror,
+    # so it loads both.
+    from config import JIRA_CLIENT_WARMUP
+    if not JIRA_CLIENT_WARMUP:
+        return
+    import threading
+    from jira_client import preload
+    loaders = [preload]
+    if mode == "async":
+        from async_jira import preload as preload_async
+        loaders.append(preload_async)
+    threading.Thread(target=lambda: [load() for load in loaders], name="jira-client-warmup", daemon=True).start()
+
+
+def child_exit(server, worker):
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
@@ -0,0 +1,88 @@
+"""
+Cached upstream probe for readiness checks.
+
+Health endpoints read the last probe result and never call Jira
+themselves. When the result is older than the probe interval a single
+background probe is started, so probes from many load balancers cost at
+most one upstream call per interval per worker.
+
+Each worker starts its first probe at boot (``start()`` from gunicorn's
+post_worker_init); until that probe finishes the state reports
+``starting`` rather than waiting for it.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class UpstreamProbe:
+    """Tracks the outcome of periodic ``check()`` calls against Jira"""
+
+    def __init__(self, check, interval, failure_threshold):
+        self.check = check
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_probe = None
+        self.last_latency_ms = None
+        self.last_success = None
+        self.last_failure = None
+        self.last_error = None
+        self.consecutive_failures = 0
+
+    def _probe(self):
+        started = time.perf_counter()
+        try:
+            self.check()
+        except Exception as e:
+            with self._lock:
+                self.consecutive_failures += 1
+                self.last_failure = datetime.now(timezone.utc).isoformat()
+                self.last_error = str(e)
+        else:
+            with self._lock:
+                self.consecutive_failures = 0
+                self.last_success = datetime.now(timezone.utc).isoformat()
+                self.last_error = None
+        finally:
+            with self._lock:
+                self.last_latency_ms = round((time.perf_counter() - started) * 1000, 3)
+                self._last_probe = time.monotonic()
+                self._running = False
+
+    def _maybe_start_probe(self):
+        # Caller holds self._lock
+        if self._running:
+            return
+        if self._last_probe is not None and time.monotonic() - self._last_probe < self.interval:
+            return
+        self._running = True
+        threading.Thread(target=self._probe, name="upstream-probe", daemon=True).start()
+
+    def start(self):
+        """Run the first probe in the background now, not on the first readiness check"""
+        with self._lock:
+            self._maybe_start_probe()
+
+    def circuit_state(self):
+        return "open" if self.consecutive_failures >= self.failure_threshold else "closed"
+
+    def state(self):
+        """Snapshot of the last probe; schedules a new one if due"""
+        with self._lock:
+            self._maybe_start_probe()
+            circuit = self.circuit_state()
+            return {
+                "ready": self.last_success is not None and circuit == "closed",
+                "starting": self._last_probe is None,
+                "circuit": circuit,
+                "probe_in_progress": self._running,
+                "probe_age_seconds": round(time.monotonic() - self._last_probe, 3) if self._last_probe is not None else None,
+                "probe_interval_seconds": self.interval,
+                "last_latency_ms": self.last_latency_ms,
+                "last_success": self.last_success,
+                "last_failure": self.last_failure,
+                "last_error": self.last_error,
+                "consecutive_failures": self.consecutive_failures,
+            }
@@ -1,25 +1,91 @@
-from flask import Flask, request, jsonify
-from atlassian import Jira
-import json
+from flask import Flask, request, jsonify, stream_with_context, g
+import logging
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from config import JIRA_URL, JIRA_USERNAME, JIRA_API_TOKEN, validate_config
+from log_config import configure_logging, Payload, redact_headers
+from compression import compress_response
+import fastjson
+from config import (
+    JIRA_URL, JIRA_USERNAME,
+    HEALTH_PROBE_INTERVAL, HEALTH_FAILURE_THRESHOLD,
+    MCP_BATCH_MAX_WORKERS, MCP_BATCH_CONCURRENCY, MCP_BATCH_MAX_SIZE, JIRA_WEBHOOK_SECRET,
+)
+from jira_client import get_jira_client, pool_stats
+from health import UpstreamProbe
+from ratelimit import jira_rate_limiter
+from tools import (
+    TOOLS, TOOLS_LIST_BODY, TOOLS_LIST_ETAG, TOOLS_CACHE_CONTROL, METHOD_ALIASES, tools_rpc_body, tools_rpc_etag,
+)
+from streaming import (
+    iter_pages, ndjson_records, sse_search_events, wants_stream, accepts_sse, progress_token, progress_message,
+    queued_events,
+)
+from sessions import SESSION_HEADER, PROTOCOL_HEADER
+import sessions
+from renderers import SEARCH_FIELDS
+from bulk import summarize
+from executor import local_mirror, DEFAULT_JQL, rpc_error
+import executor
+import multiget
+import cache
+import webhooks
+import metrics
+import singleflight
 
 app = Flask(__name__)
+app.json = fastjson.FastJSONProvider(app)
+logger = configure_logging()
 
 # Build info - Updated for clean deployment
 BUILD_VERSION = "v1.3.0-mcp-fix"
 BUILD_TIME = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+START_TIME = time.monotonic()
 
-# Initialize Jira client
-def get_jira_client():
-    validate_config()
-    return Jira(
-        url=JIRA_URL,
-        username=JIRA_USERNAME,
-        password=JIRA_API_TOKEN,
-        cloud=True
-    )
+# Worker pool shared by all JSON-RPC batches and progress-reporting tool calls in this process
+batch_executor = ThreadPoolExecutor(max_workers=MCP_BATCH_MAX_WORKERS, thread_name_prefix="mcp-batch")
+
+# Readiness probes read this instead of calling Jira; /myself is the cheapest authenticated call
+upstream_probe = UpstreamProbe(
+    lambda: get_jira_client().myself(),
+    interval=HEALTH_PROBE_INTERVAL,
+    failure_threshold=HEALTH_FAILURE_THRESHOLD
+)
+
+@app.before_request
+def start_local_mirror():
+    if local_mirror is not None:
+        local_mirror.start()
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc()
+
+# Registered before the metrics hook so it runs after it: metrics see the
+# uncompressed size, compression metrics the savings
+@app.after_request
+def compress(response):
+    return compress_response(response, request.headers.get("Accept-Encoding"))
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.HTTP_LATENCY.labels(route, request.method, str(response.status_code)).observe(
+        time.perf_counter() - g.request_started)
+    if request.content_length:
+        metrics.HTTP_REQUEST_BYTES.labels(route).observe(request.content_length)
+    if not response.is_streamed:
+        metrics.HTTP_RESPONSE_BYTES.labels(route).observe(response.calculate_content_length() or 0)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if "request_started" in g:
+        metrics.HTTP_IN_FLIGHT.dec()
 
 @app.route("/")
 def home():
@@ -33,9 +99,20 @@ def home():
     <ul>
         <li><strong>GET</strong> <code>/projects</code> - List all projects</li>
         <li><strong>GET</strong> <code>/issues?jql=&lt;query&gt;</code> - Search issues</li>
+        <li><strong>GET</strong> <code>/issues?jql=&lt;query&gt;&amp;stream=true</code> - Stream all matching issues as NDJSON</li>
         <li><strong>POST</strong> <code>/create-issue</code> - Create new issue</li>
+        <li><strong>POST</strong> <code>/create-issues</code> - Bulk create issues</li>
         <li><strong>GET</strong> <code>/issue/&lt;key&gt;</code> - Get specific issue</li>
+        <li><strong>GET</strong> <code>/issues/batch?keys=A-1,B-2</code> - Get several issues by key (also POST {"keys": [...]})</li>
+        <li><strong>GET</strong> <code>/local-search?text=&lt;words&gt;&amp;project=&lt;key&gt;</code> - Search the local mirror (when enabled)</li>
+        <li><strong>GET</strong> <code>/mirror</code> - Local mirror sync status</li>
         <li><strong>POST</strong> <code>/api/mcp</code> - MCP endpoint</li>
+        <li><strong>GET</strong> <code>/health/live</code> - Liveness (process only)</li>
+        <li><strong>GET</strong> <code>/health/ready</code> - Readiness (cached Jira probe)</li>
+        <li><strong>GET</strong> <code>/cache</code> - Cache hit/miss and coalescing counters</li>
+        <li><strong>POST</strong> <code>/cache/invalidate?name=&lt;cache&gt;</code> - Invalidate a cache</li>
+        <li><strong>POST</strong> <code>/webhooks/jira</code> - Jira webhook receiver (cache and mirror invalidation)</li>
+        <li><strong>GET</strong> <code>/metrics</code> - Prometheus metrics</li>
     </ul>
     
     <h2>MCP Tools Available:</h2>
@@ -43,543 +120,410 @@ def home():
         <li><code>list_jira_projects</code> - List all Jira projects</li>
         <li><code>search_jira_issues</code> - Search Jira issues with JQL</li>
         <li><code>get_jira_issue</code> - Get specific Jira issue details</li>
+        <li><code>jira_get_issues</code> - Get several Jira issues by key in one call</li>
         <li><code>create_jira_issue</code> - Create new Jira issue</li>
+        <li><code>jira_bulk_create_issues</code> - Create many Jira issues in one call</li>
+        <li><code>jira_local_search</code> - Search the local issue mirror (when MIRROR_ENABLED)</li>
     </ul>
     
     <h2>Test Connection:</h2>
     <a href="/projects">View Projects</a>
     """
 
+def parse_mcp_message(data):
+    """
+    Return (tool_name, arguments, request_id) from any supported MCP format.
+
+    A standard tools/call is unwrapped to the tool it names; its _meta
+    (progressToken) is kept with the arguments.
+    """
+    tool_name = (data.get("method") or 
+                data.get("name") or 
+                data.get("tool") or 
+                data.get("action"))
+    
+    arguments = (data.get("params") or 
+                data.get("arguments") or 
+                data.get("input") or 
+                {})
+    
+    if tool_name == "tools/call" and isinstance(arguments, dict):
+        tool_name = arguments.get("name")
+        meta = arguments.get("_meta")
+        arguments = arguments.get("arguments") or {}
+        if meta and isinstance(arguments, dict) and "_meta" not in arguments:
+            arguments = {**arguments, "_meta": meta}
+    
+    request_id = data.get("id", "1")
+    return tool_name, arguments, request_id
+
+def initialize_result(arguments):
+    # MCP initialization handshake - CRITICAL for Jace.ai
+    requested = arguments.get("protocolVersion") if isinstance(arguments, dict) else None
+    return {
+        "protocolVersion": sessions.negotiate_version(requested),
+        "capabilities": {
+            "tools": {
+                "listChanged": False
+            }
+        },
+        "serverInfo": {
+            "name": "jira-mcp-server",
+            "version": BUILD_VERSION
+        }
+    }
+
+def tools_list_result(arguments):
+    return {"tools": TOOLS}
+
+# Protocol methods answered without Jira; everything else is a tool call
+MCP_METHODS = {
+    "initialize": initialize_result,
+    "tools/list": tools_list_result,
+}
+
+def protocol_method(data, tool_name):
+    """Canonical protocol method a message names, or None; a tools/call always names a tool"""
+    if data.get("method") == "tools/call":
+        return None
+    method = METHOD_ALIASES.get(tool_name, tool_name)
+    return method if method in MCP_METHODS else None
+
+def mcp_method(data, tool_name, query_method=None):
+    """Protocol method handler for a message, or None for tool calls"""
+    method = protocol_method(data, tool_name)
+    if query_method == "tools/list" and method is None:
+        # ?method=tools/list discovery override
+        return tools_list_result
+    return MCP_METHODS.get(method)
+
+def handle_mcp_message(data, query_method=None):
+    """
+    Handle one JSON-RPC message and return (response_data, status_code).
+
+    Runs outside the Flask request context so batch entries can be executed
+    on worker threads; query_method carries the ?method= discovery override.
+    """
+    logger.debug("Parsed JSON: %s", Payload(data))
+    tool_name, arguments, request_id = parse_mcp_message(data)
+    logger.debug("Tool: %s, Args: %s", tool_name, Payload(arguments))
+    
+    method = mcp_method(data, tool_name, query_method)
+    if method is not None:
+        started = time.perf_counter()
+        response_data, status = {"jsonrpc": "2.0", "id": request_id, "result": method(arguments)}, 200
+        metrics.observe_tool(tool_name, "ok", time.perf_counter() - started)
+    else:
+        response_data, status = executor.rpc_response(executor.run(tool_name, arguments), request_id)
+    
+    logger.info("MCP %s id=%s -> %s", tool_name, request_id, "error" if "error" in response_data else "ok")
+    logger.debug("Response: %s", Payload(response_data))
+    return response_data, status
+
+def rest_error(e):
+    """Error response for the REST routes; Jira throttling becomes 429 with Retry-After"""
+    body, status, headers = executor.rest_error(e)
+    return jsonify(body), status, headers
+
+def rest_response(tool_name, arguments, present):
+    """Run a tool for a REST route: present(data) on success, the mapped error otherwise"""
+    outcome = executor.run(tool_name, arguments, surface="rest")
+    if not outcome.ok:
+        return rest_error(outcome.error)
+    return jsonify(present(outcome.data))
+
+def add_retry_after(response, response_data):
+    if isinstance(response_data, dict) and "retryAfter" in response_data.get("error", {}).get("data", {}):
+        response.headers["Retry-After"] = str(response_data["error"]["data"]["retryAfter"])
+    return response
+
+def handle_mcp_batch(messages, query_method=None):
+    """
+    Execute a JSON-RPC batch concurrently on the shared batch pool.
+
+    At most MCP_BATCH_CONCURRENCY entries of one batch are in flight at a
+    time. Responses keep request order and ids; entries without an "id"
+    are notifications and produce no response.
+    """
+    if not messages:
+        return {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32600, "message": "Invalid Request: empty batch"}
+        }, 400
+    if len(messages) > MCP_BATCH_MAX_SIZE:
+        return {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {
+                "code": -32600,
+                "message": f"Invalid Request: batch of {len(messages)} exceeds limit of {MCP_BATCH_MAX_SIZE}"
+            }
+        }, 400
+
+    logger.info("MCP batch of %d messages", len(messages))
+    slots = threading.BoundedSemaphore(MCP_BATCH_CONCURRENCY)
+    pending = []
+    for message in messages:
+        if not isinstance(message, dict):
+            pending.append((message, None))
+            continue
+        if is_notification(message):
+            continue
+        slots.acquire()
+        future = batch_executor.submit(handle_mcp_message, message, query_method)
+        future.add_done_callback(lambda _: slots.release())
+        pending.append((message, future))
+
+    responses = []
+    for message, future in pending:
+        if future is None:
+            responses.append({
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32600, "message": "Invalid Request: batch entry must be an object"}
+            })
+            continue
+        response_data, _ = future.result()
+        if "id" in message:
+            responses.append(response_data)
+
+    return (responses or None), 200
+
+def is_notification(data):
+    """Notifications and client responses get no reply (202 on their own)"""
+    method = data.get("method")
+    if method is None:
+        return "id" in data and ("result" in data or "error" in data)
+    return "id" not in data and isinstance(method, str) and method.startswith("notifications/")
+
+def open_session(data, session):
+    """
+    (response_data, session) for initialize over Streamable HTTP.
+
+    A new session is opened with the negotiated result; an initialize sent
+    on an existing session gets the result that session negotiated.
+    """
+    request_id = data.get("id", "1")
+    if session is not None and session.initialize_result is not None:
+        metrics.observe_tool("initialize", "ok")
+        return {"jsonrpc": "2.0", "id": request_id, "result": session.initialize_result}, session
+    response_data, _ = handle_mcp_message(data)
+    result = response_data["result"]
+    if session is None:
+        _, arguments, _ = parse_mcp_message(data)
+        client_info = arguments.get("clientInfo") if isinstance(arguments, dict) else None
+        session = sessions.store.create(result["protocolVersion"], result, client_info)
+    else:
+        session.initialize_result = result
+    return response_data, session
+
+def wants_progress(tool_name, arguments, accept_header):
+    """Answer as SSE with progress: the tool reports progress and the client asked for it"""
+    tool = executor.TOOLS_BY_NAME.get(tool_name)
+    return tool is not None and tool.reports_progress and isinstance(arguments, dict) and \
+        progress_token(arguments) is not None and accepts_sse(accept_header)
+
 # MCP Protocol Implementation with enhanced debugging
-@app.route("/api/mcp", methods=["GET", "POST", "OPTIONS"])
+@app.route("/api/mcp", methods=["GET", "POST", "DELETE", "OPTIONS"])
 def mcp_endpoint():
     """
-    MCP (Model Context Protocol) compliant endpoint with debug logging
+    MCP (Model Context Protocol) compliant endpoint with debug logging.
+
+    Speaks the Streamable HTTP transport (sessions, SSE responses) and keeps
+    answering sessionless JSON-RPC and GET tool discovery for older clients.
     """
-    # Log all requests for debugging
-    print(f"[MCP DEBUG] Method: {request.method}")
-    print(f"[MCP DEBUG] Headers: {dict(request.headers)}")
-    print(f"[MCP DEBUG] Args: {dict(request.args)}")
-    if request.method == "POST":
-        print(f"[MCP DEBUG] Body: {request.get_data(as_text=True)}")
+    # Request details are logged at DEBUG only (LOG_LEVEL=DEBUG)
+    logger.debug("Method: %s", request.method)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Headers: %s", Payload(redact_headers(request.headers)))
+        logger.debug("Args: %s", Payload(dict(request.args)))
+        if request.method == "POST":
+            logger.debug("Body: %s", Payload(request.get_data(as_text=True)))
     
     # Handle CORS preflight
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
-        response.headers.add("Access-Control-Allow-Methods", "GET,POST,OPTIONS")
-        return response
+        return add_cors_headers(jsonify({"status": "ok"}))
     
-    # Add CORS headers to all responses
-    def add_cors_headers(response):
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
-        response.headers.add("Access-Control-Allow-Methods", "GET,POST,OPTIONS")
-        return response
+    if request.method == "DELETE":
+        return add_cors_headers(end_session(request.headers.get(SESSION_HEADER)))
     
     if request.method == "GET":
+        accept = request.headers.get("Accept", "")
+        if "text/event-stream" in accept and "application/json" not in accept:
+            # No server-initiated messages, so no standalone SSE stream
+            response = app.response_class(status=405)
+            response.headers["Allow"] = "POST, DELETE, OPTIONS"
+            return add_cors_headers(response)
         # Check for different tool discovery patterns
         if request.args.get("action") == "list_tools" or request.args.get("method") == "tools/list":
             # Alternative tool discovery format
-            tool_response = {
-                "tools": [
-                    {
-                        "name": "jira_list_projects",
-                        "description": "List all available Jira projects",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {},
-                            "required": []
-                        }
-                    },
-                    {
-                        "name": "jira_search_issues", 
-                        "description": "Search Jira issues using JQL (Jira Query Language)",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "jql": {
-                                    "type": "string",
-                                    "description": "JQL query string (e.g., 'project = TEST AND status = Open')"
-                                },
-                                "max_results": {
-                                    "type": "integer",
-                                    "description": "Maximum number of results to return (default: 50)",
-                                    "default": 50
-                                }
-                            },
-                            "required": ["jql"]
-                        }
-                    },
-                    {
-                        "name": "jira_get_issue",
-                        "description": "Get detailed information about a specific Jira issue",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "issue_key": {
-                                    "type": "string",
-                                    "description": "Jira issue key (e.g., 'PROJ-123')"
-                                }
-                            },
-                            "required": ["issue_key"]
-                        }
-                    },
-                    {
-                        "name": "jira_create_issue",
-                        "description": "Create a new Jira issue",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "project_key": {
-                                    "type": "string",
-                                    "description": "Project key where the issue will be created"
-                                },
-                                "summary": {
-                                    "type": "string",
-                                    "description": "Brief summary of the issue"
-                                },
-                                "description": {
-                                    "type": "string",
-                                    "description": "Detailed description of the issue"
-                                },
-                                "issue_type": {
-                                    "type": "string",
-                                    "description": "Type of issue (e.g., 'Task', 'Bug', 'Story')",
-                                    "default": "Task"
-                                }
-                            },
-                            "required": ["project_key", "summary"]
-                        }
-                    }
-                ]
-            }
+            response = tools_response(TOOLS_LIST_BODY, TOOLS_LIST_ETAG)
         else:
             # Standard tool discovery format
-            tool_response = {
-                "jsonrpc": "2.0",
-                "id": request.args.get("id", "1"),
-                "result": {
-                    "tools": [
-                        {
-                            "name": "jira_list_projects",
-                            "description": "List all available Jira projects",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {},
-                                "required": []
-                            }
-                        },
-                        {
-                            "name": "jira_search_issues", 
-                            "description": "Search Jira issues using JQL (Jira Query Language)",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "jql": {
-                                        "type": "string",
-                                        "description": "JQL query string (e.g., 'project = TEST AND status = Open')"
-                                    },
-                                    "max_results": {
-                                        "type": "integer",
-                                        "description": "Maximum number of results to return (default: 50)",
-                                        "default": 50
-                                    }
-                                },
-                                "required": ["jql"]
-                            }
-                        },
-                        {
-                            "name": "jira_get_issue",
-                            "description": "Get detailed information about a specific Jira issue",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "issue_key": {
-                                        "type": "string",
-                                        "description": "Jira issue key (e.g., 'PROJ-123')"
-                                    }
-                                },
-                                "required": ["issue_key"]
-                            }
-                        },
-                        {
-                            "name": "jira_create_issue",
-                            "description": "Create a new Jira issue",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "project_key": {
-                                        "type": "string",
-                                        "description": "Project key where the issue will be created"
-                                    },
-                                    "summary": {
-                                        "type": "string",
-                                        "description": "Brief summary of the issue"
-                                    },
-                                    "description": {
-                                        "type": "string",
-                                        "description": "Detailed description of the issue"
-                                    },
-                                    "issue_type": {
-                                        "type": "string",
-                                        "description": "Type of issue (e.g., 'Task', 'Bug', 'Story')",
-                                        "default": "Task"
-                                    }
-                                },
-                                "required": ["project_key", "summary"]
-                            }
-                        }
-                    ]
-                }
-            }
+            request_id = request.args.get("id", "1")
+            response = tools_response(tools_rpc_body(request_id), tools_rpc_etag(request_id))
             
-        print(f"[MCP DEBUG] Returning tool discovery response: {json.dumps(tool_response, indent=2)}")
-        return add_cors_headers(jsonify(tool_response))
+        logger.debug("Returning tool discovery response (%s)", response.status_code)
+        return add_cors_headers(response)
     
     # Handle POST requests (tool calls)
     try:
-        data = request.json or {}
-        print(f"[MCP DEBUG] Parsed JSON: {json.dumps(data, indent=2)}")
-        
-        # Handle different MCP formats
-        tool_name = (data.get("method") or 
-                    data.get("name") or 
-                    data.get("tool") or 
-                    data.get("action"))
-        
-        arguments = (data.get("params") or 
-                    data.get("arguments") or 
-                    data.get("input") or 
-                    {})
-        
-        request_id = data.get("id", "1")
-        
-        print(f"[MCP DEBUG] Tool: {tool_name}, Args: {arguments}")
-        
-        jira = get_jira_client()
-        
-        # Handle different tool name formats
-        if tool_name in ["jira_list_projects", "list_jira_projects"]:
-            result = jira.projects()
-            response_data = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Found {len(result)} Jira projects:\n\n" + 
-                                   "\n".join([f"• {p['name']} ({p['key']})" for p in result])
-                        }
-                    ]
-                }
-            }
-            
-        elif tool_name == "initialize":
-            # MCP initialization handshake - CRITICAL for Jace.ai
-            print(f"[MCP DEBUG] Handling initialize request")
-            protocol_version = arguments.get("protocolVersion", "2024-11-05")
-            client_info = arguments.get("clientInfo", {})
-            
-            response_data = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {
-                            "listChanged": False
-                        }
-                    },
-                    "serverInfo": {
-                        "name": "jira-mcp-server",
-                        "version": BUILD_VERSION
-                    }
-                }
-            }
-            print(f"[MCP DEBUG] Initialize response: {json.dumps(response_data, indent=2)}")
-            
-        elif tool_name in ["tools/list", "listTools"] or request.args.get("method") == "tools/list":
-            # Tools discovery for MCP - return available tools
-            print(f"[MCP DEBUG] Handling tools/list request")
-            response_data = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "tools": [
-                        {
-                            "name": "jira_list_projects",
-                            "description": "List all available Jira projects from Talkable's Atlassian instance",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {},
-                                "required": []
-                            }
-                        },
-                        {
-                            "name": "jira_search_issues", 
-                            "description": "Search Jira issues using JQL (Jira Query Language)",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "jql": {
-                                        "type": "string",
-                                        "description": "JQL query string (e.g., 'project = TEST AND status = Open')"
-                                    },
-                                    "max_results": {
-                                        "type": "integer",
-                                        "description": "Maximum number of results to return (default: 50)",
-                                        "default": 50
-                                    }
-                                },
-                                "required": ["jql"]
-                            }
-                        },
-                        {
-                            "name": "jira_get_issue",
-                            "description": "Get detailed information about a specific Jira issue",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "issue_key": {
-                                        "type": "string",
-                                        "description": "Jira issue key (e.g., 'PROJ-123')"
-                                    }
-                                },
-                                "required": ["issue_key"]
-                            }
-                        },
-                        {
-                            "name": "jira_create_issue",
-                            "description": "Create a new Jira issue in Talkable's projects",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "project_key": {
-                                        "type": "string",
-                                        "description": "Project key where the issue will be created"
-                                    },
-                                    "summary": {
-                                        "type": "string",
-                                        "description": "Brief summary of the issue"
-                                    },
-                                    "description": {
-                                        "type": "string",
-                                        "description": "Detailed description of the issue"
-                                    },
-                                    "issue_type": {
-                                        "type": "string",
-                                        "description": "Type of issue (e.g., 'Task', 'Bug', 'Story')",
-                                        "default": "Task"
-                                    }
-                                },
-                                "required": ["project_key", "summary"]
-                            }
-                        }
-                    ]
-                }
-            }
-            
-        elif tool_name in ["jira_search_issues", "search_jira_issues"]:
-            jql = arguments.get("jql", "project IS NOT EMPTY ORDER BY created DESC")
-            max_results = arguments.get("max_results", 50)
-            
-            results = jira.jql(jql, limit=max_results)
-            issues = results.get("issues", [])
-            
-            if not issues:
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text", 
-                                "text": f"No issues found for JQL query: {jql}"
-                            }
-                        ]
-                    }
-                }
-            else:
-                issue_list = []
-                for issue in issues:
-                    fields = issue.get("fields", {})
-                    issue_list.append(
-                        f"• {issue['key']}: {fields.get('summary', 'No summary')}\n"
-                        f"  Status: {fields.get('status', {}).get('name', 'Unknown')}\n"
-                        f"  Assignee: {fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned'}\n"
-                        f"  Priority: {fields.get('priority', {}).get('name', 'None') if fields.get('priority') else 'None'}"
-                    )
-                
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Found {len(issues)} issues (JQL: {jql}):\n\n" + "\n\n".join(issue_list)
-                            }
-                        ]
-                    }
-                }
-            
-        elif tool_name in ["jira_get_issue", "get_jira_issue"]:
-            issue_key = arguments.get("issue_key")
-            if not issue_key:
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {
-                        "code": -32602,
-                        "message": "Invalid params: issue_key is required"
-                    }
-                }
-            else:
-                issue = jira.issue(issue_key)
-                fields = issue.get("fields", {})
-                
-                details = f"""
-**{issue_key}: {fields.get('summary', 'No summary')}**
-
-**Description:** {fields.get('description', 'No description')}
-
-**Status:** {fields.get('status', {}).get('name', 'Unknown')}
-**Priority:** {fields.get('priority', {}).get('name', 'None') if fields.get('priority') else 'None'}
-**Issue Type:** {fields.get('issuetype', {}).get('name', 'Unknown')}
-**Assignee:** {fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned'}
-**Reporter:** {fields.get('reporter', {}).get('displayName', 'Unknown') if fields.get('reporter') else 'Unknown'}
-**Created:** {fields.get('created', 'Unknown')}
-**Updated:** {fields.get('updated', 'Unknown')}
-**Project:** {fields.get('project', {}).get('name', 'Unknown')} ({fields.get('project', {}).get('key', 'Unknown')})
-"""
-                
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": details
-                            }
-                        ]
-                    }
-                }
-                
-        elif tool_name in ["jira_create_issue", "create_jira_issue"]:
-            project_key = arguments.get("project_key")
-            summary = arguments.get("summary")
-            
-            if not project_key or not summary:
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {
-                        "code": -32602,
-                        "message": "Invalid params: project_key and summary are required"
-                    }
-                }
-            else:
-                issue_data = {
-                    "summary": summary,
-                    "description": arguments.get("description", ""),
-                    "issuetype": {"name": arguments.get("issue_type", "Task")},
-                    "project": {"key": project_key}
-                }
-                
-                new_issue = jira.issue_create(fields=issue_data)
-                
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Successfully created issue: {new_issue['key']}\nSummary: {summary}\nProject: {project_key}"
-                            }
-                        ]
-                    }
-                }
-                
-        else:
-            response_data = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32601,
-                    "message": f"Method not found: {tool_name}. Available: jira_list_projects, jira_search_issues, jira_get_issue, jira_create_issue"
-                }
-            }
-            
-        print(f"[MCP DEBUG] Response: {json.dumps(response_data, indent=2)}")
-        return add_cors_headers(jsonify(response_data))
-            
+        data = request.json
     except Exception as e:
-        print(f"[MCP DEBUG] Error: {str(e)}")
-        error_response = {
+        logger.warning("Unparseable MCP request: %s", e)
+        return add_cors_headers(jsonify({
             "jsonrpc": "2.0",
-            "id": request.json.get("id", "1") if request.json else "1",
+            "id": None,
             "error": {
-                "code": -32603,
-                "message": f"Internal error: {str(e)}"
+                "code": -32700,
+                "message": f"Parse error: {str(e)}"
             }
-        }
-        return add_cors_headers(jsonify(error_response)), 500
+        })), 400
+
+    if data is None:
+        data = {}
+    initializing = isinstance(data, dict) and data.get("method") == "initialize"
+    try:
+        session = sessions.resolve(request.headers.get(SESSION_HEADER), request.headers.get(PROTOCOL_HEADER),
+                                   initializing)
+    except sessions.TransportError as e:
+        return add_cors_headers(jsonify(e.response())), e.status
+
+    response, session = mcp_post(data, session, initializing)
+    response = app.make_response(response)
+    if session is not None:
+        response.headers[SESSION_HEADER] = session.id
+    return add_cors_headers(response)
+
+def mcp_post(data, session, initializing):
+    """(Flask response value, session) for a POSTed message or batch"""
+    query_method = request.args.get("method")
+    if isinstance(data, list):
+        # JSON-RPC 2.0 batch
+        response_data, status = handle_mcp_batch(data, query_method)
+        if response_data is None:
+            # Batch of notifications only: nothing to return
+            return app.response_class(status=202), session
+        return (jsonify(response_data), status), session
+    if not isinstance(data, dict):
+        return (jsonify({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32600, "message": "Invalid Request: expected an object or a batch array"}
+        }), 400), session
+    if is_notification(data):
+        return app.response_class(status=202), session
+    if initializing:
+        response_data, session = open_session(data, session)
+        return jsonify(response_data), session
+
+    tool_name, arguments, request_id = parse_mcp_message(data)
+    accept = request.headers.get("Accept")
+    if protocol_method(data, tool_name) == "tools/list":
+        logger.debug("Handling tools/list request")
+        metrics.observe_tool(tool_name, "ok")
+        return tools_response(tools_rpc_body(request_id), tools_rpc_etag(request_id)), session
+    if tool_name in ["jira_search_issues", "search_jira_issues"] and \
+            isinstance(arguments, dict) and wants_stream(arguments):
+        metrics.observe_tool(tool_name, "stream")
+        return stream_mcp_search(arguments, request_id), session
+    if wants_progress(tool_name, arguments, accept):
+        return stream_tool_call(tool_name, arguments, request_id), session
+
+    response_data, status = handle_mcp_message(data, query_method)
+    return (add_retry_after(jsonify(response_data), response_data), status), session
+
+def end_session(session_id):
+    """DELETE /api/mcp: terminate the session in every worker"""
+    if not session_id:
+        e = sessions.TransportError(400, -32600, f"Bad Request: {SESSION_HEADER} header is required")
+    elif not sessions.store.terminate(session_id):
+        e = sessions.TransportError(404, sessions.SESSION_NOT_FOUND_CODE, "Session not found")
+    else:
+        return app.response_class(status=204)
+    return app.make_response((jsonify(e.response()), e.status))
+
+def stream_mcp_search(arguments, request_id):
+    """Stream a jira_search_issues call as SSE, with progress notifications when the client sent a token"""
+    try:
+        args = executor.TOOLS_BY_NAME["jira_search_issues"].prepare(arguments)
+        logger.info("Streaming search: %s", args["jql"])
+        pages = iter_pages(get_jira_client(), args["jql"], max_results=args["limit"],
+                           fields=args["fields"], expand=args["expand"])
+    except Exception as e:
+        logger.error("Error starting streamed search: %s", e)
+        response_data, status = rpc_error(e, request_id)
+        return add_retry_after(jsonify(response_data), response_data), status
+
+    response = app.response_class(
+        stream_with_context(sse_search_events(request_id, progress_token(arguments), args["jql"], pages,
+                                              args["limit"], args["extras"])),
+        mimetype="text/event-stream"
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def stream_tool_call(tool_name, arguments, request_id):
+    """
+    Run a tool that reports progress on the shared pool and answer as SSE:
+    notifications/progress events while it runs, then its JSON-RPC response.
+    """
+    token = progress_token(arguments)
+    events = queue.SimpleQueue()
+
+    def call():
+        try:
+            outcome = executor.run(tool_name, arguments,
+                                   progress=lambda done, total, message: events.put(
+                                       progress_message(token, done, total, message)))
+            events.put(executor.rpc_response(outcome, request_id)[0])
+        finally:
+            events.put(None)
+
+    batch_executor.submit(call)
+    response = app.response_class(queued_events(events), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def tools_response(body, etag):
+    """Serve pre-serialized tool discovery bytes; If-None-Match gets a 304"""
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = TOOLS_CACHE_CONTROL
+    return response.make_conditional(request)
+
+def add_cors_headers(response):
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    response.headers.add("Access-Control-Allow-Headers",
+                         f"Content-Type,Authorization,{SESSION_HEADER},{PROTOCOL_HEADER}")
+    response.headers.add("Access-Control-Allow-Methods", "GET,POST,DELETE,OPTIONS")
+    response.headers.add("Access-Control-Expose-Headers", SESSION_HEADER)
+    return response
 
 # Keep existing REST endpoints for backward compatibility
 @app.route("/projects")
 def get_projects():
-    try:
-        jira = get_jira_client()
-        projects = jira.projects()
-        return jsonify({
-            "success": True,
-            "projects": projects
-        })
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    return rest_response("jira_list_projects", {}, lambda projects: {
+        "success": True,
+        "projects": projects
+    })
 
 # Additional MCP endpoints that Jace.ai might expect
 @app.route("/tools/list", methods=["GET", "POST"])
 def tools_list():
     """Alternative tools list endpoint"""
-    print(f"[MCP DEBUG] /tools/list called with method: {request.method}")
-    tools = [
-        {
-            "name": "jira_list_projects",
-            "description": "List all available Jira projects"
-        },
-        {
-            "name": "jira_search_issues", 
-            "description": "Search Jira issues using JQL"
-        },
-        {
-            "name": "jira_get_issue",
-            "description": "Get detailed information about a specific Jira issue"
-        },
-        {
-            "name": "jira_create_issue",
-            "description": "Create a new Jira issue"
-        }
-    ]
-    
-    response = jsonify({"tools": tools})
+    logger.debug("/tools/list called with method: %s", request.method)
+    response = tools_response(TOOLS_LIST_BODY, TOOLS_LIST_ETAG)
     response.headers.add("Access-Control-Allow-Origin", "*")
     return response
 
 @app.route("/initialize", methods=["POST"])
 def initialize():
     """MCP initialization endpoint"""
-    print(f"[MCP DEBUG] /initialize called")
+    logger.debug("/initialize called")
     data = request.json or {}
-    print(f"[MCP DEBUG] Initialize data: {json.dumps(data, indent=2)}")
+    logger.debug("Initialize data: %s", Payload(data))
     
     response_data = {
         "protocolVersion": "2024-11-05",
@@ -601,224 +545,236 @@ def initialize():
 @app.route("/tools", methods=["GET", "POST"])
 def tools_endpoint():
     """Alternative tools endpoint"""
-    print(f"[MCP DEBUG] /tools called with method: {request.method}")
+    logger.debug("/tools called with method: %s", request.method)
     if request.method == "POST":
         data = request.json or {}
-        print(f"[MCP DEBUG] Tools POST data: {json.dumps(data, indent=2)}")
-    
-    tools = {
-        "tools": [
-            {
-                "name": "jira_list_projects",
-                "description": "List all available Jira projects",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            },
-            {
-                "name": "jira_search_issues", 
-                "description": "Search Jira issues using JQL (Jira Query Language)",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "jql": {
-                            "type": "string",
-                            "description": "JQL query string"
-                        }
-                    },
-                    "required": ["jql"]
-                }
-            },
-            {
-                "name": "jira_get_issue",
-                "description": "Get detailed information about a specific Jira issue",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "issue_key": {
-                            "type": "string",
-                            "description": "Jira issue key (e.g., 'PROJ-123')"
-                        }
-                    },
-                    "required": ["issue_key"]
-                }
-            },
-            {
-                "name": "jira_create_issue",
-                "description": "Create a new Jira issue",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "project_key": {"type": "string"},
-                        "summary": {"type": "string"}
-                    },
-                    "required": ["project_key", "summary"]
-                }
-            }
-        ]
-    }
+        logger.debug("Tools POST data: %s", Payload(data))
     
-    response = jsonify(tools)
+    response = tools_response(TOOLS_LIST_BODY, TOOLS_LIST_ETAG)
     response.headers.add("Access-Control-Allow-Origin", "*")
     return response
 
 @app.route("/call", methods=["POST"])
 def call_tool():
-    """MCP tool call endpoint"""
-    print(f"[MCP DEBUG] /call endpoint called")
-    data = request.json or {}
-    print(f"[MCP DEBUG] Call data: {json.dumps(data, indent=2)}")
+    """MCP tool call endpoint: any tool, {"name": ..., "arguments": {...}}"""
+    logger.debug("/call endpoint called")
+    data = request.get_json(silent=True) or {}
+    logger.debug("Call data: %s", Payload(data))
     
-    tool_name = data.get("name")
-    arguments = data.get("arguments", {})
-    
-    try:
-        jira = get_jira_client()
-        
-        if tool_name == "jira_list_projects":
-            result = jira.projects()
-            response_data = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Found {len(result)} Jira projects:\n\n" + 
-                               "\n".join([f"• {p['name']} ({p['key']})" for p in result])
-                    }
-                ]
-            }
-        elif tool_name == "jira_search_issues":
-            jql = arguments.get("jql", "project IS NOT EMPTY ORDER BY created DESC")
-            results = jira.jql(jql, limit=50)
-            issues = results.get("issues", [])
-            
-            if not issues:
-                response_data = {
-                    "content": [{"type": "text", "text": f"No issues found for JQL: {jql}"}]
-                }
-            else:
-                issue_list = []
-                for issue in issues:
-                    fields = issue.get("fields", {})
-                    issue_list.append(f"• {issue['key']}: {fields.get('summary', 'No summary')}")
-                
-                response_data = {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Found {len(issues)} issues:\n" + "\n".join(issue_list)
-                        }
-                    ]
-                }
-        else:
-            response_data = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Tool {tool_name} not implemented in /call endpoint"
-                    }
-                ]
-            }
-            
-        response = jsonify(response_data)
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
-        
-    except Exception as e:
-        print(f"[MCP DEBUG] Error in /call: {str(e)}")
-        error_response = {
-            "content": [{"type": "text", "text": f"Error: {str(e)}"}]
-        }
-        response = jsonify(error_response)
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+    outcome = executor.run(data.get("name"), data.get("arguments") or {}, surface="call")
+    body, status, headers = executor.call_response(outcome)
+    response = jsonify(body)
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response, status, headers
 
 @app.route("/issues")
 def search_issues():
-    jql = request.args.get("jql", "project IS NOT EMPTY ORDER BY created DESC")
-    max_results = int(request.args.get("max_results", 50))
+    jql = request.args.get("jql", DEFAULT_JQL)
+    stream = request.args.get("stream", "").lower() in ("1", "true", "yes") or \
+        "application/x-ndjson" in request.headers.get("Accept", "")
+    if stream:
+        return stream_search_issues(jql)
     
+    return rest_response("jira_search_issues", {**request.args.to_dict(), "jql": jql}, lambda results: {
+        "success": True,
+        "jql": jql,
+        "total": results.get("total", 0),
+        "issues": results.get("issues", [])
+    })
+
+def rest_projection():
+    """fields/expand for the streamed REST search, as the executor projects them for REST"""
+    projection = executor.projection(SEARCH_FIELDS, request.args, rest=True)
+    return {"fields": projection["fields"], "expand": projection["expand"]}
+
+def stream_search_issues(jql):
+    """
+    Walk every page of a search and send issues as chunked NDJSON.
+
+    The first page is fetched before responding so upstream errors still
+    get a 500; later failures are reported as an "error" record.
+    """
+    max_results = request.args.get("max_results")
     try:
-        jira = get_jira_client()
-        results = jira.jql(jql, limit=max_results)
-        return jsonify({
-            "success": True,
-            "jql": jql,
-            "total": results.get("total", 0),
-            "issues": results.get("issues", [])
-        })
+        pages = iter_pages(get_jira_client(), jql, max_results=int(max_results) if max_results else None,
+                           **rest_projection())
+        first_page = next(pages)
     except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+        return rest_error(e)
+
+    return app.response_class(
+        stream_with_context(ndjson_records(jql, first_page, pages)),
+        mimetype="application/x-ndjson"
+    )
 
 @app.route("/issue/<issue_key>")
 def get_issue(issue_key):
-    try:
-        jira = get_jira_client()
-        issue = jira.issue(issue_key)
+    return rest_response("jira_get_issue", {**request.args.to_dict(), "issue_key": issue_key}, lambda issue: {
+        "success": True,
+        "issue": issue
+    })
+
+@app.route("/issues/batch", methods=["GET", "POST"])
+def get_issues_batch():
+    """Several issues by key: ?keys=A-1,B-2 or {"keys": [...]}; one result per key, in order"""
+    keys = request.args.get("keys") if request.method == "GET" else (request.get_json(silent=True) or {}).get("keys")
+    return rest_response("jira_get_issues", {**request.args.to_dict(), "issue_keys": keys}, lambda results: {
+        "success": True,
+        **multiget.summarize(results),
+        "issues": results
+    })
+
+@app.route("/local-search")
+def local_search_endpoint():
+    """Search the local mirror: ?text=&project=&status=&assignee=&issue_type=&max_results="""
+    if local_mirror is None:
+        return jsonify({
+            "success": False,
+            "error": "Local mirror is disabled (set MIRROR_ENABLED=true)"
+        }), 404
+    return rest_response("jira_local_search", request.args.to_dict(), lambda found: {
+        "success": True,
+        "count": len(found[0]),
+        "mirror": found[1],
+        "issues": found[0]
+    })
+
+@app.route("/mirror")
+def mirror_status():
+    """How current the local mirror is and how its last sync went"""
+    if local_mirror is None:
         return jsonify({
             "success": True,
-            "issue": issue
+            "enabled": False
         })
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    return jsonify({
+        "success": True,
+        "enabled": True,
+        **local_mirror.status()
+    })
 
 @app.route("/create-issue", methods=["POST"])
 def create_issue():
-    try:
-        jira = get_jira_client()
-        data = request.json
-        
-        # Example issue data structure
-        issue_data = {
-            "summary": data.get("summary", "Issue created via API"),
-            "description": data.get("description", ""),
-            "issuetype": {"name": data.get("issue_type", "Task")},
-            "project": {"key": data.get("project_key")}
-        }
-        
-        if data.get("assignee"):
-            issue_data["assignee"] = {"name": data["assignee"]}
-            
-        if data.get("priority"):
-            issue_data["priority"] = {"name": data["priority"]}
-        
-        new_issue = jira.issue_create(fields=issue_data)
+    data = request.get_json(silent=True) or {}
+    return rest_response("jira_create_issue", {"summary": "Issue created via API", **data}, lambda new_issue: {
+        "success": True,
+        "issue": new_issue
+    })
+
+@app.route("/create-issues", methods=["POST"])
+def create_issues():
+    """Bulk create: {"issues": [...], "project_key": default}; one result per issue"""
+    data = request.get_json(silent=True) or {}
+    outcome = executor.run("jira_bulk_create_issues", data, surface="rest")
+    if not outcome.ok:
+        return rest_error(outcome.error)
+    summary = summarize(outcome.data)
+    return jsonify({
+        "success": summary["failed"] == 0,
+        **summary,
+        "results": outcome.data
+    })
+
+@app.route("/cache", methods=["GET"])
+def cache_stats():
+    """Hit/miss counters for the in-process caches and coalesced upstream calls"""
+    return jsonify({
+        "success": True,
+        "caches": {name: c.stats() for name, c in cache.caches.items()},
+        "invalidations": cache.invalidations.stats(),
+        "singleflight": {name: group.stats() for name, group in singleflight.groups.items()}
+    })
+
+@app.route("/cache/invalidate", methods=["POST"])
+def cache_invalidate():
+    """Drop one cache (?name=projects) or all of them, in every worker"""
+    name = request.args.get("name") or (request.get_json(silent=True) or {}).get("name")
+    if name and name not in cache.caches:
         return jsonify({
-            "success": True,
-            "issue": new_issue
-        })
-    except Exception as e:
+            "success": False,
+            "error": f"Unknown cache: {name}. Available: {', '.join(cache.caches)}"
+        }), 404
+
+    invalidated = [name] if name else list(cache.caches)
+    cache.publish(name or "*")
+    return jsonify({
+        "success": True,
+        "invalidated": invalidated
+    })
+
+@app.route("/webhooks/jira", methods=["POST"])
+def jira_webhook():
+    """Jira issue/comment/worklog/project events; updates caches and the mirror"""
+    if not JIRA_WEBHOOK_SECRET:
+        return jsonify({
+            "success": False,
+            "error": "Webhooks are disabled (set JIRA_WEBHOOK_SECRET)"
+        }), 404
+    body = request.get_data()
+    try:
+        webhooks.verify(body, request.headers.get(webhooks.SIGNATURE_HEADER), request.args.get("secret"),
+                        JIRA_WEBHOOK_SECRET)
+    except webhooks.Unauthorized as e:
+        metrics.WEBHOOK_EVENTS.labels("rejected").inc()
         return jsonify({
             "success": False,
             "error": str(e)
-        }), 500
+        }), 401
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({
+            "success": False,
+            "error": "Expected a JSON object"
+        }), 400
+    result = webhooks.handle(payload, local_mirror)
+    logger.info("Webhook %s: %s", result["event"] or "unknown", ", ".join(result["actions"]) or "ignored")
+    return jsonify({
+        "success": True,
+        **result
+    })
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Prometheus metrics, aggregated across gunicorn workers"""
+    body, content_type = metrics.metrics_payload()
+    return app.response_class(body, content_type=content_type)
+
+@app.route("/health/live")
+def liveness_check():
+    """Process-only check; never touches Jira"""
+    return jsonify({
+        "status": "alive",
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.monotonic() - START_TIME, 3),
+        "version": BUILD_VERSION
+    })
 
 @app.route("/health")
+@app.route("/health/ready")
 def health_check():
-    try:
-        jira = get_jira_client()
-        # Simple test to verify connection
-        jira.projects()
-        return jsonify({
-            "status": "healthy",
-            "jira_url": JIRA_URL,
-            "username": JIRA_USERNAME,
-            "version": BUILD_VERSION,
-            "build_time": BUILD_TIME
-        })
-    except Exception as e:
-        return jsonify({
-            "status": "unhealthy",
-            "error": str(e)
-        }), 500
+    """Readiness check backed by the cached upstream probe; never blocks on Jira"""
+    if request.args.get("mode") == "live":
+        return liveness_check()
+
+    upstream = upstream_probe.state()
+    if upstream["ready"]:
+        status = "healthy"
+    else:
+        # No probe result yet in this worker: not ready, but not known to be broken
+        status = "starting" if upstream["starting"] else "unhealthy"
+    return jsonify({
+        "status": status,
+        "jira_url": JIRA_URL,
+        "username": JIRA_USERNAME,
+        "version": BUILD_VERSION,
+        "build_time": BUILD_TIME,
+        "upstream": upstream,
+        "pool": pool_stats(),
+        "rate_limit": jira_rate_limiter.stats(),
+        "json_backend": fastjson.BACKEND
+    }), 200 if upstream["ready"] else 503
 
+# Development server only; production runs gunicorn -c gunicorn.conf.py (see Procfile)
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
-    app.run(debug=True, host="0.0.0.0", port=port)
\ No newline at end of file
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", host="0.0.0.0", port=port)
\ No newline at end of file
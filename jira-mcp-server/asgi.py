@@ -0,0 +1,372 @@
+"""
+Asyncio (ASGI) serving mode.
+
+The Jira-bound routes (/api/mcp tool calls, /call, /projects, /issues,
+/issue/<key>, /issues/batch, /create-issue, /create-issues) are served natively with the non-blocking
+client from async_jira, so a slow JQL query only parks a coroutine. They
+run the same executor tools as the Flask routes, through executor.arun.
+Every other request (tool discovery, initialize, health, cache admin)
+falls through to the Flask app unchanged.
+
+Run with:  uvicorn asgi:app --port 5000
+"""
+import asyncio
+import re
+import time
+
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse as StarletteJSONResponse, Response, StreamingResponse
+
+from app import (
+    app as flask_app, parse_mcp_message, handle_mcp_message, handle_mcp_batch, mcp_method, protocol_method,
+    is_notification, open_session, wants_progress,
+)
+from executor import local_mirror, DEFAULT_JQL, rpc_error
+from async_jira import get_async_jira_client, close_async_jira_client
+from compression import compressing_send
+from config import MCP_BATCH_CONCURRENCY, MCP_BATCH_MAX_SIZE
+from tools import TOOLS_CACHE_CONTROL, tools_rpc_body, tools_rpc_etag
+from streaming import (
+    aiter_pages, andjson_records, asse_search_events, wants_stream, progress_token, progress_message,
+    aqueued_events,
+)
+from sessions import SESSION_HEADER, PROTOCOL_HEADER
+import sessions
+from renderers import SEARCH_FIELDS
+from bulk import summarize
+import executor
+import fastjson
+import multiget
+import metrics
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": f"Content-Type,Authorization,{SESSION_HEADER},{PROTOCOL_HEADER}",
+    "Access-Control-Allow-Methods": "GET,POST,DELETE,OPTIONS",
+    "Access-Control-Expose-Headers": SESSION_HEADER,
+}
+
+
+class JSONResponse(StarletteJSONResponse):
+    """JSONResponse encoded with fastjson (orjson when installed)"""
+
+    def render(self, content):
+        return fastjson.dumps(content)
+
+
+async def handle_mcp_message_async(data, query_method=None):
+    """Async counterpart of app.handle_mcp_message; returns (response_data, status_code)"""
+    tool_name, arguments, request_id = parse_mcp_message(data)
+    if mcp_method(data, tool_name, query_method) is not None:
+        # initialize and tools/list make no Jira calls
+        return handle_mcp_message(data, query_method)
+    return executor.rpc_response(await executor.arun(tool_name, arguments), request_id)
+
+
+async def handle_mcp_batch_async(messages, query_method=None):
+    """Batch entries run concurrently, MCP_BATCH_CONCURRENCY at a time"""
+    if not messages or len(messages) > MCP_BATCH_MAX_SIZE:
+        # Rejected before anything runs; reuse the Flask-side error responses
+        return handle_mcp_batch(messages)
+
+    slots = asyncio.Semaphore(MCP_BATCH_CONCURRENCY)
+
+    async def run(message):
+        if not isinstance(message, dict):
+            return {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32600, "message": "Invalid Request: batch entry must be an object"}
+            }
+        if is_notification(message):
+            return None
+        async with slots:
+            response_data, _ = await handle_mcp_message_async(message, query_method)
+        return response_data if "id" in message else None
+
+    responses = await asyncio.gather(*[run(message) for message in messages])
+    responses = [r for r in responses if r is not None]
+    return (responses or None), 200
+
+
+def stream_mcp_search(arguments, request_id):
+    try:
+        args = executor.TOOLS_BY_NAME["jira_search_issues"].prepare(arguments)
+        pages = aiter_pages(get_async_jira_client(), args["jql"], max_results=args["limit"],
+                            fields=args["fields"], expand=args["expand"])
+    except Exception as e:
+        response_data, status = rpc_error(e, request_id)
+        return JSONResponse(response_data, status_code=status, headers={**CORS_HEADERS, **retry_headers(response_data)})
+    return StreamingResponse(
+        asse_search_events(request_id, progress_token(arguments), args["jql"], pages, args["limit"], args["extras"]),
+        media_type="text/event-stream",
+        headers={**CORS_HEADERS, "Cache-Control": "no-cache"}
+    )
+
+
+streamed_calls = set()
+
+
+def stream_tool_call(tool_name, arguments, request_id):
+    """Async counterpart of app.stream_tool_call: the tool runs as a task feeding the SSE response"""
+    token = progress_token(arguments)
+    events = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+
+    def progress(done, total, message):
+        # Tools without a native async implementation report from a thread
+        loop.call_soon_threadsafe(events.put_nowait, progress_message(token, done, total, message))
+
+    async def call():
+        try:
+            outcome = await executor.arun(tool_name, arguments, progress=progress)
+            events.put_nowait(executor.rpc_response(outcome, request_id)[0])
+        finally:
+            events.put_nowait(None)
+
+    # The loop only keeps weak references to tasks; hold it until it finishes,
+    # even if the client goes away first
+    task = asyncio.ensure_future(call())
+    streamed_calls.add(task)
+    task.add_done_callback(streamed_calls.discard)
+    return StreamingResponse(aqueued_events(events), media_type="text/event-stream",
+                             headers={**CORS_HEADERS, "Cache-Control": "no-cache"})
+
+
+async def mcp_endpoint(request):
+    try:
+        data = fastjson.loads(await request.body() or b"null")
+    except ValueError as e:
+        return JSONResponse({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32700, "message": f"Parse error: {str(e)}"}
+        }, status_code=400, headers=CORS_HEADERS)
+
+    if data is None:
+        data = {}
+    initializing = isinstance(data, dict) and data.get("method") == "initialize"
+    try:
+        session = sessions.resolve(request.headers.get(SESSION_HEADER), request.headers.get(PROTOCOL_HEADER),
+                                   initializing)
+    except sessions.TransportError as e:
+        return JSONResponse(e.response(), status_code=e.status, headers=CORS_HEADERS)
+
+    response, session = await mcp_post(request, data, session, initializing)
+    if session is not None:
+        response.headers[SESSION_HEADER] = session.id
+    return response
+
+
+async def mcp_post(request, data, session, initializing):
+    """Async counterpart of app.mcp_post; returns (response, session)"""
+    query_method = request.query_params.get("method")
+    if isinstance(data, list):
+        response_data, status = await handle_mcp_batch_async(data, query_method)
+        if response_data is None:
+            return Response(status_code=202, headers=CORS_HEADERS), session
+    elif isinstance(data, dict):
+        if is_notification(data):
+            return Response(status_code=202, headers=CORS_HEADERS), session
+        if initializing:
+            response_data, session = open_session(data, session)
+            return JSONResponse(response_data, headers=CORS_HEADERS), session
+        tool_name, arguments, request_id = parse_mcp_message(data)
+        accept = request.headers.get("accept")
+        if protocol_method(data, tool_name) == "tools/list":
+            metrics.observe_tool(tool_name, "ok")
+            return Response(tools_rpc_body(request_id), media_type="application/json", headers={
+                **CORS_HEADERS,
+                "ETag": f'"{tools_rpc_etag(request_id)}"',
+                "Cache-Control": TOOLS_CACHE_CONTROL,
+            }), session
+        if tool_name in ["jira_search_issues", "search_jira_issues"] and \
+                isinstance(arguments, dict) and wants_stream(arguments):
+            metrics.observe_tool(tool_name, "stream")
+            return stream_mcp_search(arguments, request_id), session
+        if wants_progress(tool_name, arguments, accept):
+            return stream_tool_call(tool_name, arguments, request_id), session
+        response_data, status = await handle_mcp_message_async(data, query_method)
+        return JSONResponse(response_data, status_code=status,
+                            headers={**CORS_HEADERS, **retry_headers(response_data)}), session
+    else:
+        response_data, status = {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32600, "message": "Invalid Request: expected an object or a batch array"}
+        }, 400
+    return JSONResponse(response_data, status_code=status, headers=CORS_HEADERS), session
+
+
+def retry_headers(response_data):
+    """Retry-After for a rate-limited JSON-RPC error response"""
+    retry_after = response_data.get("error", {}).get("data", {}).get("retryAfter")
+    return {} if retry_after is None else {"Retry-After": str(retry_after)}
+
+
+async def call_tool(request):
+    try:
+        data = await request.json() or {}
+    except ValueError:
+        data = {}
+    outcome = await executor.arun(data.get("name"), data.get("arguments") or {}, surface="call")
+    body, status, headers = executor.call_response(outcome)
+    return JSONResponse(body, status_code=status, headers={"Access-Control-Allow-Origin": "*", **headers})
+
+
+def rest_error(e):
+    """Same error mapping as app.rest_error"""
+    body, status, headers = executor.rest_error(e)
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+async def rest_response(tool_name, arguments, present):
+    """Async counterpart of app.rest_response"""
+    outcome = await executor.arun(tool_name, arguments, surface="rest")
+    if not outcome.ok:
+        return rest_error(outcome.error)
+    return JSONResponse(present(outcome.data))
+
+
+async def get_projects(request):
+    return await rest_response("jira_list_projects", {}, lambda projects: {"success": True, "projects": projects})
+
+
+async def search_issues(request):
+    jql = request.query_params.get("jql", DEFAULT_JQL)
+    stream = request.query_params.get("stream", "").lower() in ("1", "true", "yes") or \
+        "application/x-ndjson" in request.headers.get("accept", "")
+    if stream:
+        return await stream_search_issues(request, jql)
+    return await rest_response("jira_search_issues", {**request.query_params, "jql": jql}, lambda results: {
+        "success": True,
+        "jql": jql,
+        "total": results.get("total", 0),
+        "issues": results.get("issues", [])
+    })
+
+
+def rest_projection(request):
+    """Same ?fields=/&expand= handling as app.rest_projection"""
+    projection = executor.projection(SEARCH_FIELDS, request.query_params, rest=True)
+    return {"fields": projection["fields"], "expand": projection["expand"]}
+
+
+async def stream_search_issues(request, jql):
+    max_results = request.query_params.get("max_results")
+    try:
+        pages = aiter_pages(get_async_jira_client(), jql, max_results=int(max_results) if max_results else None,
+                            **rest_projection(request))
+        first_page = await pages.__anext__()
+    except Exception as e:
+        return rest_error(e)
+    return StreamingResponse(andjson_records(jql, first_page, pages), media_type="application/x-ndjson")
+
+
+async def get_issue(request, issue_key):
+    return await rest_response("jira_get_issue", {**request.query_params, "issue_key": issue_key},
+                               lambda issue: {"success": True, "issue": issue})
+
+
+async def get_issues_batch(request):
+    if request.method == "GET":
+        keys = request.query_params.get("keys")
+    else:
+        try:
+            keys = (await request.json() or {}).get("keys")
+        except ValueError:
+            keys = None
+    return await rest_response("jira_get_issues", {**request.query_params, "issue_keys": keys}, lambda results: {
+        "success": True, **multiget.summarize(results), "issues": results
+    })
+
+
+async def create_issue(request):
+    try:
+        data = await request.json() or {}
+    except ValueError:
+        data = {}
+    return await rest_response("jira_create_issue", {"summary": "Issue created via API", **data},
+                               lambda new_issue: {"success": True, "issue": new_issue})
+
+
+async def create_issues(request):
+    try:
+        data = await request.json() or {}
+    except ValueError:
+        data = {}
+    outcome = await executor.arun("jira_bulk_create_issues", data, surface="rest")
+    if not outcome.ok:
+        return rest_error(outcome.error)
+    summary = summarize(outcome.data)
+    return JSONResponse({"success": summary["failed"] == 0, **summary, "results": outcome.data})
+
+
+ASYNC_ROUTES = [
+    ("POST", re.compile(r"^/api/mcp$"), mcp_endpoint),
+    ("POST", re.compile(r"^/call$"), call_tool),
+    ("GET", re.compile(r"^/projects$"), get_projects),
+    ("GET", re.compile(r"^/issues$"), search_issues),
+    ("GET", re.compile(r"^/issue/(?P<issue_key>[^/]+)$"), get_issue),
+    ("GET", re.compile(r"^/issues/batch$"), get_issues_batch),
+    ("POST", re.compile(r"^/issues/batch$"), get_issues_batch),
+    ("POST", re.compile(r"^/create-issue$"), create_issue),
+    ("POST", re.compile(r"^/create-issues$"), create_issues),
+]
+
+# Metric route labels in Flask's form, e.g. /issue/<issue_key>
+ROUTE_LABELS = {
+    pattern: re.sub(r"\(\?P<(\w+)>[^)]*\)", r"<\1>", pattern.pattern.strip("^$"))
+    for _, pattern, _ in ASYNC_ROUTES
+}
+
+flask_fallback = WSGIMiddleware(flask_app)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            if local_mirror is not None:
+                local_mirror.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_jira_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def serve_async_route(scope, receive, send, pattern, handler, match):
+    """Run a native route; Flask-served routes are measured by the Flask hooks"""
+    route = ROUTE_LABELS[pattern]
+    started = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc()
+    try:
+        request = Request(scope, receive)
+        response = await handler(request, **match.groupdict())
+        await response(scope, receive, send)
+    finally:
+        metrics.HTTP_IN_FLIGHT.dec()
+    metrics.HTTP_LATENCY.labels(route, scope["method"], str(response.status_code)).observe(
+        time.perf_counter() - started)
+    content_length = request.headers.get("content-length")
+    if content_length:
+        metrics.HTTP_REQUEST_BYTES.labels(route).observe(int(content_length))
+    if not isinstance(response, StreamingResponse):
+        metrics.HTTP_RESPONSE_BYTES.labels(route).observe(len(response.body))
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    if scope["type"] == "http":
+        for method, pattern, handler in ASYNC_ROUTES:
+            match = pattern.match(scope["path"])
+            if match and scope["method"] == method:
+                await serve_async_route(scope, receive, compressing_send(scope, send), pattern, handler, match)
+                return
+
+    await flask_fallback(scope, receive, send)
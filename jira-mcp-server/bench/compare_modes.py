@@ -0,0 +1,80 @@
+"""
+Compare throughput of the sync (gthread) and async (uvicorn) serving modes.
+
+Boots gunicorn with gunicorn.conf.py once per SERVER_MODE, drives the same
+request with bench/loadgen.py and prints one JSON summary per mode.
+JIRA_URL, JIRA_USERNAME and JIRA_API_TOKEN are passed through, so point
+them at a staging Jira (or a local fake) before running:
+
+    python bench/compare_modes.py --path /issue/PROJ-1 --concurrency 64 --duration 20
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from loadgen import run_load
+
+
+def wait_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/health/live", timeout=2):
+                return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready within {timeout}s")
+
+
+def run_mode(mode, args):
+    env = dict(os.environ, SERVER_MODE=mode, PORT=str(args.port))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(base_url)
+        # Warm pools and caches so both modes are measured in steady state
+        run_load(base_url + args.path, args.method, args.body, concurrency=args.concurrency, duration=1)
+        result = run_load(base_url + args.path, args.method, args.body,
+                          concurrency=args.concurrency, duration=args.duration)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    result["mode"] = mode
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--path", default="/projects")
+    parser.add_argument("--method", default=None)
+    parser.add_argument("--body", default=None)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    args.method = args.method or ("POST" if args.body is not None else "GET")
+
+    results = [run_mode(mode.strip(), args) for mode in args.modes.split(",") if mode.strip()]
+    print(json.dumps(results, indent=2))
+    print("\nmode    rps        p50 ms    p95 ms    p99 ms    errors", file=sys.stderr)
+    for r in results:
+        lat = r["latency_ms"]
+        print(f"{r['mode']:<7} {r['rps']:<10} {lat['p50']!s:<9} {lat['p95']!s:<9} {lat['p99']!s:<9} "
+              f"{sum(r['errors'].values())}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Local stand-in for the Jira REST API, for load tests that must not touch a real Jira.
+
+Serves the endpoints this server calls (project/search, search, issue,
+issue/bulk, myself) from a deterministic synthetic data set built with
+json_bench.synthetic_issue, so responses are as large and nested as Jira
+Cloud's. Upstream behaviour is configurable:
+
+    --latency-ms / --jitter-ms   delay added to every response
+    --issues                     size of the data set (PROJ-1 .. PROJ-n)
+    --page-size                  cap on maxResults, as Jira caps search pages
+    --description-words          description length (default: 80-400 words)
+    --custom-fields              customfield_* entries per issue
+    --throttle-rate              fraction of requests answered 429
+    --retry-after                Retry-After seconds sent with those 429s
+
+    python bench/fake_jira.py --port 8900 --latency-ms 80 --throttle-rate 0.02
+
+GET /_fake/stats returns request counts by endpoint and status, which
+bench/suite.py uses to report upstream calls per scenario.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from json_bench import synthetic_issue
+
+API_ROOT = "/rest/api/2/"
+PROJECT = "PROJ"
+_KEY_IN = re.compile(r"\bkey\s+in\s*\(([^)]*)\)", re.IGNORECASE)
+_PROJECT_EQ = re.compile(r"\bproject\s*=\s*\"?([A-Za-z][A-Za-z0-9_]*)\"?", re.IGNORECASE)
+
+
+class FakeJira:
+    """Data set, upstream behaviour settings and request counters"""
+
+    def __init__(self, issues=1000, page_size=100, latency_ms=0.0, jitter_ms=0.0, description_words=None,
+                 custom_fields=25, throttle_rate=0.0, retry_after=1, seed=7):
+        self.issue_count = issues
+        self.page_size = page_size
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.description_words = description_words
+        self.custom_fields = custom_fields
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self._issues = {}
+        self._encoded = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.stats = {}
+
+    def config(self):
+        return {
+            "issues": self.issue_count, "page_size": self.page_size,
+            "latency_ms": self.latency * 1000, "jitter_ms": self.jitter * 1000,
+            "description_words": self.description_words, "custom_fields": self.custom_fields,
+            "throttle_rate": self.throttle_rate, "retry_after": self.retry_after,
+        }
+
+    def count(self, endpoint, status):
+        key = f"{endpoint} {status}"
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def delay(self):
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            throttled = self.throttle_rate > 0 and self._rng.random() < self.throttle_rate
+        time.sleep(max(self.latency + jitter, 0.0))
+        return throttled
+
+    def issue(self, number):
+        """Issue PROJ-<number>, generated once and then reused"""
+        issue = self._issues.get(number)
+        if issue is None:
+            issue = synthetic_issue(random.Random(self.seed * 1000003 + number), number, project=PROJECT,
+                                    description_words=self.description_words, custom_fields=self.custom_fields)
+            self._issues[number] = issue
+        return issue
+
+    def number(self, key):
+        project, _, number = key.strip().upper().partition("-")
+        if project != PROJECT or not number.isdigit() or not 1 <= int(number) <= self.issue_count:
+            return None
+        return int(number)
+
+    def created_key(self):
+        with self._lock:
+            self._created += 1
+            return self.issue_count + self._created
+
+    def encoded(self, cache_key, build):
+        """(status, body bytes) of a deterministic GET, built once per distinct request"""
+        response = self._encoded.get(cache_key)
+        if response is None:
+            status, body = build()
+            response = status, json.dumps(body).encode("utf-8")
+            if len(self._encoded) < 10000:
+                self._encoded[cache_key] = response
+        return response
+
+
+def project_fields(issue, fields):
+    """Keep only the requested fields, as Jira does for ?fields=a,b"""
+    if not fields or any(f in ("*all", "*navigable") for f in fields):
+        return issue
+    wanted = set(fields)
+    return {**issue, "fields": {k: v for k, v in issue["fields"].items() if k in wanted}}
+
+
+def _fields_param(query):
+    value = query.get("fields", [""])[0]
+    return [f.strip() for f in value.split(",") if f.strip()]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # client's delayed ACK adds ~40 ms to every response
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, endpoint, status, body, headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.fake.count(endpoint, status)
+
+    def route(self, method):
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+        if path == "/_fake/stats":
+            return self.send_json("stats", 200, {"config": self.fake.config(), "requests": dict(self.fake.stats)})
+        if not path.startswith(API_ROOT):
+            return self.send_json("other", 404, {"errorMessages": [f"No route for {path}"]})
+        resource = path[len(API_ROOT):].strip("/")
+        endpoint = f"{method} {resource}"
+        if resource.startswith("issue/") and resource != "issue/bulk":
+            endpoint = f"{method} issue/{{key}}"
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.fake.delay():
+            return self.send_json(endpoint, 429, {"errorMessages": ["Rate limit exceeded."]},
+                                  {"Retry-After": str(self.fake.retry_after)})
+
+        handler = getattr(self, f"{method.lower()}_{resource.split('/', 1)[0]}", None)
+        if handler is None:
+            return self.send_json(endpoint, 404, {"errorMessages": [f"No route for {method} {path}"]})
+        status, response = handler(resource, query, json.loads(body) if body else {})
+        self.send_json(endpoint, status, response)
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def get_myself(self, resource, query, body):
+        return 200, {"accountId": "bench", "displayName": "Load Test", "timeZone": "UTC", "active": True}
+
+    def get_project(self, resource, query, body):
+        projects = [{"id": "10000", "key": PROJECT, "name": "Project", "projectTypeKey": "software"}]
+        projects += [{"id": str(10000 + i), "key": f"P{i}", "name": f"Project {i}", "projectTypeKey": "software"}
+                     for i in range(1, 30)]
+        if resource == "project/search":
+            return 200, {"startAt": 0, "maxResults": 50, "total": len(projects), "isLast": True, "values": projects}
+        return 200, projects
+
+    def get_search(self, resource, query, body):
+        jql = query.get("jql", [""])[0]
+        start = int(query.get("startAt", ["0"])[0])
+        limit = min(int(query.get("maxResults", ["50"])[0]), self.fake.page_size)
+        fields = _fields_param(query)
+
+        def build():
+            keys = _KEY_IN.search(jql)
+            if keys:
+                numbers = [self.fake.number(k.strip(" '\"")) for k in keys.group(1).split(",")]
+                missing = [k for k, n in zip(keys.group(1).split(","), numbers) if n is None]
+                if missing and query.get("validateQuery", [""])[0] != "warn":
+                    return 400, {"errorMessages": [f"An issue with key '{missing[0].strip()}' does not exist."]}
+                matches = sorted((n for n in numbers if n is not None), reverse=True)
+            else:
+                project = _PROJECT_EQ.search(jql)
+                if project and project.group(1).upper() != PROJECT:
+                    matches = []
+                else:
+                    matches = range(self.fake.issue_count, 0, -1)
+            page = matches[start:start + limit]
+            return 200, {"expand": "schema,names", "startAt": start, "maxResults": limit, "total": len(matches),
+                         "issues": [project_fields(self.fake.issue(n), fields) for n in page]}
+
+        return self.fake.encoded(self.path, build)
+
+    def get_issue(self, resource, query, body):
+        number = self.fake.number(resource.rsplit("/", 1)[-1])
+        if number is None:
+            return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}
+        return self.fake.encoded(self.path, lambda: (200, project_fields(self.fake.issue(number),
+                                                                         _fields_param(query))))
+
+    def _created(self, fields):
+        if not fields.get("summary"):
+            return None, {"summary": "You must specify a summary of the issue."}
+        number = self.fake.created_key()
+        return {"id": str(10000 + number), "key": f"{PROJECT}-{number}",
+                "self": f"https://example.atlassian.net/rest/api/2/issue/{10000 + number}"}, None
+
+    def post_issue(self, resource, query, body):
+        if resource == "issue/bulk":
+            issues, errors = [], []
+            for index, update in enumerate(body.get("issueUpdates", [])):
+                created, error = self._created(update.get("fields", {}))
+                if created:
+                    issues.append(created)
+                else:
+                    errors.append({"status": 400, "elementErrors": {"errors": error}, "failedElementNumber": index})
+            return 201, {"issues": issues, "errors": errors}
+        created, error = self._created(body.get("fields", {}))
+        return (201, created) if created else (400, {"errorMessages": [], "errors": error})
+
+
+def serve(fake, host="127.0.0.1", port=8900):
+    """Start serving in a background thread; returns the server"""
+    handler = type("BoundHandler", (Handler,), {"fake": fake})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--description-words", type=int, default=None)
+    parser.add_argument("--custom-fields", type=int, default=25)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    fake = FakeJira(args.issues, args.page_size, args.latency_ms, args.jitter_ms, args.description_words,
+                    args.custom_fields, args.throttle_rate, args.retry_after)
+    server = serve(fake, args.host, args.port)
+    print(f"fake Jira on http://{args.host}:{args.port} {json.dumps(fake.config())}", file=sys.stderr, flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Minimal closed-loop HTTP load generator.
+
+Each of --concurrency threads keeps one keep-alive connection open and
+sends requests back to back for --duration seconds. Prints a JSON
+summary with requests/sec, latency percentiles and error counts.
+
+    python bench/loadgen.py http://127.0.0.1:5000/api/mcp \\
+        --body '{"id": 1, "method": "jira_get_issue", "params": {"issue_key": "PROJ-1"}}'
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _encode(body):
+    return body.encode("utf-8") if isinstance(body, str) else body
+
+
+def _worker(url, method, variants, offset, headers, deadline, latencies, errors, lock):
+    parts = urlsplit(url)
+    conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    conn = conn_class(parts.netloc, timeout=60)
+    local_latencies = []
+    local_errors = {}
+    sent = offset
+    while time.perf_counter() < deadline:
+        path, body = variants[sent % len(variants)]
+        sent += 1
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except Exception as e:
+            conn.close()
+            conn = conn_class(parts.netloc, timeout=60)
+            status = type(e).__name__
+        elapsed = time.perf_counter() - started
+        if status == 200 or status == 304:
+            local_latencies.append(elapsed)
+        else:
+            local_errors[str(status)] = local_errors.get(str(status), 0) + 1
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        for key, count in local_errors.items():
+            errors[key] = errors.get(key, 0) + count
+
+
+def run_load(url, method="GET", body=None, headers=None, concurrency=16, duration=10.0, variants=None):
+    """
+    Drive url for duration seconds and return a summary dict. `variants`,
+    a list of (path, body) pairs on url's host, makes each thread cycle
+    through several requests instead of repeating one.
+    """
+    headers = dict(headers or {})
+    parts = urlsplit(url)
+    if variants is None:
+        variants = [(parts.path + ("?" + parts.query if parts.query else ""), body)]
+    variants = [(path or "/", _encode(body)) for path, body in variants]
+    if any(body is not None for _, body in variants):
+        headers.setdefault("Content-Type", "application/json")
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(url, method, variants, i, headers, deadline, latencies, errors, lock))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "url": url,
+        "method": method,
+        "concurrency": concurrency,
+        "duration_s": round(wall, 3),
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 2) if wall else 0,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url")
+    parser.add_argument("--method", default=None, help="defaults to POST when --body is given, else GET")
+    parser.add_argument("--body", default=None)
+    parser.add_argument("--header", action="append", default=[], help="Name: value (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    headers = dict(h.split(":", 1) for h in args.header)
+    headers = {k.strip(): v.strip() for k, v in headers.items()}
+    method = args.method or ("POST" if args.body is not None else "GET")
+    print(json.dumps(run_load(args.url, method, args.body, headers, args.concurrency, args.duration), indent=2))
+
+
+if __name__ == "__main__":
+    main()
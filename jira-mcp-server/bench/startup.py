@@ -0,0 +1,178 @@
+"""
+Cold-start report: import time by module and time to the first MCP answer.
+
+Each target module (app for the sync mode, asgi for the async mode) is
+imported in a fresh interpreter, which then answers `initialize` and
+`tools/list` in-process, the way a worker does after a scale-from-zero
+boot. The report gives, as JSON followed by a table:
+
+    import_ms             importing the target module
+    initialize_ms         the first initialize request after that
+    tools_list_ms         the first tools/list request
+    cold_start_ms         import + initialize
+    heavy_modules_loaded  modules from --forbid present after those requests
+    packages / modules    `python -X importtime` self and cumulative time,
+                          by top-level package and by module
+
+Timings are medians of --repeat runs; the breakdown comes from one extra
+run under -X importtime (which slows imports down a little). The exit
+status is 1 when cold_start_ms exceeds --budget-ms, or when a --forbid
+module (the Jira client libraries, by default) was loaded, so CI can
+hold the line:
+
+    python bench/startup.py --budget-ms 400
+    python bench/startup.py --targets app --top 40
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+DEFAULT_FORBID = "atlassian,requests,urllib3,httpx,bs4"
+
+# Runs in the fresh interpreter: argv[1] is the target, argv[2] the forbidden modules
+PROBE = r'''
+import asyncio, json, sys, time
+
+INITIALIZE = b'{"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}'
+TOOLS_LIST = b'{"jsonrpc": "2.0", "id": 2, "method": "tools/list"}'
+
+def flask_post(module, body):
+    response = module.app.test_client().post("/api/mcp", data=body, content_type="application/json")
+    return response.status_code
+
+def asgi_post(module, body):
+    scope = {"type": "http", "method": "POST", "path": "/api/mcp", "raw_path": b"/api/mcp", "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+             "http_version": "1.1", "scheme": "http", "root_path": "",
+             "server": ("127.0.0.1", 5000), "client": ("127.0.0.1", 40000)}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(module.app(scope, receive, send))
+    return sent[0]["status"]
+
+target, forbid = sys.argv[1], sys.argv[2].split(",")
+started = time.perf_counter()
+module = __import__(target)
+imported = time.perf_counter()
+post = asgi_post if target == "asgi" else flask_post
+statuses = [post(module, INITIALIZE)]
+initialized = time.perf_counter()
+statuses.append(post(module, TOOLS_LIST))
+listed = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "initialize_ms": (initialized - imported) * 1000,
+    "tools_list_ms": (listed - initialized) * 1000,
+    "statuses": statuses,
+    "heavy_modules_loaded": [name for name in forbid if name in sys.modules],
+}))
+'''
+
+
+def probe(target, forbid, importtime=False):
+    """(timings dict, -X importtime stderr) from one fresh interpreter"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE, target, forbid]
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    done = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if done.returncode != 0:
+        raise RuntimeError(f"importing {target} failed:\n{done.stderr[-2000:]}")
+    return json.loads(done.stdout.strip().splitlines()[-1]), done.stderr
+
+
+def parse_importtime(stderr):
+    """[(module, depth, self_us, cumulative_us)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def breakdown(rows, top):
+    packages = {}
+    for name, _, self_us, _ in rows:
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + self_us
+    ms = lambda us: round(us / 1000, 2)
+    return {
+        "packages": [{"package": name, "self_ms": ms(us)}
+                     for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]],
+        "modules": [{"module": name, "depth": depth, "self_ms": ms(self_us), "cumulative_ms": ms(cumulative_us)}
+                    for name, depth, self_us, cumulative_us in sorted(rows, key=lambda row: -row[3])[:top]],
+    }
+
+
+def report_target(target, args):
+    runs = [probe(target, args.forbid)[0] for _ in range(args.repeat)]
+    _, stderr = probe(target, args.forbid, importtime=True)
+    median = lambda key: round(statistics.median(run[key] for run in runs), 2)
+    result = {
+        "target": target,
+        "import_ms": median("import_ms"),
+        "initialize_ms": median("initialize_ms"),
+        "tools_list_ms": median("tools_list_ms"),
+        "cold_start_ms": round(statistics.median(run["import_ms"] + run["initialize_ms"] for run in runs), 2),
+        "statuses": runs[0]["statuses"],
+        "heavy_modules_loaded": sorted({name for run in runs for name in run["heavy_modules_loaded"]}),
+    }
+    result.update(breakdown(parse_importtime(stderr), args.top))
+    return result
+
+
+def problems(result, budget_ms):
+    found = []
+    if budget_ms is not None and result["cold_start_ms"] > budget_ms:
+        found.append(f"{result['target']}: cold start {result['cold_start_ms']} ms exceeds budget of {budget_ms} ms")
+    if result["heavy_modules_loaded"]:
+        found.append(f"{result['target']}: loaded {', '.join(result['heavy_modules_loaded'])} before the first tool call")
+    if any(status != 200 for status in result["statuses"]):
+        found.append(f"{result['target']}: initialize/tools/list answered {result['statuses']}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", default="app,asgi", help="modules to import: app (sync), asgi (async)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail when import + initialize takes longer")
+    parser.add_argument("--forbid", default=DEFAULT_FORBID,
+                        help="comma-separated modules that must not be loaded before the first tool call")
+    parser.add_argument("--top", type=int, default=20, help="rows in the package and module breakdowns")
+    args = parser.parse_args()
+
+    results = [report_target(target.strip(), args) for target in args.targets.split(",") if target.strip()]
+    failures = [problem for result in results for problem in problems(result, args.budget_ms)]
+    print(json.dumps({"budget_ms": args.budget_ms, "forbid": args.forbid.split(","), "results": results,
+                      "failures": failures}, indent=2))
+
+    for r in results:
+        print(f"\n{r['target']}: import {r['import_ms']} ms + initialize {r['initialize_ms']} ms "
+              f"= {r['cold_start_ms']} ms cold start; tools/list {r['tools_list_ms']} ms", file=sys.stderr)
+        print(f"  {'package':<28} {'self ms':>9}", file=sys.stderr)
+        for p in r["packages"][:10]:
+            print(f"  {p['package']:<28} {p['self_ms']:>9}", file=sys.stderr)
+    if failures:
+        print("", file=sys.stderr)
+        for failure in failures:
+            print("FAIL " + failure, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
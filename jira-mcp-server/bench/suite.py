@@ -0,0 +1,302 @@
+"""
+End-to-end load test of the whole server against a local fake Jira.
+
+Starts bench/fake_jira.py, boots gunicorn with gunicorn.conf.py for each
+SERVER_MODE and drives every scenario at each --concurrency level:
+
+    mcp initialize, mcp tools/list   JSON-RPC on /api/mcp
+    mcp <tool>                       every tool advertised by tools/list
+    call <tool>                      the legacy /call endpoint
+    rest <route>                     /projects, /issues, /issue/<key>, ...
+
+Requests that take an issue key cycle through PROJ-1..PROJ-<--key-space>,
+so the issue cache sees a realistic mix of hits and misses. For each run
+the report has requests/sec, p50/p95/p99 latency, errors, upstream Jira
+calls per request and the resident memory of every gunicorn worker.
+
+The report is JSON (stdout, or --output) stamped with the git revision,
+so results can be kept and compared across releases; a table goes to
+stderr. Fake Jira options are passed through:
+
+    python bench/suite.py --modes sync,async --concurrency 1,16,64 --duration 10 \\
+        --latency-ms 80 --throttle-rate 0.01 --output bench-$(git describe --always).json
+    python bench/suite.py --only "mcp jira_get_issue,rest /issue" --duration 5
+
+The server runs with JIRA_RATE_LIMIT=0 so the outbound rate limiter does
+not cap throughput; override that or anything else with --env NAME=VALUE.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from compare_modes import wait_ready
+from loadgen import run_load
+
+PROJECT = "PROJ"
+SERVER_ENV_DEFAULTS = {"JIRA_RATE_LIMIT": "0", "LOG_LEVEL": "WARNING"}
+
+
+def _keys(start, count, key_space):
+    return [f"{PROJECT}-{(start + i) % key_space + 1}" for i in range(count)]
+
+
+def tool_arguments(tool, n, key_space):
+    """Arguments for the n-th call of `tool`, or None for tools the suite does not know"""
+    key = _keys(n, 1, key_space)[0]
+    return {
+        "jira_list_projects": {},
+        "jira_search_issues": {"jql": f"project = {PROJECT} ORDER BY created DESC", "max_results": 50},
+        "jira_get_issue": {"issue_key": key},
+        "jira_get_issues": {"issue_keys": _keys(n * 10, 10, key_space)},
+        "jira_create_issue": {"project_key": PROJECT, "summary": f"Load test issue {n}", "issue_type": "Task"},
+        "jira_bulk_create_issues": {"project_key": PROJECT,
+                                    "issues": [{"summary": f"Load test issue {n}.{i}"} for i in range(10)]},
+        "jira_local_search": {"text": "login crash", "max_results": 20},
+    }.get(tool)
+
+
+def mcp_body(method, params, request_id=1):
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+
+def scenarios(tools, key_space):
+    """(name, method, [(path, body), ...]) for every request the suite drives"""
+    variants = range(key_space)
+    yield "mcp initialize", "POST", [("/api/mcp", mcp_body("initialize", {}))]
+    yield "mcp tools/list", "POST", [("/api/mcp", mcp_body("tools/list", {}))]
+    for tool in tools:
+        if tool_arguments(tool, 0, key_space) is not None:
+            yield f"mcp {tool}", "POST", [("/api/mcp", mcp_body(tool, tool_arguments(tool, n, key_space)))
+                                          for n in variants]
+    # /call runs the same executor as /api/mcp; two tools are enough to compare their overhead
+    for tool in ("jira_list_projects", "jira_search_issues"):
+        yield f"call {tool}", "POST", [("/call", json.dumps({"name": tool, "arguments": tool_arguments(tool, n, key_space)}))
+                                       for n in variants]
+    yield "rest /projects", "GET", [("/projects", None)]
+    yield "rest /issues", "GET", [(f"/issues?jql=project%20%3D%20{PROJECT}&max_results=50", None)]
+    yield "rest /issue/<key>", "GET", [(f"/issue/{key}", None) for key in _keys(0, key_space, key_space)]
+    yield "rest /issues/batch", "GET", [(f"/issues/batch?keys={','.join(_keys(n * 10, 10, key_space))}", None)
+                                        for n in variants]
+    yield "rest /create-issue", "POST", [("/create-issue", json.dumps(tool_arguments("jira_create_issue", n, key_space)))
+                                         for n in variants]
+    yield "rest /create-issues", "POST", [("/create-issues", json.dumps(tool_arguments("jira_bulk_create_issues", n, key_space)))
+                                          for n in variants]
+
+
+def request(base_url, method, path, body=None):
+    """One request; returns (status, parsed JSON body or None)"""
+    req = urllib.request.Request(base_url + path, data=body.encode("utf-8") if body else None, method=method,
+                                 headers={"Content-Type": "application/json"} if body else {})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    try:
+        return status, json.loads(payload)
+    except ValueError:
+        return status, None
+
+
+def check(base_url, method, path, body):
+    """None when a single request succeeds, else a short description of what went wrong"""
+    status, payload = request(base_url, method, path, body)
+    if status != 200:
+        return f"HTTP {status}: {json.dumps(payload)[:200]}"
+    if isinstance(payload, dict):
+        result = payload.get("result") if isinstance(payload.get("result"), dict) else {}
+        if "error" in payload or result.get("isError") or payload.get("success") is False:
+            return json.dumps(payload)[:200]
+    return None
+
+
+def worker_memory(master_pid):
+    """Resident and peak memory (KiB) of the gunicorn master's children, from /proc"""
+    workers = []
+    if not os.path.isdir("/proc"):
+        return workers
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        if status.get("PPid", "").strip() != str(master_pid):
+            continue
+        kib = lambda name: int(status[name].split()[0]) if name in status else None
+        workers.append({"pid": int(entry), "rss_kib": kib("VmRSS"), "peak_rss_kib": kib("VmHWM")})
+    return sorted(workers, key=lambda w: w["pid"])
+
+
+def upstream_calls(fake_url):
+    _, stats = request(fake_url, "GET", "/_fake/stats")
+    requests = stats["requests"]
+    return sum(requests.values()), sum(count for key, count in requests.items() if key.endswith(" 429"))
+
+
+def run_mode(mode, args, fake_url):
+    env = dict(os.environ, **SERVER_ENV_DEFAULTS)
+    env.update(SERVER_MODE=mode, PORT=str(args.port), JIRA_URL=fake_url,
+               JIRA_USERNAME="bench@example.com", JIRA_API_TOKEN="bench")
+    if args.workers:
+        env["WEB_CONCURRENCY"] = str(args.workers)
+    env.update(dict(item.split("=", 1) for item in args.env))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    run = {"mode": mode, "scenarios": [], "skipped": {}}
+    try:
+        wait_ready(base_url, timeout=60)
+        run["workers_idle"] = worker_memory(server.pid)
+        _, listed = request(base_url, "POST", "/api/mcp", mcp_body("tools/list", {}))
+        tools = [tool["name"] for tool in listed["result"]["tools"]]
+        run["skipped"].update({f"mcp {tool}": "no arguments defined for this tool"
+                               for tool in tools if tool_arguments(tool, 0, args.key_space) is None})
+
+        for name, method, variants in scenarios(tools, args.key_space):
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            problem = check(base_url, method, *variants[0])
+            if problem:
+                run["skipped"][name] = problem
+                print(f"[{mode}] skipping {name}: {problem}", file=sys.stderr)
+                continue
+            for concurrency in args.concurrency:
+                run_load(base_url, method, concurrency=concurrency, duration=args.warmup, variants=variants)
+                calls_before, throttled_before = upstream_calls(fake_url)
+                result = run_load(base_url, method, concurrency=concurrency, duration=args.duration,
+                                  variants=variants)
+                calls_after, throttled_after = upstream_calls(fake_url)
+                result.pop("url")
+                served = result["requests"] + sum(result["errors"].values())
+                result.update(
+                    scenario=name, path=variants[0][0].split("?", 1)[0],
+                    upstream_calls_per_request=round((calls_after - calls_before) / served, 3) if served else None,
+                    upstream_throttled=throttled_after - throttled_before,
+                    worker_rss_kib=sum(w["rss_kib"] or 0 for w in worker_memory(server.pid)),
+                )
+                run["scenarios"].append(result)
+                print(f"[{mode}] {name} c={concurrency}: {result['rps']} rps, "
+                      f"p99 {result['latency_ms']['p99']} ms", file=sys.stderr)
+        run["workers"] = worker_memory(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return run
+
+
+def start_fake_jira(args):
+    command = [sys.executable, os.path.join(HERE, "fake_jira.py"), "--port", str(args.fake_port),
+               "--issues", str(args.issues), "--page-size", str(args.page_size),
+               "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+               "--custom-fields", str(args.custom_fields), "--throttle-rate", str(args.throttle_rate),
+               "--retry-after", str(args.retry_after)]
+    if args.description_words is not None:
+        command += ["--description-words", str(args.description_words)]
+    process = subprocess.Popen(command, cwd=HERE, stderr=subprocess.DEVNULL)
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            request(fake_url, "GET", "/_fake/stats")
+            return process, fake_url
+        except OSError:
+            if time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"fake Jira did not start on {fake_url}")
+            time.sleep(0.1)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(report):
+    print(f"\n{'mode':<6} {'scenario':<30} {'conc':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>7} {'up/req':>7} {'rss MiB':>8}", file=sys.stderr)
+    for run in report["runs"]:
+        for r in run["scenarios"]:
+            lat = r["latency_ms"]
+            print(f"{run['mode']:<6} {r['scenario']:<30} {r['concurrency']:>5} {r['rps']:>9} {lat['p50']!s:>9} "
+                  f"{lat['p95']!s:>9} {lat['p99']!s:>9} {sum(r['errors'].values()):>7} "
+                  f"{r['upstream_calls_per_request']!s:>7} {r['worker_rss_kib'] / 1024:>8.1f}", file=sys.stderr)
+        for name, reason in run["skipped"].items():
+            print(f"{run['mode']:<6} {name:<30} skipped: {reason}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--concurrency", default="16", help="comma-separated levels, e.g. 1,16,64")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per scenario and level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each measurement")
+    parser.add_argument("--only", default="", help="comma-separated scenario name substrings to run")
+    parser.add_argument("--key-space", type=int, default=200, help="distinct issue keys requests cycle through")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--workers", type=int, default=None, help="WEB_CONCURRENCY for the server")
+    parser.add_argument("--env", action="append", default=[], help="NAME=VALUE for the server (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="show the server's log output")
+    fake = parser.add_argument_group("fake Jira")
+    fake.add_argument("--fake-port", type=int, default=8900)
+    fake.add_argument("--issues", type=int, default=1000)
+    fake.add_argument("--page-size", type=int, default=100)
+    fake.add_argument("--latency-ms", type=float, default=50.0)
+    fake.add_argument("--jitter-ms", type=float, default=10.0)
+    fake.add_argument("--description-words", type=int, default=None)
+    fake.add_argument("--custom-fields", type=int, default=25)
+    fake.add_argument("--throttle-rate", type=float, default=0.0)
+    fake.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    args.only = [pattern.strip() for pattern in args.only.split(",") if pattern.strip()]
+
+    fake_process, fake_url = start_fake_jira(args)
+    try:
+        _, stats = request(fake_url, "GET", "/_fake/stats")
+        report = {
+            "suite": "jira-mcp-server end-to-end",
+            "revision": git_revision(),
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            "settings": {"duration_s": args.duration, "warmup_s": args.warmup, "concurrency": args.concurrency,
+                         "key_space": args.key_space, "workers": args.workers,
+                         "env": dict(SERVER_ENV_DEFAULTS, **dict(item.split("=", 1) for item in args.env))},
+            "fake_jira": stats["config"],
+            "runs": [run_mode(mode.strip(), args, fake_url) for mode in args.modes.split(",") if mode.strip()],
+        }
+    finally:
+        fake_process.terminate()
+        fake_process.wait(timeout=10)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    print_table(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Bulk issue creation through Jira's POST /issue/bulk.
+
+Issue specs are validated locally, split into chunks of
+JIRA_BULK_CREATE_CHUNK (Jira's limit is 50 per call) and sent a few
+chunks at a time. Jira creates what it can in each chunk and reports the
+rest by position (failedElementNumber), so every input item gets its own
+result, in input order:
+
+    {"index": 0, "success": True, "key": "PROJ-7", "id": "10071"}
+    {"index": 1, "success": False, "error": "summary: Field is required"}
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import JIRA_BULK_CREATE_CHUNK, JIRA_BULK_CREATE_CONCURRENCY, JIRA_BULK_CREATE_MAX_ITEMS
+
+
+class InvalidBulkRequest(ValueError):
+    pass
+
+
+def issue_fields(spec, default_project_key=None):
+    """Jira `fields` for one issue spec; same keys as jira_create_issue"""
+    fields = {
+        "summary": spec.get("summary"),
+        "description": spec.get("description", ""),
+        "issuetype": {"name": spec.get("issue_type", "Task")},
+        "project": {"key": spec.get("project_key") or default_project_key},
+    }
+    if spec.get("assignee"):
+        fields["assignee"] = {"name": spec["assignee"]}
+    if spec.get("priority"):
+        fields["priority"] = {"name": spec["priority"]}
+    return fields
+
+
+def prepare(specs, default_project_key=None):
+    """
+    Validate specs and return (results, pending).
+
+    results has one slot per spec, already filled for invalid ones;
+    pending is a list of (index, issueUpdate) to send to Jira.
+    """
+    if not isinstance(specs, list) or not specs:
+        raise InvalidBulkRequest("issues must be a non-empty array")
+    if len(specs) > JIRA_BULK_CREATE_MAX_ITEMS:
+        raise InvalidBulkRequest(f"{len(specs)} issues exceeds limit of {JIRA_BULK_CREATE_MAX_ITEMS}")
+
+    results = [None] * len(specs)
+    pending = []
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            results[index] = {"index": index, "success": False, "error": "issue spec must be an object"}
+        elif not spec.get("summary") or not (spec.get("project_key") or default_project_key):
+            results[index] = {"index": index, "success": False, "error": "project_key and summary are required"}
+        else:
+            pending.append((index, {"fields": issue_fields(spec, default_project_key)}))
+    return results, pending
+
+
+def chunked(pending):
+    size = max(1, min(JIRA_BULK_CREATE_CHUNK, 50))
+    return [pending[i:i + size] for i in range(0, len(pending), size)]
+
+
+def _element_error(error):
+    element = error.get("elementErrors") or {}
+    messages = list(element.get("errorMessages") or [])
+    messages.extend(f"{field}: {message}" for field, message in (element.get("errors") or {}).items())
+    return "; ".join(messages) or f"Jira returned status {error.get('status', 'unknown')}"
+
+
+def apply_chunk(results, chunk, body=None, error=None):
+    """
+    Record Jira's answer for one chunk.
+
+    Jira lists created issues in request order, skipping failed elements;
+    failures carry their position in the chunk. If the whole call failed,
+    `error` is reported for every item in it.
+    """
+    if error is not None or not isinstance(body, dict):
+        message = str(error) if error is not None else "Unexpected response from Jira bulk create"
+        for index, _ in chunk:
+            results[index] = {"index": index, "success": False, "error": message}
+        return
+
+    failed = {}
+    for item_error in body.get("errors") or []:
+        position = item_error.get("failedElementNumber")
+        if isinstance(position, int) and 0 <= position < len(chunk):
+            failed[position] = _element_error(item_error)
+
+    created = iter(body.get("issues") or [])
+    for position, (index, _) in enumerate(chunk):
+        if position in failed:
+            results[index] = {"index": index, "success": False, "error": failed[position]}
+            continue
+        issue = next(created, None)
+        if issue is None:
+            results[index] = {"index": index, "success": False, "error": "Not reported by Jira bulk create"}
+        else:
+            results[index] = {"index": index, "success": True, "key": issue.get("key"), "id": issue.get("id")}
+
+
+def summarize(results):
+    created = sum(1 for r in results if r["success"])
+    return {"requested": len(results), "created": created, "failed": len(results) - created}
+
+
+def _post_chunk(jira, chunk):
+    from requests import HTTPError  # already loaded by the sync client
+
+    # advanced_mode: a 400 with partial success is an answer, not an exception
+    response = jira.post(jira.resource_url("issue/bulk"), data={"issueUpdates": [update for _, update in chunk]},
+                         advanced_mode=True)
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if response.status_code >= 400 and not (isinstance(body, dict) and body.get("errors")):
+        messages = (body or {}).get("errorMessages") if isinstance(body, dict) else None
+        raise HTTPError("; ".join(messages or []) or f"{response.status_code} {response.reason}", response=response)
+    return body
+
+
+def bulk_create_issues(jira, specs, default_project_key=None, progress=None):
+    """
+    Create issues with the sync client; returns per-item results in input order.
+
+    progress(done, total), when given, is called as each chunk completes,
+    with counts of the valid specs sent to Jira.
+    """
+    results, pending = prepare(specs, default_project_key)
+    chunks = chunked(pending)
+    done = 0
+    lock = threading.Lock()
+
+    def run(chunk):
+        nonlocal done
+        try:
+            apply_chunk(results, chunk, body=_post_chunk(jira, chunk))
+        except Exception as e:
+            apply_chunk(results, chunk, error=e)
+        if progress is not None:
+            with lock:
+                done += len(chunk)
+                progress(done, len(pending))
+
+    if len(chunks) == 1:
+        run(chunks[0])
+    elif chunks:
+        with ThreadPoolExecutor(max_workers=min(JIRA_BULK_CREATE_CONCURRENCY, len(chunks)),
+                                thread_name_prefix="bulk-create") as executor:
+            list(executor.map(run, chunks))
+    return results
+
+
+async def abulk_create_issues(jira, specs, default_project_key=None, progress=None):
+    """Async counterpart of bulk_create_issues for async_jira.AsyncJira"""
+    results, pending = prepare(specs, default_project_key)
+    slots = asyncio.Semaphore(JIRA_BULK_CREATE_CONCURRENCY)
+    done = 0
+
+    async def run(chunk):
+        nonlocal done
+        async with slots:
+            try:
+                body = await jira.issue_bulk_create([update for _, update in chunk])
+                apply_chunk(results, chunk, body=body)
+            except Exception as e:
+                apply_chunk(results, chunk, error=e)
+        if progress is not None:
+            done += len(chunk)
+            progress(done, len(pending))
+
+    await asyncio.gather(*[run(chunk) for chunk in chunked(pending)])
+    return results
@@ -0,0 +1,483 @@
+"""
+Tool execution shared by every route.
+
+/api/mcp (both serving modes), /call and the REST routes all run tools
+through here, so argument handling, timing, error mapping and anything
+wrapped around the Jira calls (caches, coalescing, the mirror) behave the
+same whichever way a tool is reached.
+
+Each tool is a Tool in TOOLS_BY_NAME, keyed by its name and its aliases.
+A call runs three steps:
+
+    prepare(arguments, rest)   validate and normalise; raises InvalidParams
+    fetch(args, progress)      read or write through Jira, a cache or the mirror;
+                               afetch is the async twin, and progress is only
+                               called by tools with reports_progress
+    render(data, args)         MCP text, or (text, structuredContent)
+
+run() and arun() time the call, report it to every timing hook and return
+an Outcome; failures are classified once (classify) and turned into a
+JSON-RPC error (rpc_response), a /call body (call_response) or a REST
+error (rest_error). REST callers skip rendering and use outcome.data, the
+raw Jira JSON.
+"""
+import asyncio
+import logging
+import math
+import time
+
+from config import (
+    PROJECTS_CACHE_TTL, PROJECTS_CACHE_REFRESH_AHEAD, PROJECTS_CACHE_STALE_GRACE,
+    ISSUE_CACHE_MAX_ENTRIES, ISSUE_CACHE_MAX_BYTES, ISSUE_CACHE_REVALIDATE_AFTER,
+    MIRROR_ENABLED, MIRROR_DB_PATH,
+)
+from jira_client import get_jira_client
+from async_jira import get_async_jira_client
+from ratelimit import retry_after_of, upstream_status
+from renderers import SEARCH_FIELDS, ISSUE_FIELDS, extra_fields, split_fields
+from renderers import render_projects, render_search, render_issue, render_created
+from renderers import render_bulk_created, render_issues, render_local_search
+from bulk import bulk_create_issues, abulk_create_issues, summarize, InvalidBulkRequest
+from tools import TOOLS, TOOL_ALIASES
+import multiget
+import cache
+import mirror
+import metrics
+
+logger = logging.getLogger("jira_mcp.executor")
+
+DEFAULT_JQL = "project IS NOT EMPTY ORDER BY created DESC"
+
+# JSON-RPC server error code for "Jira is throttling us, retry later"
+RATE_LIMITED_CODE = -32029
+
+# Project list changes rarely, so it is served from a refresh-ahead cache
+projects_cache = cache.register(cache.RefreshingCache(
+    "projects",
+    lambda: get_jira_client().projects(),
+    ttl=PROJECTS_CACHE_TTL,
+    refresh_ahead=PROJECTS_CACHE_REFRESH_AHEAD,
+    stale_grace=PROJECTS_CACHE_STALE_GRACE
+))
+
+
+async def _aissue_updated(key):
+    issue = await get_async_jira_client().issue(key, fields="updated")
+    return issue.get("fields", {}).get("updated")
+
+
+# Agents re-read the same issues; serve them from cache while `updated` is unchanged
+issue_cache = cache.register(cache.IssueCache(
+    "issues",
+    fetch=lambda key, fields, expand: get_jira_client().issue(key, fields=fields, expand=expand),
+    fetch_updated=lambda key: get_jira_client().issue(key, fields="updated").get("fields", {}).get("updated"),
+    max_entries=ISSUE_CACHE_MAX_ENTRIES,
+    max_bytes=ISSUE_CACHE_MAX_BYTES,
+    revalidate_after=ISSUE_CACHE_REVALIDATE_AFTER,
+    # Only a deleted or hidden issue drops its entry; throttling and outages keep it
+    gone=lambda e: upstream_status(e) in (403, 404),
+    afetch=lambda key, fields, expand: get_async_jira_client().issue(key, fields=fields, expand=expand),
+    afetch_updated=_aissue_updated
+))
+
+# Optional SQLite mirror for jira_local_search; its sync thread starts in each
+# worker on first use (after gunicorn forks), and one worker leads the syncing
+local_mirror = mirror.IssueMirror(MIRROR_DB_PATH, get_jira_client) if MIRROR_ENABLED else None
+
+
+class InvalidParams(ValueError):
+    pass
+
+
+class UnknownTool(LookupError):
+    def __init__(self, name):
+        super().__init__(f"Method not found: {name}. Available: {', '.join(tool['name'] for tool in TOOLS)}")
+        self.name = name
+
+
+def integer_argument(arguments, name, default):
+    value = arguments.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise InvalidParams(f"{name} must be an integer")
+
+
+def projection(base_fields, arguments, rest):
+    """
+    fields/expand/extras for a read.
+
+    Tools fetch what their renderer shows plus any requested extras; the
+    REST routes return raw Jira JSON and keep Jira's default of all fields
+    unless fields=a,b is given.
+    """
+    if rest:
+        return {"fields": ",".join(split_fields(arguments.get("fields"))) or "*all",
+                "expand": arguments.get("expand") or None, "extras": []}
+    extras = extra_fields(base_fields, arguments.get("fields"))
+    return {"fields": base_fields + extras, "expand": arguments.get("expand"), "extras": extras}
+
+
+def counted(progress, message):
+    """progress(done, total) for chunked helpers, reporting through a tool's progress callback"""
+    if progress is None:
+        return None
+    return lambda done, total: progress(done, total, message.format(done=done, total=total))
+
+
+class Tool:
+    """One tool: argument handling, sync and async Jira access, rendering"""
+    name = None
+    # Calls progress(done, total, message) while it runs, for Streamable HTTP progress
+    reports_progress = False
+
+    def prepare(self, arguments, rest=False):
+        return arguments
+
+    def fetch(self, args, progress=None):
+        raise NotImplementedError
+
+    async def afetch(self, args, progress=None):
+        # No native async implementation: keep the event loop free
+        return await asyncio.to_thread(self.fetch, args, progress)
+
+    def render(self, data, args):
+        raise NotImplementedError
+
+
+class ListProjects(Tool):
+    name = "jira_list_projects"
+
+    def fetch(self, args, progress=None):
+        return projects_cache.get()
+
+    def render(self, data, args):
+        return render_projects(data)
+
+
+class SearchIssues(Tool):
+    name = "jira_search_issues"
+
+    def prepare(self, arguments, rest=False):
+        return {"jql": arguments.get("jql", DEFAULT_JQL),
+                "limit": integer_argument(arguments, "max_results", 50),
+                **projection(SEARCH_FIELDS, arguments, rest)}
+
+    def fetch(self, args, progress=None):
+        return get_jira_client().jql(args["jql"], limit=args["limit"], fields=args["fields"], expand=args["expand"])
+
+    async def afetch(self, args, progress=None):
+        return await get_async_jira_client().jql(args["jql"], limit=args["limit"], fields=args["fields"],
+                                                 expand=args["expand"])
+
+    def render(self, data, args):
+        return render_search(args["jql"], data.get("issues", []), args["extras"])
+
+
+class GetIssue(Tool):
+    name = "jira_get_issue"
+
+    def prepare(self, arguments, rest=False):
+        if not arguments.get("issue_key"):
+            raise InvalidParams("issue_key is required")
+        args = {"key": arguments["issue_key"], **projection(ISSUE_FIELDS, arguments, rest)}
+        if not rest:
+            args["fields"] = ",".join(args["fields"])
+        return args
+
+    def fetch(self, args, progress=None):
+        return issue_cache.get(args["key"], fields=args["fields"], expand=args["expand"])
+
+    async def afetch(self, args, progress=None):
+        return await issue_cache.aget(args["key"], fields=args["fields"], expand=args["expand"])
+
+    def render(self, data, args):
+        return render_issue(args["key"], data, args["extras"])
+
+
+class GetIssues(Tool):
+    name = "jira_get_issues"
+    reports_progress = True
+
+    def prepare(self, arguments, rest=False):
+        return {"keys": arguments.get("issue_keys"), **projection(ISSUE_FIELDS, arguments, rest)}
+
+    def fetch(self, args, progress=None):
+        return multiget.get_issues(get_jira_client(), args["keys"], fields=args["fields"], expand=args["expand"],
+                                   progress=counted(progress, "Fetched {done} of {total} issues"))
+
+    async def afetch(self, args, progress=None):
+        return await multiget.aget_issues(get_async_jira_client(), args["keys"], fields=args["fields"],
+                                          expand=args["expand"],
+                                          progress=counted(progress, "Fetched {done} of {total} issues"))
+
+    def render(self, data, args):
+        return render_issues(data, args["extras"])
+
+
+class CreateIssue(Tool):
+    name = "jira_create_issue"
+
+    def prepare(self, arguments, rest=False):
+        project_key = arguments.get("project_key")
+        summary = arguments.get("summary")
+        if not project_key or not summary:
+            raise InvalidParams("project_key and summary are required")
+        fields = {
+            "summary": summary,
+            "description": arguments.get("description", ""),
+            "issuetype": {"name": arguments.get("issue_type", "Task")},
+            "project": {"key": project_key}
+        }
+        if arguments.get("assignee"):
+            fields["assignee"] = {"name": arguments["assignee"]}
+        if arguments.get("priority"):
+            fields["priority"] = {"name": arguments["priority"]}
+        return {"fields": fields}
+
+    def fetch(self, args, progress=None):
+        return get_jira_client().issue_create(fields=args["fields"])
+
+    async def afetch(self, args, progress=None):
+        return await get_async_jira_client().issue_create(fields=args["fields"])
+
+    def render(self, data, args):
+        return render_created(data, args["fields"]["summary"], args["fields"]["project"]["key"])
+
+
+class BulkCreateIssues(Tool):
+    name = "jira_bulk_create_issues"
+    reports_progress = True
+
+    def prepare(self, arguments, rest=False):
+        return {"issues": arguments.get("issues"), "project_key": arguments.get("project_key")}
+
+    def fetch(self, args, progress=None):
+        return bulk_create_issues(get_jira_client(), args["issues"], args["project_key"],
+                                  progress=counted(progress, "Sent {done} of {total} issues to Jira"))
+
+    async def afetch(self, args, progress=None):
+        return await abulk_create_issues(get_async_jira_client(), args["issues"], args["project_key"],
+                                         progress=counted(progress, "Sent {done} of {total} issues to Jira"))
+
+    def render(self, data, args):
+        return render_bulk_created(data), {**summarize(data), "results": data}
+
+
+class LocalSearch(Tool):
+    name = "jira_local_search"
+
+    def prepare(self, arguments, rest=False):
+        return {
+            "text": arguments.get("text"),
+            "project": arguments.get("project"),
+            "status": arguments.get("status"),
+            "assignee": arguments.get("assignee"),
+            "issue_type": arguments.get("issue_type"),
+            "limit": integer_argument(arguments, "max_results", 50),
+        }
+
+    def fetch(self, args, progress=None):
+        # (issues, mirror status)
+        return local_mirror.search(**args)
+
+    def render(self, data, args):
+        return render_local_search(*data)
+
+
+def _table(tools):
+    table = {}
+    for tool in tools:
+        table[tool.name] = tool
+        table.update({alias: tool for alias, name in TOOL_ALIASES.items() if name == tool.name})
+    return table
+
+
+TOOLS_BY_NAME = _table([ListProjects(), SearchIssues(), GetIssue(), GetIssues(), CreateIssue(), BulkCreateIssues()]
+                       + ([LocalSearch()] if local_mirror is not None else []))
+
+
+def classify(e):
+    """
+    (kind, retry_after) for an exception raised while running a tool.
+
+    kind is one of unknown, invalid_params, unavailable, rate_limited or
+    exception; each surface maps these to its own error shape.
+    """
+    if isinstance(e, UnknownTool):
+        return "unknown", None
+    if isinstance(e, (InvalidParams, multiget.InvalidKeysRequest, InvalidBulkRequest)):
+        return "invalid_params", None
+    if isinstance(e, mirror.MirrorNotReady):
+        return "unavailable", None
+    retry_after = retry_after_of(e)
+    if retry_after is not None:
+        return "rate_limited", math.ceil(retry_after)
+    return "exception", None
+
+
+# Metric outcome for each kind; failures the caller caused count as "error"
+OUTCOMES = {
+    "ok": "ok",
+    "unknown": "error",
+    "invalid_params": "error",
+    "unavailable": "error",
+    "rate_limited": "rate_limited",
+    "exception": "exception",
+}
+
+
+class Outcome:
+    """Result of one tool call: data (and rendered content), or the error"""
+    __slots__ = ("name", "tool", "args", "data", "text", "structured", "error", "kind", "retry_after", "seconds")
+
+    def __init__(self, name, tool=None):
+        self.name = name
+        self.tool = tool
+        self.args = self.data = self.text = self.structured = self.error = self.retry_after = None
+        self.kind = "ok"
+        self.seconds = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def content(self):
+        """MCP tool result: text content plus structuredContent when the tool has it"""
+        result = {"content": [{"type": "text", "text": self.text}]}
+        if self.structured is not None:
+            result["structuredContent"] = self.structured
+        return result
+
+    def fail(self, e):
+        self.error = e
+        self.kind, self.retry_after = classify(e)
+        if self.kind == "exception":
+            logger.error("Tool %s failed: %s", self.name, e)
+
+
+def observe(name, surface, outcome, seconds):
+    metrics.observe_tool(name, OUTCOMES[outcome.kind], seconds)
+
+
+# Called as hook(name, surface, outcome, seconds) after every call; surface
+# is "mcp", "call" or "rest"
+timing_hooks = [observe]
+
+
+def add_timing_hook(hook):
+    timing_hooks.append(hook)
+
+
+def _prepare(outcome, arguments, surface):
+    if outcome.tool is None:
+        raise UnknownTool(outcome.name)
+    if not isinstance(arguments, dict):
+        raise InvalidParams("arguments must be an object")
+    outcome.args = outcome.tool.prepare(arguments, rest=surface == "rest")
+
+
+def _finish(outcome, surface, started):
+    outcome.seconds = time.perf_counter() - started
+    for hook in timing_hooks:
+        hook(outcome.tool.name if outcome.tool else outcome.name, surface, outcome, outcome.seconds)
+    return outcome
+
+
+def _set_result(outcome, data, surface):
+    outcome.data = data
+    if surface != "rest":
+        rendered = outcome.tool.render(data, outcome.args)
+        outcome.text, outcome.structured = rendered if isinstance(rendered, tuple) else (rendered, None)
+
+
+def run(name, arguments, surface="mcp", progress=None):
+    """
+    Run a tool on this thread; never raises, failures are in the Outcome.
+
+    progress(done, total, message) is passed to tools that report progress.
+    """
+    started = time.perf_counter()
+    outcome = Outcome(name, TOOLS_BY_NAME.get(name))
+    try:
+        _prepare(outcome, arguments, surface)
+        _set_result(outcome, outcome.tool.fetch(outcome.args, progress), surface)
+    except Exception as e:
+        outcome.fail(e)
+    return _finish(outcome, surface, started)
+
+
+async def arun(name, arguments, surface="mcp", progress=None):
+    """Async counterpart of run(), using the tool's non-blocking implementation"""
+    started = time.perf_counter()
+    outcome = Outcome(name, TOOLS_BY_NAME.get(name))
+    try:
+        _prepare(outcome, arguments, surface)
+        _set_result(outcome, await outcome.tool.afetch(outcome.args, progress), surface)
+    except Exception as e:
+        outcome.fail(e)
+    return _finish(outcome, surface, started)
+
+
+def rpc_response(outcome, request_id):
+    """(response_data, status) for a tool call made over JSON-RPC"""
+    if outcome.ok:
+        return {"jsonrpc": "2.0", "id": request_id, "result": outcome.content()}, 200
+    return rpc_error(outcome.error, request_id)
+
+
+def rpc_error(e, request_id):
+    """
+    (response_data, status) for an exception raised by a tool.
+
+    Jira throttling becomes a 429 whose error carries data.retryAfter, so
+    clients back off instead of retrying at once. A mirror that is not
+    ready yet is a tool-level error (isError), not a protocol one.
+    """
+    kind, retry_after = classify(e)
+    if kind == "unavailable":
+        return {"jsonrpc": "2.0", "id": request_id,
+                "result": {"content": [{"type": "text", "text": str(e)}], "isError": True}}, 200
+    if kind == "unknown":
+        error, status = {"code": -32601, "message": str(e)}, 200
+    elif kind == "invalid_params":
+        error, status = {"code": -32602, "message": f"Invalid params: {e}"}, 200
+    elif kind == "rate_limited":
+        error, status = {"code": RATE_LIMITED_CODE, "message": f"Rate limited by Jira: {e}",
+                         "data": {"retryAfter": retry_after}}, 429
+    else:
+        error, status = {"code": -32603, "message": f"Internal error: {e}"}, 500
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}, status
+
+
+# HTTP status for each failure kind, on /call and the REST routes
+ERROR_STATUS = {
+    "unknown": 404,
+    "invalid_params": 400,
+    "unavailable": 503,
+    "rate_limited": 429,
+    "exception": 500,
+}
+
+
+def _retry_headers(retry_after):
+    return {} if retry_after is None else {"Retry-After": str(retry_after)}
+
+
+def call_response(outcome):
+    """(body, status, headers) for /call: MCP content, errors as "Error: ..." text"""
+    if outcome.ok:
+        return outcome.content(), 200, {}
+    return {"content": [{"type": "text", "text": f"Error: {outcome.error}"}], "isError": True}, \
+        ERROR_STATUS[outcome.kind], _retry_headers(outcome.retry_after)
+
+
+def rest_error(e):
+    """(body, status, headers) for the REST routes; Jira throttling becomes 429 with Retry-After"""
+    kind, retry_after = classify(e)
+    body = {"success": False, "error": str(e)}
+    if retry_after is not None:
+        body["retry_after"] = retry_after
+    return body, ERROR_STATUS[kind], _retry_headers(retry_after)
@@ -0,0 +1,116 @@
+"""
+Process-wide pooled Jira client.
+
+One atlassian ``Jira`` instance is shared by every request in a worker
+process. It sits on a ``requests.Session`` with a keep-alive connection
+pool, so TCP/TLS handshakes to Jira are paid once per connection instead
+of once per request. Identical concurrent searches, issue fetches and
+project listings share a single upstream call (see singleflight.py).
+
+The client classes live in pooled_jira.py and are imported on first use,
+so a worker can answer initialize and tools/list before requests and
+atlassian-python-api are loaded.
+"""
+import importlib
+import os
+import threading
+import time
+
+from config import (
+    JIRA_URL, JIRA_USERNAME, JIRA_API_TOKEN, validate_config,
+    JIRA_POOL_CONNECTIONS, JIRA_POOL_MAXSIZE, JIRA_POOL_BLOCK,
+    JIRA_CONNECT_TIMEOUT, JIRA_READ_TIMEOUT,
+)
+from metrics import CLIENT_INIT_LATENCY
+
+
+class PoolStats:
+    """Thread-safe counters describing connection pool usage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.connections_opened = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+
+    def record_checkout(self, waited):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += waited
+            if waited > self.wait_time_max:
+                self.wait_time_max = waited
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.checkouts,
+                "connections_opened": self.connections_opened,
+                "connections_reused": max(self.checkouts - self.connections_opened, 0),
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+pool_stats_counters = PoolStats()
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_jira_client():
+    """
+    Return the Jira client shared by this worker process.
+
+    The client is built lazily and rebuilt after a fork, so gunicorn
+    workers never share sockets inherited from the master process.
+    """
+    global _client, _client_pid
+    client = _client
+    if client is not None and _client_pid == os.getpid():
+        return client
+
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            validate_config()
+            started = time.perf_counter()
+            from pooled_jira import CoalescingJira, PooledSession
+            _client = CoalescingJira(
+                url=JIRA_URL,
+                username=JIRA_USERNAME,
+                password=JIRA_API_TOKEN,
+                cloud=True,
+                session=PooledSession()
+            )
+            _client_pid = os.getpid()
+            pool_stats_counters.reset()
+            CLIENT_INIT_LATENCY.labels("sync").observe(time.perf_counter() - started)
+        return _client
+
+
+def preload():
+    """Import the client classes now rather than on the first Jira call"""
+    importlib.import_module("pooled_jira")
+
+
+def pool_stats():
+    """Connection pool configuration and usage counters for this worker"""
+    stats = pool_stats_counters.snapshot()
+    stats.update({
+        "pool_connections": JIRA_POOL_CONNECTIONS,
+        "pool_maxsize": JIRA_POOL_MAXSIZE,
+        "pool_block": JIRA_POOL_BLOCK,
+        "connect_timeout": JIRA_CONNECT_TIMEOUT,
+        "read_timeout": JIRA_READ_TIMEOUT,
+    })
+    return stats
@@ -0,0 +1,180 @@
+"""
+Prometheus metrics served on /metrics.
+
+Latency is recorded at each layer a request passes through, so a slow
+request can be attributed to HTTP handling, Jira client construction,
+the upstream Jira call or text rendering:
+
+    http_request_duration_seconds      whole request, by route
+    mcp_tool_duration_seconds          one tool call, by tool
+    jira_upstream_duration_seconds     one Jira REST call, by endpoint and status
+    mcp_render_duration_seconds        result text rendering, by renderer
+    jira_client_init_duration_seconds  client construction (once per worker)
+
+Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR before the
+app is imported. Every worker then writes its samples to files in that
+directory and /metrics aggregates all workers, whichever one serves it.
+"""
+import functools
+import os
+import re
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest, multiprocess
+
+from tools import TOOLS, TOOL_ALIASES, METHOD_ALIASES, LOCAL_SEARCH_TOOL
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+RENDER_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["route", "method", "status"], buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled",
+    multiprocess_mode="livesum"
+)
+HTTP_REQUEST_BYTES = Histogram(
+    "http_request_size_bytes", "HTTP request body size", ["route"], buckets=SIZE_BUCKETS
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes", "HTTP response body size before compression (unstreamed responses)", ["route"],
+    buckets=SIZE_BUCKETS
+)
+COMPRESSION_INPUT_BYTES = Counter(
+    "http_compression_input_bytes_total", "Response bytes handed to the compressor", ["encoding"]
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "http_compression_output_bytes_total", "Compressed response bytes sent", ["encoding"]
+)
+COMPRESSION_SAVED_BYTES = Counter(
+    "http_compression_saved_bytes_total", "Response bytes saved by compression", ["encoding"]
+)
+
+TOOL_REQUESTS = Counter(
+    "mcp_tool_requests_total", "Tool calls (MCP, /call and REST) by outcome (ok, error, rate_limited, exception, stream)",
+    ["tool", "outcome"]
+)
+TOOL_LATENCY = Histogram(
+    "mcp_tool_duration_seconds", "MCP tool call latency", ["tool"], buckets=LATENCY_BUCKETS
+)
+RENDER_LATENCY = Histogram(
+    "mcp_render_duration_seconds", "Tool result rendering time", ["renderer"], buckets=RENDER_BUCKETS
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "jira_upstream_duration_seconds", "Jira REST call latency",
+    ["method", "endpoint", "status"], buckets=LATENCY_BUCKETS
+)
+UPSTREAM_RESPONSE_BYTES = Histogram(
+    "jira_upstream_response_size_bytes", "Jira REST response body size", ["endpoint"], buckets=SIZE_BUCKETS
+)
+UPSTREAM_RETRIES = Counter(
+    "jira_upstream_retries_total", "Jira reads retried after a throttling response", ["status"]
+)
+RATE_LIMIT_WAIT = Histogram(
+    "jira_rate_limit_wait_seconds", "Time Jira calls queued for the client-side rate limiter",
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+RATE_LIMIT_REJECTED = Counter(
+    "jira_rate_limit_rejected_total", "Jira calls failed because the rate limiter queue wait was too long"
+)
+CLIENT_INIT_LATENCY = Histogram(
+    "jira_client_init_duration_seconds", "Jira client construction time", ["client"], buckets=LATENCY_BUCKETS
+)
+
+SINGLEFLIGHT_CALLS = Counter(
+    "jira_singleflight_calls_total",
+    "Jira calls by whether they went upstream (executed) or joined an identical in-flight call (coalesced)",
+    ["call", "result"]
+)
+
+CACHE_EVENTS = Counter(
+    "cache_events_total", "Cache lookups and maintenance events (hit, miss, eviction, ...)", ["cache", "event"]
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries", "Entries held by a cache", ["cache"], multiprocess_mode="livesum"
+)
+CACHE_BYTES = Gauge(
+    "cache_bytes", "Approximate size of a cache's entries", ["cache"], multiprocess_mode="livesum"
+)
+
+MIRROR_SYNC_LATENCY = Histogram(
+    "mirror_sync_duration_seconds", "Local mirror sync passes by outcome (ok, error)", ["outcome"],
+    buckets=LATENCY_BUCKETS + (60, 300, 900)
+)
+MIRROR_ISSUES_SYNCED = Counter(
+    "mirror_issues_synced_total", "Issues written to the local mirror by sync passes"
+)
+
+WEBHOOK_EVENTS = Counter(
+    "jira_webhook_events_total", "Jira webhook deliveries by category (issue, comment, worklog, project, ignored, rejected)",
+    ["category"]
+)
+
+_KNOWN_TOOLS = {tool["name"] for tool in TOOLS + [LOCAL_SEARCH_TOOL]} | {"initialize", "tools/list"}
+
+
+def tool_label(tool_name):
+    """Canonical tool name, so aliases share series and junk names share one"""
+    tool_name = TOOL_ALIASES.get(tool_name) or METHOD_ALIASES.get(tool_name, tool_name)
+    return tool_name if tool_name in _KNOWN_TOOLS else "unknown"
+
+
+def observe_tool(tool_name, outcome, seconds=None):
+    tool = tool_label(tool_name)
+    TOOL_REQUESTS.labels(tool, outcome).inc()
+    if seconds is not None:
+        TOOL_LATENCY.labels(tool).observe(seconds)
+
+
+# Issue keys (PROJ-123) and numeric ids become placeholders; the API
+# version segment (rest/api/2) is kept.
+_ID_SEGMENT = re.compile(r"(?<!/api)/(?:[A-Za-z][A-Za-z0-9_]*-\d+|\d+)(?=/|$)")
+
+
+def normalize_endpoint(path):
+    """Low-cardinality endpoint label for a Jira REST path"""
+    path = path.split("?", 1)[0]
+    marker = path.find("/rest/")
+    if marker >= 0:
+        path = path[marker:]
+    elif not path.startswith("/"):
+        path = "/" + path
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def observe_upstream(method, path, status, seconds, size=None):
+    endpoint = normalize_endpoint(path)
+    UPSTREAM_LATENCY.labels(method.upper(), endpoint, str(status)).observe(seconds)
+    if size is not None:
+        UPSTREAM_RESPONSE_BYTES.labels(endpoint).observe(size)
+
+
+def timed_render(renderer):
+    """Record a renderer's run time in mcp_render_duration_seconds"""
+    histogram = RENDER_LATENCY.labels(renderer.__name__)
+
+    @functools.wraps(renderer)
+    def wrapper(*args, **kwargs):
+        with histogram.time():
+            return renderer(*args, **kwargs)
+    return wrapper
+
+
+def metrics_payload():
+    """Return (body, content_type) for /metrics"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges; called from gunicorn's child_exit"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,142 @@
+"""
+Pooled requests session and Jira client classes behind jira_client.
+
+Kept apart from jira_client.py because importing requests, urllib3 and
+atlassian-python-api is a large share of worker start-up time; this
+module is only imported when the first Jira client is built (or by
+jira_client.preload()).
+"""
+import functools
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from atlassian import Jira
+
+import fastjson
+from config import (
+    JIRA_POOL_CONNECTIONS, JIRA_POOL_MAXSIZE, JIRA_POOL_BLOCK, JIRA_POOL_TIMEOUT,
+    JIRA_CONNECT_TIMEOUT, JIRA_READ_TIMEOUT,
+)
+from jira_client import pool_stats_counters
+from metrics import observe_upstream
+from singleflight import SingleFlight, freeze
+from ratelimit import jira_rate_limiter, plan_retry
+
+
+# Connection classes count real TCP/TLS connects, including silent
+# reconnects of pooled connections the server closed while idle.
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        pool_stats_counters.record_connect()
+        return super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        pool_stats_counters.record_connect()
+        return super().connect()
+
+
+class _InstrumentedPoolMixin:
+    def _get_conn(self, timeout=None):
+        # requests never passes a pool timeout, which would make a blocking
+        # pool wait forever once every connection is checked out.
+        if timeout is None:
+            timeout = JIRA_POOL_TIMEOUT
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout=timeout)
+        pool_stats_counters.record_checkout(time.perf_counter() - started)
+        return conn
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools record PoolStats"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+
+
+class PooledSession(requests.Session):
+    """
+    Session with a tuned keep-alive pool and (connect, read) timeouts.
+
+    atlassian-python-api only accepts a single integer timeout, so the
+    session applies its own timeout tuple to every request. Every call
+    passes the process-wide rate limiter, throttled reads are retried (see
+    ratelimit.py), and each attempt is recorded in the jira_upstream_* metrics.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.timeout = (JIRA_CONNECT_TIMEOUT, JIRA_READ_TIMEOUT)
+        adapter = PooledHTTPAdapter(
+            pool_connections=JIRA_POOL_CONNECTIONS,
+            pool_maxsize=JIRA_POOL_MAXSIZE,
+            pool_block=JIRA_POOL_BLOCK,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs["timeout"] = self.timeout
+        attempt = 0
+        while True:
+            jira_rate_limiter.acquire()
+            response = self._send(method, url, **kwargs)
+            attempt += 1
+            delay = plan_retry(method, response.status_code, response.headers, attempt)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def _send(self, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+        except Exception:
+            observe_upstream(method, url, "error", time.perf_counter() - started)
+            raise
+        # atlassian-python-api decodes every body with response.json()
+        response.json = functools.partial(fastjson.response_json, response)
+        content_length = response.headers.get("Content-Length")
+        observe_upstream(method, url, response.status_code, time.perf_counter() - started,
+                         int(content_length) if content_length else len(response.content))
+        return response
+
+
+class CoalescingJira(Jira):
+    """Jira client whose read calls are deduplicated while in flight"""
+
+    _jql_flight = SingleFlight("jql")
+    _issue_flight = SingleFlight("issue")
+    _projects_flight = SingleFlight("projects")
+
+    def jql(self, jql, fields="*all", start=0, limit=None, expand=None, validate_query=None):
+        key = (jql, freeze(fields), start, limit, expand, validate_query)
+        return self._jql_flight.do(key, lambda: super(CoalescingJira, self).jql(
+            jql, fields=fields, start=start, limit=limit, expand=expand, validate_query=validate_query))
+
+    def issue(self, key, fields="*all", expand=None):
+        flight_key = (key.upper(), freeze(fields), expand)
+        return self._issue_flight.do(flight_key, lambda: super(CoalescingJira, self).issue(
+            key, fields=fields, expand=expand))
+
+    def projects(self, included_archived=None, expand=None):
+        return self._projects_flight.do((included_archived, expand), lambda: super(CoalescingJira, self).projects(
+            included_archived=included_archived, expand=expand))
@@ -0,0 +1,228 @@
+"""
+MCP sessions for the Streamable HTTP transport on /api/mcp.
+
+An initialize request opens a session. Its id goes back in the
+Mcp-Session-Id header, and clients send that header on every later request
+and DELETE it when they are done. The id is signed and carries the protocol
+version negotiated at initialize:
+
+    <nonce>.<issued, hex seconds>.<protocol version>.<signature>
+
+so any gunicorn worker can admit a session another worker opened, without
+shared storage (the signing key is made before the workers fork, or set
+with MCP_SESSION_SECRET). Each worker keeps the sessions it serves in an
+LRU bounded by MCP_SESSION_MAX_ENTRIES and drops those idle for
+MCP_SESSION_IDLE_TIMEOUT seconds; a dropped session that comes back is
+admitted again from its id until MCP_SESSION_MAX_AGE has passed since
+initialize. A session holds the initialize result it was given, so a
+repeated initialize on it is answered from memory.
+
+The store registers as the "sessions" cache: /cache reports it, and
+terminating a session is published to every worker with cache.publish.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    MCP_SESSION_SECRET, MCP_SESSION_MAX_ENTRIES, MCP_SESSION_IDLE_TIMEOUT, MCP_SESSION_MAX_AGE,
+    MCP_SESSION_REQUIRED,
+)
+import cache
+
+SESSION_HEADER = "Mcp-Session-Id"
+PROTOCOL_HEADER = "MCP-Protocol-Version"
+
+# Newest first; initialize without a protocolVersion gets the oldest, as before
+SUPPORTED_PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+DEFAULT_PROTOCOL_VERSION = "2024-11-05"
+
+# JSON-RPC error code for an unknown, expired or terminated session
+SESSION_NOT_FOUND_CODE = -32001
+
+
+def negotiate_version(requested):
+    """The requested protocol version when supported, else the newest we speak"""
+    if not requested:
+        return DEFAULT_PROTOCOL_VERSION
+    return requested if requested in SUPPORTED_PROTOCOL_VERSIONS else SUPPORTED_PROTOCOL_VERSIONS[0]
+
+
+class TransportError(Exception):
+    """A request the transport refuses before any message is handled"""
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+    def response(self):
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": self.code, "message": str(self)}}
+
+
+class Session:
+    __slots__ = ("id", "protocol_version", "issued", "initialize_result", "client_info", "last_seen", "requests")
+
+    def __init__(self, session_id, protocol_version, issued, initialize_result=None, client_info=None):
+        self.id = session_id
+        self.protocol_version = protocol_version
+        self.issued = issued
+        self.initialize_result = initialize_result
+        self.client_info = client_info
+        self.last_seen = time.monotonic()
+        self.requests = 0
+
+
+class SessionStore:
+    """Per-worker LRU of sessions, bounded by count and idle time"""
+
+    def __init__(self, name, secret, max_entries, idle_timeout, max_age):
+        self.name = name
+        self._secret = secret
+        self.max_entries = max_entries
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        # Terminated ids, until they would have expired anyway
+        self._terminated = OrderedDict()
+        self.created = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.terminated = 0
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    def _sign(self, payload):
+        return hmac.new(self._secret, payload.encode("ascii"), hashlib.sha256).hexdigest()[:24]
+
+    def create(self, protocol_version, initialize_result, client_info=None):
+        issued = int(time.time())
+        payload = f"{secrets.token_hex(8)}.{issued:x}.{protocol_version}"
+        session = Session(f"{payload}.{self._sign(payload)}", protocol_version, issued, initialize_result,
+                          client_info)
+        with self._lock:
+            self.created += 1
+            self._store(session)
+        return session
+
+    def get(self, session_id):
+        """The live session for an id, or None when it is unknown, expired or terminated"""
+        cache.invalidations.poll()
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_seen = now
+                session.requests += 1
+                return session
+            session = self._admit(session_id)
+            if session is None:
+                self.rejected += 1
+                return None
+            self.admitted += 1
+            session.requests += 1
+            self._store(session)
+            return session
+
+    def _admit(self, session_id):
+        """Session rebuilt from a valid id opened by another worker (or evicted here)"""
+        payload, _, signature = session_id.rpartition(".")
+        try:
+            if not payload or not hmac.compare_digest(signature, self._sign(payload)):
+                return None
+            _, issued, protocol_version = payload.split(".", 2)
+            issued = int(issued, 16)
+        except ValueError:
+            # Not ASCII, or not in our format
+            return None
+        if time.time() - issued > self.max_age or session_id in self._terminated:
+            return None
+        return Session(session_id, protocol_version, issued)
+
+    def _store(self, session):
+        self._sessions[session.id] = session
+        while len(self._sessions) > self.max_entries:
+            self._sessions.popitem(last=False)
+            self.evicted_capacity += 1
+
+    def _evict_idle(self, now):
+        # LRU order is last-seen order, so idle sessions are at the front
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_seen < self.idle_timeout:
+                return
+            self._sessions.popitem(last=False)
+            self.evicted_idle += 1
+
+    def terminate(self, session_id):
+        """End a session in every worker; False when it was not live"""
+        if self.get(session_id) is None:
+            return False
+        cache.publish(self.name, session_id)
+        return True
+
+    def invalidate_key(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            self._terminated[session_id] = session.issued if session else time.time()
+            self.terminated += 1
+            cutoff = time.time() - self.max_age
+            while self._terminated and (len(self._terminated) > self.max_entries
+                                        or next(iter(self._terminated.values())) < cutoff):
+                self._terminated.popitem(last=False)
+
+    def invalidate(self):
+        # Only memory: the sessions stay valid and are admitted again from their ids
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self):
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            return {
+                "active": len(self._sessions),
+                "created": self.created,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "terminated": self.terminated,
+                "evicted_idle": self.evicted_idle,
+                "evicted_capacity": self.evicted_capacity,
+                "max_entries": self.max_entries,
+                "idle_timeout_seconds": self.idle_timeout,
+                "max_age_seconds": self.max_age,
+                "required": MCP_SESSION_REQUIRED,
+            }
+
+
+# Made at import: under gunicorn the app is preloaded, so every worker shares it
+_secret = MCP_SESSION_SECRET.encode("utf-8") if MCP_SESSION_SECRET else os.urandom(32)
+
+store = cache.register(SessionStore("sessions", _secret, MCP_SESSION_MAX_ENTRIES, MCP_SESSION_IDLE_TIMEOUT,
+                                    MCP_SESSION_MAX_AGE))
+
+
+def resolve(session_id, protocol_version, initializing):
+    """
+    The session a request belongs to, or None for a sessionless request.
+
+    Raises TransportError for an unsupported MCP-Protocol-Version header,
+    an unknown or expired session id (404, so the client initializes
+    again) and, with MCP_SESSION_REQUIRED, a missing one.
+    """
+    if protocol_version and protocol_version not in SUPPORTED_PROTOCOL_VERSIONS:
+        raise TransportError(400, -32600, f"Bad Request: unsupported {PROTOCOL_HEADER}: {protocol_version}")
+    if session_id:
+        session = store.get(session_id)
+        if session is None:
+            raise TransportError(404, SESSION_NOT_FOUND_CODE, "Session not found")
+        return session
+    if MCP_SESSION_REQUIRED and not initializing:
+        raise TransportError(400, -32600, f"Bad Request: {SESSION_HEADER} header is required")
+    return None
@@ -0,0 +1,129 @@
+"""
+Single-flight deduplication of identical concurrent upstream calls.
+
+When several requests need the same Jira call at the same moment (the
+same JQL page, the same issue) only the first one goes upstream; the
+others wait for it and get the same result or exception. Nothing is
+cached: once the call finishes, the next identical request goes upstream
+again.
+
+Results are shared between callers and must be treated as read-only.
+"""
+import asyncio
+import threading
+
+from metrics import SINGLEFLIGHT_CALLS
+
+groups = {}
+
+
+def freeze(value):
+    """Hashable form of call arguments (lists and dicts become tuples)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(freeze(v) for v in value))
+    return value
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key across threads"""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+        groups[name] = self
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.labels(self.name, "coalesced").inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLEFLIGHT_CALLS.labels(self.name, "executed").inc()
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent coroutine calls that share a key on one event loop"""
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+        groups[name] = self
+
+    async def do(self, key, fn):
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            SINGLEFLIGHT_CALLS.labels(self.name, "coalesced").inc()
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+
+        self.executed += 1
+        SINGLEFLIGHT_CALLS.labels(self.name, "executed").inc()
+        future = asyncio.ensure_future(fn())
+        self._calls[key] = future
+
+        def finished(f):
+            self._calls.pop(key, None)
+            if not f.cancelled():
+                # Mark the exception retrieved even if every caller went away
+                f.exception()
+
+        future.add_done_callback(finished)
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,232 @@
+"""
+Tool registry for MCP discovery.
+
+The tool schemas are defined once here and serialized once at import.
+Every discovery route serves these bytes with an ETag, so repeated
+discovery calls cost neither a dict rebuild nor a JSON encode, and
+clients that send If-None-Match get a 304.
+"""
+import hashlib
+import json
+
+from config import TOOLS_CACHE_MAX_AGE, MIRROR_ENABLED
+
+TOOLS = [
+    {
+        "name": "jira_list_projects",
+        "description": "List all available Jira projects",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "jira_search_issues",
+        "description": "Search Jira issues using JQL (Jira Query Language)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "jql": {
+                    "type": "string",
+                    "description": "JQL query string (e.g., 'project = TEST AND status = Open')"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of results to return (default: 50)",
+                    "default": 50
+                },
+                "stream": {
+                    "type": "boolean",
+                    "description": "Answer as SSE: each page is a progress notification when a progressToken is given, then the full response. Capped at max_results (default 50), like an unstreamed search",
+                    "default": False
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Extra Jira fields to fetch and show, e.g. ['labels', 'customfield_10016']"
+                },
+                "expand": {
+                    "type": "string",
+                    "description": "Optional Jira expand parameter, e.g. 'changelog'"
+                }
+            },
+            "required": ["jql"]
+        }
+    },
+    {
+        "name": "jira_get_issue",
+        "description": "Get detailed information about a specific Jira issue",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "issue_key": {
+                    "type": "string",
+                    "description": "Jira issue key (e.g., 'PROJ-123')"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Extra Jira fields to fetch and show, e.g. ['labels', 'customfield_10016']"
+                },
+                "expand": {
+                    "type": "string",
+                    "description": "Optional Jira expand parameter, e.g. 'changelog'"
+                }
+            },
+            "required": ["issue_key"]
+        }
+    },
+    {
+        "name": "jira_get_issues",
+        "description": "Get several Jira issues by key in one call; results follow the given order and missing keys are reported",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "issue_keys": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Jira issue keys (e.g., ['PROJ-1', 'PROJ-2'])"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Extra Jira fields to fetch and show, e.g. ['labels', 'customfield_10016']"
+                },
+                "expand": {
+                    "type": "string",
+                    "description": "Optional Jira expand parameter, e.g. 'changelog'"
+                }
+            },
+            "required": ["issue_keys"]
+        }
+    },
+    {
+        "name": "jira_create_issue",
+        "description": "Create a new Jira issue",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "project_key": {
+                    "type": "string",
+                    "description": "Project key where the issue will be created"
+                },
+                "summary": {
+                    "type": "string",
+                    "description": "Brief summary of the issue"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Detailed description of the issue"
+                },
+                "issue_type": {
+                    "type": "string",
+                    "description": "Type of issue (e.g., 'Task', 'Bug', 'Story')",
+                    "default": "Task"
+                }
+            },
+            "required": ["project_key", "summary"]
+        }
+    },
+    {
+        "name": "jira_bulk_create_issues",
+        "description": "Create many Jira issues at once using Jira's bulk create API; reports success or failure per issue",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "issues": {
+                    "type": "array",
+                    "description": "Issues to create, in order",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "project_key": {
+                                "type": "string",
+                                "description": "Project key; defaults to the top-level project_key"
+                            },
+                            "summary": {"type": "string", "description": "Brief summary of the issue"},
+                            "description": {"type": "string", "description": "Detailed description of the issue"},
+                            "issue_type": {
+                                "type": "string",
+                                "description": "Type of issue (e.g., 'Task', 'Bug', 'Story')",
+                                "default": "Task"
+                            },
+                            "assignee": {"type": "string", "description": "Assignee account name"},
+                            "priority": {"type": "string", "description": "Priority name"}
+                        },
+                        "required": ["summary"]
+                    }
+                },
+                "project_key": {
+                    "type": "string",
+                    "description": "Default project key for issues that do not set one"
+                }
+            },
+            "required": ["issues"]
+        }
+    }
+]
+
+# Only offered when the local mirror is configured
+LOCAL_SEARCH_TOOL = {
+    "name": "jira_local_search",
+    "description": "Search a local mirror of Jira issues by text in summary and description and by simple field filters. Answers in milliseconds without calling Jira; the result says how stale the mirror is",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "text": {
+                "type": "string",
+                "description": "Words that must all appear in the summary or description; end a word with * to match it as a prefix"
+            },
+            "project": {"type": "string", "description": "Project key, e.g. 'PROJ'"},
+            "status": {"type": "string", "description": "Status name, e.g. 'In Progress'"},
+            "assignee": {
+                "type": "string",
+                "description": "Assignee display name or account id, or 'unassigned'"
+            },
+            "issue_type": {"type": "string", "description": "Issue type name, e.g. 'Bug'"},
+            "max_results": {
+                "type": "integer",
+                "description": "Maximum number of results to return (default: 50)",
+                "default": 50
+            }
+        },
+        "required": []
+    }
+}
+
+if MIRROR_ENABLED:
+    TOOLS.append(LOCAL_SEARCH_TOOL)
+
+# Older names still accepted for each tool
+TOOL_ALIASES = {
+    "list_jira_projects": "jira_list_projects",
+    "search_jira_issues": "jira_search_issues",
+    "get_jira_issue": "jira_get_issue",
+    "create_jira_issue": "jira_create_issue",
+}
+
+# Older names still accepted for protocol methods
+METHOD_ALIASES = {
+    "listTools": "tools/list",
+}
+
+TOOLS_JSON = json.dumps(TOOLS, separators=(",", ":")).encode("utf-8")
+TOOLS_HASH = hashlib.sha256(TOOLS_JSON).hexdigest()[:32]
+
+# {"tools": [...]}
+TOOLS_LIST_BODY = b'{"tools":' + TOOLS_JSON + b'}'
+TOOLS_LIST_ETAG = TOOLS_HASH
+TOOLS_CACHE_CONTROL = f"public, max-age={TOOLS_CACHE_MAX_AGE}"
+
+
+def tools_rpc_body(request_id):
+    """JSON-RPC tools/list response; only the id is encoded per call"""
+    return (b'{"jsonrpc":"2.0","id":' + json.dumps(request_id).encode("utf-8") +
+            b',"result":{"tools":' + TOOLS_JSON + b'}}')
+
+
+def tools_rpc_etag(request_id):
+    # The body embeds the request id, so the validator must too
+    id_hash = hashlib.sha256(json.dumps(request_id).encode("utf-8")).hexdigest()[:8]
+    return f"{TOOLS_HASH}-{id_hash}"
@@ -0,0 +1,88 @@
+"""
+Jira webhook receiver: pushes upstream changes into the caches and the mirror.
+
+Jira POSTs issue, comment, worklog and project events to /webhooks/jira.
+A request must prove it knows JIRA_WEBHOOK_SECRET, either with an
+``X-Hub-Signature: sha256=<hmac of the body>`` header (webhooks registered
+with a secret) or with ``?secret=`` in the registered URL.
+
+Issue events drop the issue from the issue cache in every worker and
+upsert or delete it in the local mirror; comment and worklog events drop
+the issue from the cache; project events drop the projects cache (and a
+deleted project's issues from the mirror). Anything else is acknowledged
+and ignored, since Jira retries deliveries that are not answered 2xx.
+"""
+import hashlib
+import hmac
+
+import cache
+from metrics import WEBHOOK_EVENTS
+
+SIGNATURE_HEADER = "X-Hub-Signature"
+
+
+class Unauthorized(Exception):
+    pass
+
+
+def verify(body, signature, query_secret, secret):
+    """Raise Unauthorized unless the request carries `secret` or a valid signature of `body`"""
+    if signature:
+        algorithm, _, digest = signature.partition("=")
+        expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        if algorithm.lower() == "sha256" and hmac.compare_digest(digest.lower(), expected):
+            return
+        raise Unauthorized("Invalid webhook signature")
+    if query_secret and hmac.compare_digest(query_secret.encode("utf-8"), secret.encode("utf-8")):
+        return
+    raise Unauthorized("Missing or invalid webhook secret")
+
+
+def event_category(event):
+    if event.startswith("jira:issue_"):
+        return "issue"
+    for category in ("comment", "worklog", "project"):
+        if event.startswith(category + "_"):
+            return category
+    return "ignored"
+
+
+def renamed_keys(payload):
+    """Former keys of an issue that was moved to another project"""
+    items = (payload.get("changelog") or {}).get("items") or []
+    return [item["fromString"] for item in items if item.get("field") == "Key" and item.get("fromString")]
+
+
+def handle(payload, mirror=None):
+    """Apply one webhook payload; returns the event, its category and what was done"""
+    event = payload.get("webhookEvent") or ""
+    category = event_category(event)
+    issue = payload.get("issue") or {}
+    key = issue.get("key")
+    actions = []
+
+    if category in ("issue", "comment", "worklog") and key:
+        for stale_key in [key] + renamed_keys(payload):
+            cache.publish("issues", stale_key)
+            actions.append(f"invalidated issue {stale_key}")
+        if category == "issue" and mirror is not None:
+            for old_key in renamed_keys(payload):
+                mirror.delete_issue(old_key)
+                actions.append(f"deleted {old_key} from mirror")
+            if event == "jira:issue_deleted":
+                mirror.delete_issue(key)
+                actions.append(f"deleted {key} from mirror")
+            elif issue.get("fields"):
+                mirror.upsert([issue])
+                actions.append(f"updated {key} in mirror")
+
+    elif category == "project":
+        cache.publish("projects")
+        actions.append("invalidated projects")
+        project_key = (payload.get("project") or {}).get("key")
+        if event == "project_deleted" and project_key and mirror is not None:
+            mirror.delete_project(project_key)
+            actions.append(f"deleted project {project_key} from mirror")
+
+    WEBHOOK_EVENTS.labels(category).inc()
+    return {"event": event, "category": category, "actions": actions}
@@ -0,0 +1,115 @@
+"""
+Leveled, non-blocking logging.
+
+Request threads only put records on an in-memory queue; a listener
+thread formats them and writes to stdout. Request and response bodies
+are logged through ``Payload``, which is serialized (compact and
+truncated to LOG_MAX_PAYLOAD characters) on the listener thread and only
+if the record is emitted at all, so at INFO the hot path never encodes a
+payload. Payload records are additionally sampled at LOG_SAMPLE_RATE.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+from config import LOG_LEVEL, LOG_SAMPLE_RATE, LOG_MAX_PAYLOAD, LOG_QUEUE_SIZE
+
+logger = logging.getLogger("jira_mcp")
+
+REDACTED_HEADERS = {"authorization", "cookie", "x-hub-signature"}
+
+
+class Payload:
+    """Log argument that is serialized lazily and truncated"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        text = self.value if isinstance(self.value, str) else json.dumps(self.value, default=str)
+        if len(text) > LOG_MAX_PAYLOAD:
+            return text[:LOG_MAX_PAYLOAD] + f"... [{len(text) - LOG_MAX_PAYLOAD} more chars]"
+        return text
+
+
+def redact_headers(headers):
+    return {k: ("[redacted]" if k.lower() in REDACTED_HEADERS else v) for k, v in headers.items()}
+
+
+class PayloadSampler(logging.Filter):
+    """Keeps LOG_SAMPLE_RATE of the records that carry a Payload"""
+
+    def filter(self, record):
+        if LOG_SAMPLE_RATE >= 1:
+            return True
+        if isinstance(record.args, tuple) and any(isinstance(a, Payload) for a in record.args):
+            return random.random() < LOG_SAMPLE_RATE
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener unformatted; drops them if the queue is full"""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Formatting, including Payload serialization, happens on the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+_handler = None
+_listener = None
+
+
+def _start_listener():
+    global _listener
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s [%(process)d:%(threadName)s] %(name)s: %(message)s"
+    ))
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(_handler.queue, stream, respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # The listener thread does not survive fork (gunicorn workers); start a fresh one
+    if _handler is not None:
+        _start_listener()
+
+
+def configure_logging():
+    """Install the queue handler on the jira_mcp logger (idempotent)"""
+    global _handler
+    if _handler is not None:
+        return logger
+    _handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _handler.addFilter(PayloadSampler())
+    logger.addHandler(_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    _start_listener()
+    os.register_at_fork(after_in_child=_restart_after_fork)
+    atexit.register(stop_logging)
+    return logger
+
+
+def stop_logging():
+    """Flush queued records; used at shutdown"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,377 @@
+"""
+Optional local mirror of Jira issues in SQLite, searched with FTS5.
+
+A background thread pulls the issues updated since its previous pass
+(`updated >= watermark`) and upserts them; triggers keep an FTS5 index
+over summary and description in step. jira_local_search answers text and
+simple field filters from the mirror without calling Jira and reports how
+old the data is.
+
+Pages are walked newest first, so an issue edited during a pass moves to
+the front and only repeats one row instead of pushing another past the
+page boundary. The next watermark is the start of the pass minus
+MIRROR_SYNC_OVERLAP, which also absorbs clock skew and JQL's
+minute-granular dates.
+
+One process per database syncs: workers compete for an flock on
+MIRROR_DB_PATH + ".lock" and the holder runs the passes. If it exits the
+lock is released and another worker takes over at its next check. Every
+process reads the database (WAL mode). Sync passes never remove issues;
+deletions only arrive through webhooks (delete_issue, delete_project).
+An upsert never replaces a row with an older `updated` value, so a late
+webhook cannot roll back what a sync pass already wrote. `updated` is
+compared as UTC epoch seconds (updated_ts): Jira's strings carry the
+author's UTC offset and do not sort as text. The issue count is kept in
+sync_state by the writes, so status() never scans the table.
+"""
+import fcntl
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import fastjson
+from config import (
+    MIRROR_JQL, MIRROR_SYNC_INTERVAL, MIRROR_SYNC_OVERLAP,
+    MIRROR_PAGE_SIZE, MIRROR_SEARCH_MAX_RESULTS,
+)
+from metrics import MIRROR_SYNC_LATENCY, MIRROR_ISSUES_SYNCED
+from renderers import ISSUE_FIELDS
+from streaming import iter_pages
+
+logger = logging.getLogger("jira_mcp.mirror")
+
+MIRROR_FIELDS = ISSUE_FIELDS + ["labels"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT,
+    summary TEXT,
+    description TEXT,
+    status TEXT,
+    assignee TEXT,
+    assignee_id TEXT,
+    issuetype TEXT,
+    updated TEXT,
+    data TEXT NOT NULL,
+    updated_ts REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+    summary, description, content='issues', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts (rowid, summary, description) VALUES (new.rowid, new.summary, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, summary, description)
+    VALUES ('delete', old.rowid, old.summary, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, summary, description)
+    VALUES ('delete', old.rowid, old.summary, old.description);
+    INSERT INTO issues_fts (rowid, summary, description) VALUES (new.rowid, new.summary, new.description);
+END;
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# After any migration, since mirrors made before updated_ts lack the column
+INDEXES = """
+DROP INDEX IF EXISTS issues_project;
+DROP INDEX IF EXISTS issues_updated;
+CREATE INDEX IF NOT EXISTS issues_project_ts ON issues (project, updated_ts);
+CREATE INDEX IF NOT EXISTS issues_updated_ts ON issues (updated_ts);
+INSERT OR IGNORE INTO sync_state (name, value) VALUES ('issue_count', (SELECT count(*) FROM issues));
+"""
+
+UPSERT = """
+INSERT INTO issues (key, project, summary, description, status, assignee, assignee_id, issuetype, updated, data,
+                    updated_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    project = excluded.project, summary = excluded.summary, description = excluded.description,
+    status = excluded.status, assignee = excluded.assignee, assignee_id = excluded.assignee_id,
+    issuetype = excluded.issuetype, updated = excluded.updated, data = excluded.data,
+    updated_ts = excluded.updated_ts
+WHERE excluded.updated_ts >= issues.updated_ts OR issues.updated_ts IS NULL
+"""
+
+COUNT_ISSUES = "UPDATE sync_state SET value = CAST(value AS INTEGER) + ? WHERE name = 'issue_count'"
+
+
+class MirrorNotReady(Exception):
+    """The mirror has not completed its first sync"""
+
+
+def _name(value, attr="name"):
+    return value.get(attr) if isinstance(value, dict) else None
+
+
+def updated_timestamp(updated):
+    """Jira's `updated` (2024-01-15T10:30:00.000-0500) as UTC epoch seconds, or None"""
+    if not updated:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(updated, fmt).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def issue_row(issue):
+    """Column values for one Jira issue, as UPSERT expects them"""
+    fields = issue.get("fields") or {}
+    assignee = fields.get("assignee") or {}
+    project = _name(fields.get("project"), "key") or issue["key"].rsplit("-", 1)[0]
+    data = {"key": issue["key"], "fields": {name: fields.get(name) for name in MIRROR_FIELDS if name in fields}}
+    return (
+        issue["key"], project, fields.get("summary"), fields.get("description"),
+        _name(fields.get("status")), assignee.get("displayName"),
+        assignee.get("accountId") or assignee.get("name"), _name(fields.get("issuetype")),
+        fields.get("updated"), fastjson.dumps_str(data), updated_timestamp(fields.get("updated")),
+    )
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for free text: every word must match, as a
+    literal (quotes and operators are not interpreted); a trailing * on a
+    word matches it as a prefix.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def jql_date(timestamp, tz):
+    """Epoch seconds as a JQL date literal in the Jira user's time zone"""
+    return datetime.fromtimestamp(timestamp, tz).strftime("%Y-%m-%d %H:%M")
+
+
+class IssueMirror:
+    """SQLite copy of Jira issues with an incremental background sync"""
+
+    def __init__(self, path, get_jira, jql=MIRROR_JQL, interval=MIRROR_SYNC_INTERVAL):
+        self.path = path
+        self.get_jira = get_jira
+        self.jql = jql
+        self.interval = interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_pid = None
+        self._lock_file = None
+        self._tz = None
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        conn.executescript(INDEXES)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _migrate(conn):
+        # Mirrors made before updated_ts: add the column and fill it from `updated`
+        if "updated_ts" in {row[1] for row in conn.execute("PRAGMA table_info(issues)")}:
+            return
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if "updated_ts" in {row[1] for row in conn.execute("PRAGMA table_info(issues)")}:
+                # Another process migrated it first
+                return
+            conn.execute("ALTER TABLE issues ADD COLUMN updated_ts REAL")
+            rows = conn.execute("SELECT key, updated FROM issues").fetchall()
+            conn.executemany("UPDATE issues SET updated_ts = ? WHERE key = ?",
+                             [(updated_timestamp(updated), key) for key, updated in rows])
+
+    # Writes
+
+    def upsert(self, issues):
+        rows = [issue_row(issue) for issue in issues if issue.get("key")]
+        keys = list({row[0] for row in rows})
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute(f"SELECT count(*) FROM issues WHERE key IN ({', '.join('?' * len(keys))})",
+                                    keys).fetchone()[0] if keys else 0
+            conn.executemany(UPSERT, rows)
+            conn.execute(COUNT_ISSUES, (len(keys) - existing,))
+        return len(rows)
+
+    def delete_issue(self, key):
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            deleted = conn.execute("DELETE FROM issues WHERE key = ?", (key.upper(),)).rowcount
+            conn.execute(COUNT_ISSUES, (-deleted,))
+
+    def delete_project(self, project_key):
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            deleted = conn.execute("DELETE FROM issues WHERE project = ? COLLATE NOCASE", (project_key,)).rowcount
+            conn.execute(COUNT_ISSUES, (-deleted,))
+
+    def _set_state(self, **values):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO sync_state (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                [(name, fastjson.dumps_str(value)) for name, value in values.items()]
+            )
+
+    def _state(self):
+        rows = self._connect().execute("SELECT name, value FROM sync_state").fetchall()
+        return {name: fastjson.loads(value) for name, value in rows}
+
+    # Sync
+
+    def _jira_timezone(self, jira):
+        # JQL dates are read in the account's time zone
+        if self._tz is None:
+            try:
+                self._tz = ZoneInfo(jira.myself().get("timeZone") or "UTC")
+            except Exception as e:
+                logger.warning("Mirror: could not read Jira time zone, assuming UTC: %s", e)
+                self._tz = timezone.utc
+        return self._tz
+
+    def sync_jql(self, watermark, tz):
+        clauses = [f"({self.jql})"] if self.jql else []
+        if watermark is not None:
+            clauses.append(f'updated >= "{jql_date(watermark, tz)}"')
+        return " AND ".join(clauses) + " ORDER BY updated DESC"
+
+    def sync_once(self):
+        """Pull issues updated since the last pass; returns the number written"""
+        started = time.time()
+        state = self._state()
+        jira = self.get_jira()
+        jql = self.sync_jql(state.get("watermark"), self._jira_timezone(jira))
+        written = 0
+        try:
+            for issues, _ in iter_pages(jira, jql, page_size=MIRROR_PAGE_SIZE, fields=",".join(MIRROR_FIELDS)):
+                written += self.upsert(issues)
+        except Exception as e:
+            MIRROR_SYNC_LATENCY.labels("error").observe(time.time() - started)
+            self._set_state(last_error=str(e), last_error_at=started)
+            raise
+        finally:
+            MIRROR_ISSUES_SYNCED.inc(written)
+
+        MIRROR_SYNC_LATENCY.labels("ok").observe(time.time() - started)
+        self._set_state(
+            watermark=started - MIRROR_SYNC_OVERLAP,
+            synced_at=started,
+            last_sync_seconds=round(time.time() - started, 3),
+            last_sync_issues=written,
+            last_error=None,
+        )
+        logger.info("Mirror: synced %d issues in %.1fs", written, time.time() - started)
+        return written
+
+    def _try_lead(self):
+        if self._lock_file is not None:
+            return True
+        lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info("Mirror: process %d is the sync leader", os.getpid())
+        return True
+
+    def _run(self):
+        while True:
+            if self._try_lead():
+                try:
+                    self.sync_once()
+                except Exception as e:
+                    logger.error("Mirror sync failed: %s", e)
+            time.sleep(self.interval)
+
+    def start(self):
+        """Start the sync thread in this process (once per process, fork-safe)"""
+        if self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            self._lock_file = None
+            threading.Thread(target=self._run, name="mirror-sync", daemon=True).start()
+
+    # Reads
+
+    def status(self):
+        """How current the mirror is; readable from any process"""
+        state = self._state()
+        synced_at = state.get("synced_at")
+        return {
+            "ready": synced_at is not None,
+            "issues": state.get("issue_count", 0),
+            "synced_at": datetime.fromtimestamp(synced_at, timezone.utc).isoformat() if synced_at else None,
+            "age_seconds": round(time.time() - synced_at, 1) if synced_at else None,
+            "last_sync_seconds": state.get("last_sync_seconds"),
+            "last_sync_issues": state.get("last_sync_issues"),
+            "last_error": state.get("last_error"),
+            "leader": self._lock_file is not None,
+            "jql": self.jql or None,
+        }
+
+    def search(self, text=None, project=None, status=None, assignee=None, issue_type=None, limit=50):
+        """
+        Issues matching every given filter, best text match first (newest
+        first without text). Filters compare case-insensitively; assignee
+        matches the display name or account id, "unassigned" matches none.
+        """
+        conditions, params = [], []
+        for column, value in (("project", project), ("status", status), ("issuetype", issue_type)):
+            if value:
+                conditions.append(f"i.{column} = ? COLLATE NOCASE")
+                params.append(value)
+        if assignee:
+            if assignee.lower() == "unassigned":
+                conditions.append("i.assignee IS NULL")
+            else:
+                conditions.append("(i.assignee = ? COLLATE NOCASE OR i.assignee_id = ?)")
+                params.extend([assignee, assignee])
+
+        match = fts_query(text or "")
+        if match:
+            sql = "SELECT i.data FROM issues_fts JOIN issues i ON i.rowid = issues_fts.rowid WHERE issues_fts MATCH ?"
+            params.insert(0, match)
+            order = "bm25(issues_fts), i.updated_ts DESC"
+        else:
+            sql = "SELECT i.data FROM issues i WHERE 1"
+            order = "i.updated_ts DESC"
+        for condition in conditions:
+            sql += " AND " + condition
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(max(1, min(int(limit), MIRROR_SEARCH_MAX_RESULTS)))
+
+        status_info = self.status()
+        if not status_info["ready"]:
+            raise MirrorNotReady("Local mirror has not completed its first sync yet; use jira_search_issues")
+        rows = self._connect().execute(sql, params).fetchall()
+        return [fastjson.loads(row[0]) for row in rows], status_info
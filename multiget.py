@@ -0,0 +1,159 @@
+"""
+Fetch many issues by key with `key in (...)` searches.
+
+Keys are checked against the issue key format (they are spliced into
+JQL), de-duplicated, and looked up in chunks of JIRA_GET_ISSUES_CHUNK, a
+few chunks concurrently, so N keys cost about N/100 round trips instead
+of N. The searches use validateQuery=warn so a key that does not exist
+is simply absent from the results instead of failing its whole chunk.
+Jira may return fewer issues than asked for (it caps pages, harder with
+fields=*all), so a chunk keeps paging until startAt reaches the total it
+reports; only then is a key missing from the results reported as not
+found.
+
+Results come back in the caller's order, one per requested key:
+
+    {"key": "PROJ-1", "found": True, "issue": {...}}
+    {"key": "PROJ-404", "found": False, "error": "Issue not found or not visible"}
+"""
+import asyncio
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import JIRA_GET_ISSUES_CHUNK, JIRA_GET_ISSUES_CONCURRENCY, JIRA_GET_ISSUES_MAX_KEYS
+
+ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-[1-9][0-9]*$")
+NOT_FOUND = "Issue not found or not visible"
+
+
+class InvalidKeysRequest(ValueError):
+    pass
+
+
+def parse_keys(keys):
+    """Caller's keys as a list (a comma-separated string is accepted too)"""
+    if isinstance(keys, str):
+        keys = [k for k in keys.split(",") if k.strip()]
+    if not isinstance(keys, list) or not keys:
+        raise InvalidKeysRequest("issue_keys must be a non-empty array")
+    if len(keys) > JIRA_GET_ISSUES_MAX_KEYS:
+        raise InvalidKeysRequest(f"{len(keys)} keys exceeds limit of {JIRA_GET_ISSUES_MAX_KEYS}")
+    return keys
+
+
+def plan(keys):
+    """Return (normalized keys in caller order, chunks of distinct valid keys)"""
+    normalized = [k.strip().upper() if isinstance(k, str) else None for k in keys]
+    valid = [k for k in dict.fromkeys(normalized) if k and ISSUE_KEY.match(k)]
+    size = max(1, JIRA_GET_ISSUES_CHUNK)
+    return normalized, [valid[i:i + size] for i in range(0, len(valid), size)]
+
+
+def chunk_jql(chunk):
+    return f"key in ({', '.join(chunk)})"
+
+
+def collect(found, chunk, results=None, error=None):
+    """Index one page of a chunk's search results (or the chunk's failure) by key"""
+    if error is not None:
+        for key in chunk:
+            if key not in found:
+                found[key] = {"key": key, "found": False, "error": str(error)}
+        return
+    for issue in results.get("issues", []):
+        found[issue.get("key", "").upper()] = {"key": issue.get("key"), "found": True, "issue": issue}
+
+
+def next_start(results, start):
+    """startAt of a chunk's next page, or None once Jira has returned every match"""
+    issues = results.get("issues", [])
+    start += len(issues)
+    total = results.get("total")
+    if not issues or total is None or start >= total:
+        return None
+    return start
+
+
+def ordered(keys, normalized, found):
+    """One result per requested key, in the caller's order"""
+    results = []
+    for original, key in zip(keys, normalized):
+        if key is None or not ISSUE_KEY.match(key):
+            results.append({"key": original, "found": False, "error": "Invalid issue key"})
+        else:
+            results.append(found.get(key) or {"key": key, "found": False, "error": NOT_FOUND})
+    return results
+
+
+def summarize(results):
+    found = sum(1 for r in results if r["found"])
+    return {"requested": len(results), "found": found, "missing": len(results) - found}
+
+
+def get_issues(jira, keys, fields="*all", expand=None, progress=None):
+    """
+    Fetch issues with the sync client; returns per-key results in input order.
+
+    progress(done, total), when given, is called as each chunk completes,
+    with counts of distinct valid keys.
+    """
+    keys = parse_keys(keys)
+    normalized, chunks = plan(keys)
+    found = {}
+    total = sum(len(chunk) for chunk in chunks)
+    done = 0
+    lock = threading.Lock()
+
+    def run(chunk):
+        nonlocal done
+        start = 0
+        try:
+            while start is not None:
+                results = jira.jql(chunk_jql(chunk), fields=fields, start=start, limit=len(chunk), expand=expand,
+                                   validate_query="warn")
+                collect(found, chunk, results=results)
+                start = next_start(results, start)
+        except Exception as e:
+            collect(found, chunk, error=e)
+        if progress is not None:
+            with lock:
+                done += len(chunk)
+                progress(done, total)
+
+    if len(chunks) == 1:
+        run(chunks[0])
+    elif chunks:
+        with ThreadPoolExecutor(max_workers=min(JIRA_GET_ISSUES_CONCURRENCY, len(chunks)),
+                                thread_name_prefix="get-issues") as executor:
+            list(executor.map(run, chunks))
+    return ordered(keys, normalized, found)
+
+
+async def aget_issues(jira, keys, fields="*all", expand=None, progress=None):
+    """Async counterpart of get_issues for async_jira.AsyncJira"""
+    keys = parse_keys(keys)
+    normalized, chunks = plan(keys)
+    found = {}
+    total = sum(len(chunk) for chunk in chunks)
+    done = 0
+    slots = asyncio.Semaphore(JIRA_GET_ISSUES_CONCURRENCY)
+
+    async def run(chunk):
+        nonlocal done
+        async with slots:
+            start = 0
+            try:
+                while start is not None:
+                    results = await jira.jql(chunk_jql(chunk), fields=fields, start=start, limit=len(chunk),
+                                             expand=expand, validate_query="warn")
+                    collect(found, chunk, results=results)
+                    start = next_start(results, start)
+            except Exception as e:
+                collect(found, chunk, error=e)
+        if progress is not None:
+            done += len(chunk)
+            progress(done, total)
+
+    await asyncio.gather(*[run(chunk) for chunk in chunks])
+    return ordered(keys, normalized, found)
@@ -0,0 +1,171 @@
+"""
+Outbound rate limiting and throttling-aware retries for Jira calls.
+
+Every upstream request, sync or async, first takes a token from the
+process-wide ``jira_rate_limiter``. When the bucket is empty the request
+waits its turn (FIFO) for up to JIRA_RATE_MAX_WAIT seconds; beyond that it
+fails with RateLimitExceeded instead of adding to the pile.
+
+A 429 or 503 from Jira with Retry-After pauses the whole bucket for that
+long, so other requests back off too. Idempotent reads are retried with
+jittered exponential backoff (never sooner than Retry-After); writes are
+not retried.
+"""
+import email.utils
+import random
+import threading
+import time
+
+from config import (
+    JIRA_RATE_LIMIT, JIRA_RATE_BURST, JIRA_RATE_MAX_WAIT,
+    JIRA_RETRY_MAX_ATTEMPTS, JIRA_RETRY_BACKOFF_BASE, JIRA_RETRY_BACKOFF_MAX, JIRA_RETRY_MAX_WAIT,
+)
+from metrics import RATE_LIMIT_WAIT, RATE_LIMIT_REJECTED, UPSTREAM_RETRIES
+
+RETRYABLE_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class RateLimitExceeded(Exception):
+    """A Jira call would have had to wait longer than allowed"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose callers queue for a bounded time"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.granted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.pauses = 0
+
+    def reserve(self, max_wait):
+        """Take a token and return how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, 0.0)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                self.rejected += 1
+                RATE_LIMIT_REJECTED.inc()
+                raise RateLimitExceeded(
+                    f"Jira rate limit: request would wait {wait:.1f}s (limit {max_wait:g}s)", wait
+                )
+            if self.rate > 0:
+                self._tokens -= 1
+            self.granted += 1
+            if wait > 0:
+                self.delayed += 1
+        RATE_LIMIT_WAIT.observe(wait)
+        return wait
+
+    def acquire(self, max_wait=JIRA_RATE_MAX_WAIT):
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every caller back for `seconds` (Jira sent Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.pauses += 1
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._tokens
+            if self.rate > 0:
+                tokens = min(self.burst, tokens + (now - self._updated) * self.rate)
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "tokens": round(tokens, 2) if self.rate > 0 else None,
+                "paused_for_seconds": round(max(self._paused_until - now, 0.0), 3),
+                "granted": self.granted,
+                "delayed": self.delayed,
+                "rejected": self.rejected,
+                "pauses": self.pauses,
+            }
+
+
+jira_rate_limiter = TokenBucket(JIRA_RATE_LIMIT, JIRA_RATE_BURST)
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def retry_delay(attempt, retry_after=None):
+    """
+    Wait before retry number `attempt` (1-based), or None to give up.
+
+    Full-jitter exponential backoff; when Jira sent Retry-After, that plus
+    a little jitter so queued retries do not all fire at the same instant.
+    """
+    if attempt >= JIRA_RETRY_MAX_ATTEMPTS:
+        return None
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, JIRA_RETRY_BACKOFF_BASE)
+    else:
+        delay = random.uniform(0, min(JIRA_RETRY_BACKOFF_MAX, JIRA_RETRY_BACKOFF_BASE * 2 ** attempt))
+    return delay if delay <= JIRA_RETRY_MAX_WAIT else None
+
+
+def plan_retry(method, status, headers, attempt):
+    """
+    Handle a throttled response: pause the bucket on Retry-After and return
+    the delay before retrying, or None if the response should be returned.
+    """
+    if status not in RETRYABLE_STATUSES:
+        return None
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    if retry_after is not None:
+        jira_rate_limiter.pause(retry_after)
+    if method.upper() not in IDEMPOTENT_METHODS:
+        return None
+    delay = retry_delay(attempt, retry_after)
+    if delay is not None:
+        UPSTREAM_RETRIES.labels(str(status)).inc()
+    return delay
+
+
+def upstream_status(error):
+    """HTTP status of the Jira response behind `error` (sync or async client), or None"""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) or getattr(error, "status_code", None)
+
+
+def retry_after_of(error):
+    """Seconds a client should wait if `error` means Jira throttled us, else None"""
+    if isinstance(error, RateLimitExceeded):
+        return error.retry_after
+    if upstream_status(error) != 429:
+        return None
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    return retry_after if retry_after is not None else getattr(error, "retry_after", None) or 1.0
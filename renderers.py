@@ -0,0 +1,141 @@
+"""
+Text renderers for MCP tool results.
+
+Shared by the Flask routes in app.py and the async routes in asgi.py so
+both serving modes return identical text.
+
+Each renderer has a matching *_FIELDS list naming exactly the Jira fields
+it reads. Searches and issue fetches send that list as ``fields=`` so
+Jira does not return descriptions, rendered fields and custom fields
+nobody looks at.
+"""
+import json
+
+from metrics import timed_render
+
+SEARCH_FIELDS = ["summary", "status", "assignee", "priority"]
+ISSUE_FIELDS = [
+    "summary", "description", "status", "priority", "issuetype",
+    "assignee", "reporter", "created", "updated", "project",
+]
+
+
+def split_fields(value):
+    """Normalise a list or comma-separated string of field names"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [f.strip() for f in value if f and f.strip()]
+
+
+def extra_fields(base, requested):
+    """Caller-requested fields that the renderer does not already read"""
+    return [name for name in dict.fromkeys(split_fields(requested)) if name not in base]
+
+
+def format_field_value(value):
+    if value is None:
+        return "None"
+    if isinstance(value, dict):
+        return str(value.get("displayName") or value.get("name") or value.get("value")
+                   or value.get("key") or json.dumps(value))
+    if isinstance(value, list):
+        return ", ".join([format_field_value(v) for v in value])
+    return str(value)
+
+
+@timed_render
+def render_projects(projects):
+    return f"Found {len(projects)} Jira projects:\n\n" + \
+        "\n".join([f"• {p['name']} ({p['key']})" for p in projects])
+
+
+def render_issue_line(issue, extra_fields=()):
+    fields = issue.get("fields", {})
+    line = (
+        f"• {issue['key']}: {fields.get('summary', 'No summary')}\n"
+        f"  Status: {fields.get('status', {}).get('name', 'Unknown')}\n"
+        f"  Assignee: {fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned'}\n"
+        f"  Priority: {fields.get('priority', {}).get('name', 'None') if fields.get('priority') else 'None'}"
+    )
+    for name in extra_fields:
+        line += f"\n  {name}: {format_field_value(fields.get(name))}"
+    return line
+
+
+@timed_render
+def render_search(jql, issues, extra_fields=()):
+    if not issues:
+        return f"No issues found for JQL query: {jql}"
+    return f"Found {len(issues)} issues (JQL: {jql}):\n\n" + \
+        "\n\n".join([render_issue_line(issue, extra_fields) for issue in issues])
+
+
+@timed_render
+def render_issue(issue_key, issue, extra_fields=()):
+    fields = issue.get("fields", {})
+    extra = "".join([f"**{name}:** {format_field_value(fields.get(name))}\n" for name in extra_fields])
+    return f"""
+**{issue_key}: {fields.get('summary', 'No summary')}**
+
+**Description:** {fields.get('description', 'No description')}
+
+**Status:** {fields.get('status', {}).get('name', 'Unknown')}
+**Priority:** {fields.get('priority', {}).get('name', 'None') if fields.get('priority') else 'None'}
+**Issue Type:** {fields.get('issuetype', {}).get('name', 'Unknown')}
+**Assignee:** {fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned'}
+**Reporter:** {fields.get('reporter', {}).get('displayName', 'Unknown') if fields.get('reporter') else 'Unknown'}
+**Created:** {fields.get('created', 'Unknown')}
+**Updated:** {fields.get('updated', 'Unknown')}
+**Project:** {fields.get('project', {}).get('name', 'Unknown')} ({fields.get('project', {}).get('key', 'Unknown')})
+{extra}"""
+
+
+@timed_render
+def render_created(new_issue, summary, project_key):
+    return f"Successfully created issue: {new_issue['key']}\nSummary: {summary}\nProject: {project_key}"
+
+
+@timed_render
+def render_bulk_created(results):
+    created = [r for r in results if r["success"]]
+    lines = [f"Created {len(created)} of {len(results)} issues:"]
+    for r in results:
+        if r["success"]:
+            lines.append(f"• #{r['index'] + 1}: {r['key']}")
+        else:
+            lines.append(f"• #{r['index'] + 1}: FAILED - {r['error']}")
+    return "\n".join(lines)
+
+
+@timed_render
+def render_issues(results, extra_fields=()):
+    found = sum(1 for r in results if r["found"])
+    parts = [f"Found {found} of {len(results)} requested issues"]
+    for r in results:
+        if r["found"]:
+            parts.append(render_issue(r["key"], r["issue"], extra_fields).strip())
+        else:
+            parts.append(f"**{r['key']}:** {r['error']}")
+    return "\n\n---\n\n".join(parts)
+
+
+def describe_age(seconds):
+    if seconds < 120:
+        return f"{seconds:.0f}s"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+@timed_render
+def render_local_search(issues, mirror_status):
+    freshness = (f"local mirror of {mirror_status['issues']} issues, "
+                 f"synced {describe_age(mirror_status['age_seconds'])} ago")
+    if mirror_status.get("last_error"):
+        freshness += f"; last sync failed: {mirror_status['last_error']}"
+    if not issues:
+        return f"No issues found ({freshness})"
+    return f"Found {len(issues)} issues ({freshness}):\n\n" + \
+        "\n\n".join([render_issue_line(issue) for issue in issues])
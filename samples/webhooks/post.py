@@ -0,0 +1,46 @@
+"""
+Replay a recorded webhook payload against a running server.
+
+    JIRA_WEBHOOK_SECRET=s3cret python samples/webhooks/post.py samples/webhooks/jira_issue_updated.json
+
+The body is signed the way Jira signs it (X-Hub-Signature: sha256=...).
+Pass --query-secret to send the secret as ?secret= instead.
+"""
+import argparse
+import hashlib
+import hmac
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("payload", nargs="+", help="JSON payload file(s) to post, in order")
+    parser.add_argument("--url", default="http://localhost:5000/webhooks/jira")
+    parser.add_argument("--secret", default=os.getenv("JIRA_WEBHOOK_SECRET"))
+    parser.add_argument("--query-secret", action="store_true", help="send ?secret= instead of a signature")
+    args = parser.parse_args()
+    if not args.secret:
+        parser.error("set JIRA_WEBHOOK_SECRET or pass --secret")
+
+    for path in args.payload:
+        with open(path, "rb") as f:
+            body = f.read()
+        url, headers = args.url, {"Content-Type": "application/json"}
+        if args.query_secret:
+            url += ("&" if "?" in url else "?") + urllib.parse.urlencode({"secret": args.secret})
+        else:
+            digest = hmac.new(args.secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-Hub-Signature"] = f"sha256={digest}"
+        request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(request) as response:
+                print(path, response.status, response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            print(path, e.code, e.read().decode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Lazy, paginated JQL search and the wire formats used to stream it.
+
+Search results are walked page by page (JIRA_SEARCH_PAGE_SIZE issues per
+upstream call) and each page is handed to the client as soon as it
+arrives; an NDJSON stream holds one page at a time whatever the
+result size.
+REST clients get NDJSON. MCP clients that pass stream: true get
+server-sent events: JSON-RPC progress notifications when they sent a
+progress token, then the response with every issue, capped at
+max_results like an unstreamed search.
+
+Other long tool calls (jira_get_issues, jira_bulk_create_issues) can be
+answered as SSE too: their progress callbacks feed a queue that the
+response drains, and the JSON-RPC response is the last event.
+"""
+import fastjson
+
+from config import JIRA_SEARCH_PAGE_SIZE
+from renderers import render_issue_line
+
+
+def _page_limit(fetched, page_size, max_results):
+    if max_results is None:
+        return page_size
+    return min(page_size, max_results - fetched)
+
+
+def _is_last_page(issues, start, total, fetched, max_results):
+    if not issues:
+        return True
+    if total is not None and start >= total:
+        return True
+    return max_results is not None and fetched >= max_results
+
+
+def iter_pages(jira, jql, max_results=None, page_size=JIRA_SEARCH_PAGE_SIZE, **search_kwargs):
+    """
+    Yield (issues, total) for each page of a JQL search.
+
+    Only one page is held at a time. Stops after max_results issues when
+    given, otherwise walks every page Jira reports.
+    """
+    start = 0
+    fetched = 0
+    while True:
+        limit = _page_limit(fetched, page_size, max_results)
+        if limit <= 0:
+            return
+        results = jira.jql(jql, start=start, limit=limit, **search_kwargs)
+        issues = results.get("issues", [])
+        total = results.get("total")
+        start += len(issues)
+        fetched += len(issues)
+        yield issues, total
+        if _is_last_page(issues, start, total, fetched, max_results):
+            return
+
+
+async def aiter_pages(jira, jql, max_results=None, page_size=JIRA_SEARCH_PAGE_SIZE, **search_kwargs):
+    """Async counterpart of iter_pages for async_jira.AsyncJira"""
+    start = 0
+    fetched = 0
+    while True:
+        limit = _page_limit(fetched, page_size, max_results)
+        if limit <= 0:
+            return
+        results = await jira.jql(jql, start=start, limit=limit, **search_kwargs)
+        issues = results.get("issues", [])
+        total = results.get("total")
+        start += len(issues)
+        fetched += len(issues)
+        yield issues, total
+        if _is_last_page(issues, start, total, fetched, max_results):
+            return
+
+
+def ndjson_line(record):
+    return fastjson.dumps_str(record) + "\n"
+
+
+def ndjson_records(jql, first_page, pages):
+    """
+    NDJSON stream for /issues?stream=true.
+
+    A "meta" record comes first, then one "issue" record per issue and an
+    "end" record with the count. A failure mid-stream becomes an "error"
+    record since the 200 status has already been sent.
+    """
+    issues, total = first_page
+    yield ndjson_line({"type": "meta", "success": True, "jql": jql, "total": total or 0})
+    count = 0
+    try:
+        while True:
+            for issue in issues:
+                count += 1
+                yield ndjson_line({"type": "issue", "issue": issue})
+            issues, _ = next(pages)
+    except StopIteration:
+        pass
+    except Exception as e:
+        yield ndjson_line({"type": "error", "success": False, "error": str(e), "count": count})
+        return
+    yield ndjson_line({"type": "end", "success": True, "count": count})
+
+
+async def andjson_records(jql, first_page, pages):
+    """Async counterpart of ndjson_records for aiter_pages"""
+    issues, total = first_page
+    yield ndjson_line({"type": "meta", "success": True, "jql": jql, "total": total or 0})
+    count = 0
+    try:
+        while True:
+            for issue in issues:
+                count += 1
+                yield ndjson_line({"type": "issue", "issue": issue})
+            issues, _ = await pages.__anext__()
+    except StopAsyncIteration:
+        pass
+    except Exception as e:
+        yield ndjson_line({"type": "error", "success": False, "error": str(e), "count": count})
+        return
+    yield ndjson_line({"type": "end", "success": True, "count": count})
+
+
+def sse_event(message):
+    return f"event: message\ndata: {fastjson.dumps_str(message)}\n\n"
+
+
+def progress_message(progress_token, progress, total, message):
+    return {
+        "jsonrpc": "2.0",
+        "method": "notifications/progress",
+        "params": {
+            "progressToken": progress_token,
+            "progress": progress,
+            "total": total,
+            "message": message
+        }
+    }
+
+
+def search_result(request_id, jql, count, page_texts):
+    """The JSON-RPC response closing a streamed search: the same text as an unstreamed call"""
+    if not count:
+        text = f"No issues found for JQL query: {jql}"
+    else:
+        text = f"Found {count} issues (JQL: {jql}):\n\n" + "\n\n".join(page_texts)
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {"content": [{"type": "text", "text": text}]}
+    }
+
+
+def search_error(request_id, e):
+    """A failure mid-stream, mapped as executor.rpc_error maps it for an unstreamed call"""
+    # Imported here: executor imports mirror, which imports this module
+    from executor import rpc_error
+    return rpc_error(e, request_id)[0]
+
+
+def search_page(page, total, max_results, extras):
+    """(rendered page, total capped at max_results) for one streamed page"""
+    if total is not None:
+        total = min(total, max_results)
+    return "\n\n".join([render_issue_line(issue, extras) for issue in page]), total
+
+
+def sse_search_events(request_id, progress_token, jql, pages, max_results, extras=()):
+    """
+    SSE stream for a streamed jira_search_issues call.
+
+    With a progress token, each page becomes a notifications/progress event
+    whose message holds that page's rendered issues; without one nothing
+    is sent until the end. The final event is the JSON-RPC response, carrying
+    every rendered issue as an unstreamed call would.
+    """
+    count = 0
+    page_texts = []
+    try:
+        for issues, total in pages:
+            if not issues:
+                continue
+            count += len(issues)
+            text, total = search_page(issues, total, max_results, extras)
+            page_texts.append(text)
+            if progress_token is not None:
+                yield sse_event(progress_message(progress_token, count, total, text))
+    except Exception as e:
+        yield sse_event(search_error(request_id, e))
+        return
+    yield sse_event(search_result(request_id, jql, count, page_texts))
+
+
+async def asse_search_events(request_id, progress_token, jql, pages, max_results, extras=()):
+    """Async counterpart of sse_search_events for aiter_pages"""
+    count = 0
+    page_texts = []
+    try:
+        async for issues, total in pages:
+            if not issues:
+                continue
+            count += len(issues)
+            text, total = search_page(issues, total, max_results, extras)
+            page_texts.append(text)
+            if progress_token is not None:
+                yield sse_event(progress_message(progress_token, count, total, text))
+    except Exception as e:
+        yield sse_event(search_error(request_id, e))
+        return
+    yield sse_event(search_result(request_id, jql, count, page_texts))
+
+
+def progress_token(arguments):
+    return (arguments.get("_meta") or {}).get("progressToken")
+
+
+def wants_stream(arguments):
+    """Stream a search only when the call asks for it with stream: true"""
+    return arguments.get("stream") in (True, "true")
+
+
+def accepts_sse(accept_header):
+    return "text/event-stream" in (accept_header or "")
+
+
+def queued_events(events):
+    """SSE events for messages taken from a queue.SimpleQueue until None"""
+    while True:
+        message = events.get()
+        if message is None:
+            return
+        yield sse_event(message)
+
+
+async def aqueued_events(events):
+    """Async counterpart of queued_events for an asyncio.Queue"""
+    while True:
+        message = await events.get()
+        if message is None:
+            return
+        yield sse_event(message)